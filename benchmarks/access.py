@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+    Compares the cost of reading and writing cells of a checked Grid, a trusted Grid, and a plain
+    dict.
+"""
+
+import sys
+import timeit
+sys.path.append('..')
+
+from hexgrid import Grid
+
+
+def per_access(function, keys):
+    """Returns the best time per key of the given function over the keys, in nanoseconds"""
+    return min(timeit.repeat(function, number=10, repeat=5)) / 10 / len(keys) * 1e9
+
+
+def main():
+    checked = Grid.rectangle(100, 100)
+    trusted = Grid.rectangle(100, 100)
+    trusted.trusted = True
+    plain = dict(checked)
+    keys = list(checked)
+
+    for name, grid in [('checked', checked), ('trusted', trusted), ('dict', plain)]:
+        get = per_access(lambda: [grid[k] for k in keys], keys)
+        unchecked_get = per_access(lambda: [grid.get(k) for k in keys], keys)
+
+        def set_all():
+            for k in keys:
+                grid[k] = 0
+        set_ = per_access(set_all, keys)
+        print(f'{name:>7}: grid[k] {get:5.0f} ns, grid.get(k) {unchecked_get:5.0f} ns, '
+              f'grid[k] = v {set_:5.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+    Compares the shortest_path_coordinates algorithms on uniform cost 500x500 Grids, open and
+    with obstacles, reporting the time per route, the number of cells expanded, and the number of
+    cells looked up. A* and bidirectional search expand cells through neighbor_coordinates, while
+    jump point search reports every jump point it takes from its heap.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+from hexgrid.utils import jump_point_search
+
+ALGORITHMS = ['astar', 'bidirectional', 'jps']
+
+
+class CountingGrid(Grid):
+    """A Grid counting expanded cells and cell lookups"""
+    expanded = 0
+    lookups = 0
+
+    def neighbor_coordinates(self, coordinates, validate=True):
+        self.expanded += 1
+        return super().neighbor_coordinates(coordinates, validate)
+
+    def __contains__(self, coordinates):
+        self.lookups += 1
+        return super().__contains__(coordinates)
+
+    def count_expanded(self, coordinates):
+        self.expanded += 1
+
+
+def route(grid, src, dest, algorithm):
+    """Returns the shortest path found by the given algorithm, counting its expanded cells"""
+    if algorithm == 'jps':
+        return jump_point_search(grid, src, dest, expanded=grid.count_expanded)
+    return grid.shortest_path_coordinates(src, dest, algorithm=algorithm)
+
+
+def main():
+    rng = random.Random(0)
+    side = 500
+    for name, density in [('open', 0), ('obstacles', 0.2)]:
+        grid = CountingGrid()
+        grid.update(dict.fromkeys((i, j) for i in range(side) for j in range(side)))
+        for key in rng.sample(list(grid), int(density * len(grid))):
+            del grid[key]
+        cells = list(grid)
+        queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(5)]
+
+        for algorithm in ALGORITHMS:
+            grid.expanded = grid.lookups = 0
+            lengths = []
+            start = time.perf_counter()
+            for src, dest in queries:
+                lengths.append(len(route(grid, src, dest, algorithm)))
+            elapsed = (time.perf_counter() - start) / len(queries)
+            print(f'{name:>9} {algorithm:>13}: {elapsed:7.3f}s per route, '
+                  f'{grid.expanded:>8} expanded, {grid.lookups:>9} lookups, lengths {lengths}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+    Fills islands of cells scattered across a 1e6 by 1e6 world, stored in a Grid and in a
+    ChunkedGrid. Reports the memory each takes, and times within_coordinates around random islands
+    at increasing radii, which the Grid answers by probing every coordinate in the region and the
+    ChunkedGrid by visiting the occupied tiles overlapping it.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+sys.path.append('..')
+
+from hexgrid import Grid, ChunkedGrid
+
+WORLD = 10**6
+ISLANDS = 200
+ISLAND_SIZE = 40
+RADII = [10, 100, 400]
+QUERIES = 5
+
+
+def build(grid, centers):
+    """Fills an ISLAND_SIZE hexagon around each center, returning the bytes allocated"""
+    tracemalloc.start()
+    for center in centers:
+        for key in Grid().within_coordinates(center, ISLAND_SIZE // 2, validate=False):
+            grid[key] = 0
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    rng = random.Random(0)
+    centers = [(rng.randrange(WORLD), rng.randrange(WORLD)) for _ in range(ISLANDS)]
+
+    grid = Grid()
+    grid_memory = build(grid, centers)
+    chunked = ChunkedGrid(tile_size=32)
+    chunked_memory = build(chunked, centers)
+    print(f'{len(grid)} cells in {chunked.tile_count} tiles: Grid {grid_memory / 1e6:.1f} MB, '
+          f'ChunkedGrid {chunked_memory / 1e6:.1f} MB')
+
+    queries = rng.sample(centers, QUERIES)
+    for radius in RADII:
+        timings = []
+        for g in [grid, chunked]:
+            start = time.perf_counter()
+            found = sum(len(g.within_coordinates(center, radius)) for center in queries)
+            timings.append((time.perf_counter() - start) / QUERIES)
+        print(f'within r={radius:3d}: {found / QUERIES:8.0f} cells, '
+              f'Grid {timings[0] * 1e3:9.3f} ms, ChunkedGrid {timings[1] * 1e3:9.3f} ms, '
+              f'speedup {timings[0] / timings[1]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
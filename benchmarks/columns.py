@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+    Stores a (terrain, cost, owner, height) record for every cell of a 500x500 Grid, as a tuple
+    or a dict per cell and as four typed columns. Reports the memory each takes, and times summing
+    the costs, raising every height and finding the cells owned by a player, in a loop over the
+    records and as whole column operations.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+sys.path.append('..')
+
+import numpy as np
+
+from hexgrid import Grid
+
+SIZE = 500
+TERRAIN = ['land', 'water', 'hill', 'forest']
+
+
+def timed(function):
+    """Returns the best time taken by function() over three runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def records(count):
+    """Returns the lists of the terrain, cost, owner and height of count random cells"""
+    rng = random.Random(0)
+    return ([rng.randrange(len(TERRAIN)) for _ in range(count)],
+            [rng.uniform(1, 5) for _ in range(count)],
+            [rng.randrange(8) for _ in range(count)],
+            [rng.randrange(100) for _ in range(count)])
+
+
+def main():
+    objects = Grid.rectangle(SIZE, SIZE)
+    keys = list(objects)
+    tracemalloc.start()
+    for key, record in zip(keys, zip(*records(len(keys)))):
+        objects[key] = record
+    object_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    dicts = Grid.rectangle(SIZE, SIZE)
+    tracemalloc.start()
+    for key, record in zip(keys, zip(*records(len(keys)))):
+        dicts[key] = dict(zip(['terrain', 'cost', 'owner', 'height'], record))
+    dict_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dicts
+
+    columns = Grid.rectangle(SIZE, SIZE)
+    tracemalloc.start()
+    for name, dtype, values in zip(['terrain', 'cost', 'owner', 'height'],
+                                   [np.int8, np.float32, np.int8, np.int16], records(len(keys))):
+        columns.add_column(name, dtype).put(keys, values)
+    column_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{len(keys)} cells: tuples {object_memory / 1e6:.1f} MB, '
+          f'dicts {dict_memory / 1e6:.1f} MB, columns {column_memory / 1e6:.1f} MB')
+
+    cost, owner, height = (columns.columns[name] for name in ['cost', 'owner', 'height'])
+
+    def raise_tuples():
+        for key, (terrain, c, o, h) in objects.items():
+            objects[key] = (terrain, c, o, h + 1)
+
+    def raise_column():
+        height.array[:] += 1
+
+    operations = [
+        ('sum costs', lambda: sum(record[1] for record in objects.values()),
+         lambda: cost.array.sum(dtype=np.float64)),
+        ('raise heights', raise_tuples, raise_column),
+        ('owned cells', lambda: [key for key, record in objects.items() if record[2] == 3],
+         lambda: owner.coordinates[owner.array == 3]),
+    ]
+    for name, loop, vectorized in operations:
+        a, b = timed(loop), timed(vectorized)
+        print(f'{name:>14}: tuples {a:9.3f} ms, columns {b:9.3f} ms, speedup {a / b:.0f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+    Splits a 300x300 Grid in two with a wall, then times shortest_path_coordinates between cells
+    on opposite sides with and without the connected component index, which rejects them without
+    searching. Also times keeping the index up to date while cells are deleted and restored.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+SIZE = 300
+QUERIES = 5
+EDITS = 20000
+
+
+def main():
+    rng = random.Random(0)
+    grid = Grid.rectangle(SIZE, SIZE)
+    for row in range(SIZE):
+        del grid[SIZE // 2, row]
+    left = [key for key in grid if key[0] < SIZE // 2]
+    right = [key for key in grid if key[0] > SIZE // 2]
+    pairs = [(rng.choice(left), rng.choice(right)) for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    for src, dest in pairs:
+        assert grid.shortest_path_coordinates(src, dest) == []
+    search = (time.perf_counter() - start) / QUERIES
+
+    start = time.perf_counter()
+    grid.build_components()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for src, dest in pairs:
+        assert grid.shortest_path_coordinates(src, dest) == []
+    indexed = (time.perf_counter() - start) / QUERIES
+    print(f'unreachable pair: A* {search * 1e3:9.3f} ms, indexed {indexed * 1e6:9.3f} us, '
+          f'index built in {build:.3f} s')
+
+    cells = list(grid)
+    start = time.perf_counter()
+    for key in rng.sample(cells, EDITS // 2):
+        del grid[key]
+    for key in rng.sample(cells, EDITS // 2):
+        if key not in grid:
+            grid[key] = None
+    edits = (time.perf_counter() - start) / EDITS
+    print(f'index update: {edits * 1e6:9.3f} us per edit, '
+          f'{len(grid.connected_components())} components')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+    Compares filling a 1000x1000 map one `grid[c] = value` at a time with the bulk constructors,
+    taking the best of three runs of each. Also times creating the million key tuples on their own
+    and inserting an existing list of them into a plain dict, the two steps that the constructors
+    cannot avoid.
+"""
+
+import itertools
+import sys
+import time
+sys.path.append('..')
+
+import numpy as np
+
+from hexgrid import Grid, AXIAL
+
+
+def loop(side):
+    """Fills a rectangle the way the examples do"""
+    grid = Grid()
+    for i in range(side):
+        for j in range(side):
+            grid[i, j] = None
+    return grid
+
+
+def best(build):
+    """Returns the result of build() and the best time of three runs in seconds"""
+    elapsed = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        result = build()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return result, elapsed
+
+
+def main():
+    side = 1000
+    coords = np.indices((side, side)).reshape(2, -1).T
+    keys = [(i, j) for j in range(side) for i in range(side)]
+    runs = [
+        ('loop', lambda: loop(side)),
+        ('rectangle', lambda: Grid.rectangle(side, side)),
+        ('rectangle axial', lambda: Grid.rectangle(side, side, coordinate_system=AXIAL)),
+        ('parallelogram', lambda: Grid.parallelogram(side, side)),
+        ('hexagon', lambda: Grid.hexagon(577)),
+        ('from_arrays', lambda: Grid.from_arrays(coords)),
+        ('key tuples only', lambda: list(itertools.chain.from_iterable(
+            zip(range(side), itertools.repeat(j, side)) for j in range(side)))),
+        ('dict.fromkeys only', lambda: dict.fromkeys(keys)),
+    ]
+    baseline = None
+    for name, build in runs:
+        grid, elapsed = best(build)
+        baseline = baseline or elapsed
+        print(f'{name:>18}: {len(grid):>8} cells in {elapsed:.3f}s, '
+              f'{baseline / elapsed:.1f}x the loop')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+    Compares converting coordinates one tuple at a time with the batch NumPy conversion.
+"""
+
+import sys
+import timeit
+sys.path.append('..')
+
+import numpy as np
+
+from hexgrid import Grid, CUBIC, OFFSET_ODD_ROWS
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n in (10**3, 10**5, 10**6):
+        coords = rng.integers(-1000, 1000, size=(n, 2))
+        tuples = [tuple(c) for c in coords.tolist()]
+
+        scalar = min(timeit.repeat(
+            lambda: [Grid.convert(c, OFFSET_ODD_ROWS, CUBIC) for c in tuples],
+            number=1, repeat=3))
+        batch = min(timeit.repeat(
+            lambda: Grid.convert_many(coords, OFFSET_ODD_ROWS, CUBIC),
+            number=1, repeat=3))
+
+        print(f'{n:>8} cells: convert {scalar:.4f}s, convert_many {batch:.4f}s, '
+              f'speedup {scalar / batch:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
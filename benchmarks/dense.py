@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+    Compares the memory use and lookup speed of the dict-backed Grid and the array-backed
+    DenseGrid on rectangular maps.
+"""
+
+import random
+import sys
+import timeit
+import tracemalloc
+sys.path.append('..')
+
+from hexgrid import Grid, DenseGrid
+
+
+def build(grid_type, side):
+    """Builds and returns a side by side rectangular map, along with the bytes it allocated"""
+    tracemalloc.start()
+    if grid_type is Grid:
+        grid = Grid()
+    else:
+        grid = DenseGrid(side, side)
+    for i in range(side):
+        for j in range(side):
+            grid[i, j] = 0
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return grid, size
+
+
+def main():
+    for side in (32, 317, 1000):
+        rng = random.Random(0)
+        keys = [(rng.randrange(side), rng.randrange(side)) for _ in range(10**5)]
+        for grid_type in (Grid, DenseGrid):
+            grid, size = build(grid_type, side)
+            lookup = min(timeit.repeat(lambda: [grid[k] for k in keys], number=1, repeat=3))
+            print(f'{side * side:>8} cells {grid_type.__name__:>9}: {size / 2**20:8.1f} MiB, '
+                  f'{lookup / len(keys) * 1e9:6.0f} ns/lookup')
+
+
+if __name__ == '__main__':
+    main()
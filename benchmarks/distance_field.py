@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+    Compares routing N agents to the nearest of a few goals with one A* call per agent and goal,
+    against a single distance field.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+
+def main():
+    rng = random.Random(0)
+    side = 200
+    grid = Grid.rectangle(side, side)
+    for c in rng.sample(list(grid), side * side // 5):
+        del grid[c]
+    grid.build_adjacency()
+
+    cells = list(grid)
+    goals = rng.sample(cells, 3)
+    for agents in (10, 100, 1000):
+        starts = rng.sample(cells, agents)
+
+        start = time.perf_counter()
+        if agents <= 100:
+            for s in starts:
+                paths = [grid.shortest_path_coordinates(s, g) for g in goals]
+                min((p for p in paths if p), key=len, default=[])
+            a_star = f'{time.perf_counter() - start:7.2f}s'
+        else:
+            a_star = 'skipped'
+
+        start = time.perf_counter()
+        distances, next_hops = grid.distance_field(goals)
+        field = time.perf_counter() - start
+
+        print(f'{agents:>5} agents: A* {a_star}, distance field {field:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
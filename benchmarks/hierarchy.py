@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+    Compares flat A* with the hierarchical planner on long routes across a 1000x1000 Grid split
+    by walls with gaps at alternating ends, which make flat A* expand most of the map. Times the
+    planner both on its first queries, which compute the clusters they visit, and once the
+    clusters are cached, then after editing cells, which invalidates their clusters.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+
+def main():
+    rng = random.Random(0)
+    side = 1000
+    grid = Grid.rectangle(side, side)
+    for key in rng.sample(list(grid), side * side // 10):
+        del grid[key]
+    for row in range(100, side, 100):
+        # Leave a gap at alternating ends of each wall.
+        gap = range(side - 20, side) if row % 200 else range(20)
+        for col in range(side):
+            if col not in gap and (col, row) in grid:
+                del grid[col, row]
+    grid.build_adjacency()
+    grid.build_hierarchy(cluster_size=16)
+
+    cells = list(grid)
+    queries = []
+    while len(queries) < 5:
+        src, dest = rng.choice(cells), rng.choice(cells)
+        if abs(src[1] - dest[1]) > side // 2:
+            queries.append((src, dest))
+
+    def timed(name, search):
+        lengths = []
+        start = time.perf_counter()
+        for src, dest in queries:
+            lengths.append(len(search(src, dest)))
+        elapsed = time.perf_counter() - start
+        print(f'{name:>12}: {elapsed / len(queries):7.3f}s per route, path lengths {lengths}')
+
+    timed('flat A*', grid.shortest_path_coordinates)
+    timed('HPA* cold', grid.hierarchy.shortest_path_coordinates)
+    timed('HPA* warm', grid.hierarchy.shortest_path_coordinates)
+
+    start = time.perf_counter()
+    for key in rng.sample(cells, 1000):
+        grid[key] = 'edited'
+    print(f'{"1000 edits":>12}: {time.perf_counter() - start:7.3f}s')
+    timed('HPA* edited', grid.hierarchy.shortest_path_coordinates)
+
+
+if __name__ == '__main__':
+    main()
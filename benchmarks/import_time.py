@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+    Measures how long `import hexgrid` takes in a fresh interpreter, and fails if it imports the
+    optional tkinter or NumPy dependencies, or takes longer than --limit milliseconds.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPTIONAL = ['tkinter', 'numpy']
+
+
+def import_time():
+    """Returns the microseconds spent importing hexgrid, and the optional modules it imported"""
+    code = f'import sys, hexgrid; print(",".join(m for m in {OPTIONAL!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    # The -X importtime lines are "import time: self [us] | cumulative | imported package"
+    microseconds = None
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'hexgrid':
+            microseconds = int(parts[1])
+    if microseconds is None:
+        sys.exit('the -X importtime output has no line for hexgrid')
+    imported = [m for m in result.stdout.strip().split(',') if m]
+    return microseconds, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--limit', type=float, default=50.0,
+                        help='The most milliseconds importing hexgrid may take')
+    args = parser.parse_args()
+
+    times = []
+    for _ in range(args.runs):
+        microseconds, imported = import_time()
+        times.append(microseconds / 1000)
+        if imported:
+            sys.exit(f'import hexgrid imported the optional {", ".join(imported)}')
+
+    median = statistics.median(times)
+    print(f'import hexgrid: median {median:.1f} ms over {args.runs} runs')
+    if median > args.limit:
+        sys.exit(f'import hexgrid took longer than {args.limit} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+    Changes a few random cells of a 500x500 Grid every tick, and compares the size and time of
+    sending each tick as a delta from the change journal, as a diff of the whole Grid against a
+    copy, and as the whole Grid.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+SIZE = 500
+TICKS = 20
+CHANGES = [10, 1000]
+TERRAIN = ['land', 'water', 'hill', 'forest']
+
+
+def main():
+    rng = random.Random(0)
+    grid = Grid.rectangle(SIZE, SIZE, fill='land')
+    keys = list(grid)
+
+    start = time.perf_counter()
+    full = Grid().diff(grid)
+    full_time = time.perf_counter() - start
+    print(f'whole Grid: {len(full) / 1e3:8.1f} kB in {full_time * 1e3:9.3f} ms per tick')
+
+    for changes in CHANGES:
+        grid = Grid.rectangle(SIZE, SIZE, fill='land')
+        replica = Grid.rectangle(SIZE, SIZE, fill='land')
+        grid.build_journal()
+        version = 0
+        size, delta_time, apply_time = 0, 0, 0
+        for _ in range(TICKS):
+            for key in rng.sample(keys, changes):
+                grid[key] = rng.choice(TERRAIN)
+            start = time.perf_counter()
+            delta = grid.changes_since(version)
+            delta_time += time.perf_counter() - start
+            start = time.perf_counter()
+            version = replica.apply(delta)
+            apply_time += time.perf_counter() - start
+            size += len(delta)
+        assert replica == grid
+
+        # A diff compares every cell, however few changed.
+        for key in rng.sample(keys, changes):
+            replica[key] = rng.choice(TERRAIN)
+        start = time.perf_counter()
+        replica.diff(grid)
+        diff_time = time.perf_counter() - start
+        print(f'{changes:5d} changes: delta {size / TICKS / 1e3:6.1f} kB in '
+              f'{delta_time / TICKS * 1e3:7.3f} ms, applied in {apply_time / TICKS * 1e3:7.3f} ms, '
+              f'diff in {diff_time * 1e3:7.3f} ms')
+
+if __name__ == '__main__':
+    main()
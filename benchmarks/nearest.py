@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+    Times Grid.distance_matrix between 3000 units and 3000 targets against calling Grid.distance
+    for every pair, and Grid.nearest on a 1000x1000 map with more and fewer occupied cells against
+    computing the distance from every query to every occupied cell.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+import numpy as np
+
+from hexgrid import Grid
+
+UNITS = 3000
+LOOP_UNITS = 300
+SIZE = 1000
+DENSITIES = [0.5, 0.01, 0.0001]
+QUERIES = 200
+K = 5
+
+
+def main():
+    rng = random.Random(0)
+    grid = Grid()
+    units = [(rng.randrange(SIZE), rng.randrange(SIZE)) for _ in range(UNITS)]
+    targets = [(rng.randrange(SIZE), rng.randrange(SIZE)) for _ in range(UNITS)]
+
+    start = time.perf_counter()
+    grid.distance_matrix(units, targets)
+    vectorized = time.perf_counter() - start
+    # Calling distance for every pair takes minutes, so only a corner of the matrix is timed.
+    start = time.perf_counter()
+    [[grid.distance(a, b) for b in targets[:LOOP_UNITS]] for a in units[:LOOP_UNITS]]
+    loop = (time.perf_counter() - start) * (UNITS / LOOP_UNITS)**2
+    print(f'{UNITS}x{UNITS} distances: loop {loop:7.3f} s, distance_matrix {vectorized:7.3f} s, '
+          f'speedup {loop / vectorized:.0f}x')
+
+    full = Grid.rectangle(SIZE, SIZE)
+    cells = list(full)
+    queries = [(rng.randrange(SIZE), rng.randrange(SIZE)) for _ in range(QUERIES)]
+    for density in DENSITIES:
+        grid = Grid()
+        grid.update((key, None) for key in rng.sample(cells, int(density * len(cells))))
+
+        start = time.perf_counter()
+        keys = list(grid)
+        occupied = np.array(keys)
+        for query in queries:
+            distances = grid.distance_matrix([query], occupied)[0]
+            closest = np.argpartition(distances, K - 1)[:K]
+            [keys[i] for i in closest[np.argsort(distances[closest], kind='stable')]]
+        brute = (time.perf_counter() - start) / QUERIES
+
+        start = time.perf_counter()
+        grid.nearest(queries, K)
+        searched = (time.perf_counter() - start) / QUERIES
+        print(f'nearest {K} of {len(grid):7d} cells: brute force {brute * 1e3:8.3f} ms, '
+              f'nearest {searched * 1e3:8.3f} ms, speedup {brute / searched:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
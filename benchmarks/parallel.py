@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+    Solves a batch of random routes over a 200x200 Grid with Grid.shortest_paths at 1, 2, 4 and 8
+    worker processes. Reports the wall time, routes per second and speedup over one worker, and
+    checks that every worker count returns the same paths.
+"""
+
+import os
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+SIZE = 200
+ROUTES = 200
+WORKERS = [1, 2, 4, 8]
+
+
+def main():
+    rng = random.Random(0)
+    grid = Grid.rectangle(SIZE, SIZE)
+    # Scatter walls so the searches do real work.
+    for key in rng.sample(list(grid), SIZE * SIZE // 5):
+        del grid[key]
+    cells = list(grid)
+    pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(ROUTES)]
+
+    print(f'{len(grid)} cells, {ROUTES} routes, {os.cpu_count()} CPUs')
+    baseline = None
+    expected = None
+    for workers in WORKERS:
+        start = time.perf_counter()
+        paths = grid.shortest_paths(pairs, workers=workers)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            baseline, expected = elapsed, paths
+        assert paths == expected
+        print(f'{workers:3d} workers: {elapsed:8.3f} s, {ROUTES / elapsed:8.1f} routes/s, '
+              f'speedup {baseline / elapsed:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
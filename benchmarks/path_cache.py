@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+    Replays a stream of repeated route requests over a 200x200 Grid, with a cell deleted every
+    200 requests, with and without the path cache. Reports the mean latency per request and the
+    hit rate of the cache.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+REQUESTS = 2000
+ROUTES = 200
+EDIT_EVERY = 200
+
+
+def replay(grid, requests, edits):
+    """Returns the mean seconds per request, deleting the next edit every EDIT_EVERY requests"""
+    edits = iter(edits)
+    start = time.perf_counter()
+    for i, (src, dest) in enumerate(requests):
+        if i and i % EDIT_EVERY == 0:
+            key = next(edits)
+            if key in grid:
+                del grid[key]
+        grid.shortest_path_coordinates(src, dest)
+    return (time.perf_counter() - start) / len(requests)
+
+
+def main():
+    rng = random.Random(0)
+    cells = list(Grid.rectangle(200, 200))
+    routes = [(rng.choice(cells), rng.choice(cells)) for _ in range(ROUTES)]
+    # A few popular routes make up most of the requests.
+    weights = [1 / (rank + 1) for rank in range(ROUTES)]
+    requests = rng.choices(routes, weights, k=REQUESTS)
+    edits = rng.sample(cells, REQUESTS // EDIT_EVERY)
+
+    grid = Grid.rectangle(200, 200)
+    uncached = replay(grid, requests, edits)
+    print(f'   uncached: {uncached * 1e3:8.3f} ms per request')
+
+    grid = Grid.rectangle(200, 200)
+    grid.build_path_cache(maxsize=128)
+    cached = replay(grid, requests, edits)
+    hits, misses, _, _ = grid.path_cache.info()
+    print(f'     cached: {cached * 1e3:8.3f} ms per request, '
+          f'hit rate {hits / (hits + misses):.1%}, speedup {uncached / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+    Counts the nodes A* expands on a 500x500 offset Grid with obstacles, using the previous
+    Manhattan heuristic over raw coordinates and the current cube distance heuristic, with and
+    without the neighbor index.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+from hexgrid.utils import PriorityQueue, a_star_search
+
+
+class CountingGrid(Grid):
+    """A Grid counting the number of calls to neighbor_coordinates, one per expanded node"""
+    expanded = 0
+
+    def neighbor_coordinates(self, coordinates, validate=True):
+        self.expanded += 1
+        return super().neighbor_coordinates(coordinates, validate)
+
+
+def manhattan_a_star_search(grid, start, goal):
+    """The previous A* implementation, with a Manhattan heuristic over the raw coordinates"""
+    frontier = PriorityQueue()
+    frontier.put(start, 0)
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+
+    while not frontier.empty():
+        current = frontier.get()
+        if current == goal:
+            break
+        for coord in grid.neighbor_coordinates(current):
+            new_cost = cost_so_far[current] + 1
+            if coord not in cost_so_far or new_cost < cost_so_far[coord]:
+                cost_so_far[coord] = new_cost
+                priority = new_cost + sum(abs(a - b) for a, b in zip(goal, coord))
+                frontier.put(coord, priority)
+                came_from[coord] = current
+
+    return came_from
+
+
+def path_length(came_from, goal):
+    """Returns the number of steps in the path found to goal"""
+    steps = 0
+    while came_from[goal] is not None:
+        goal = came_from[goal]
+        steps += 1
+    return steps
+
+
+def main():
+    rng = random.Random(0)
+    side = 500
+    grid = CountingGrid()
+    for i in range(side):
+        for j in range(side):
+            if rng.random() > 0.2:
+                grid[i, j] = None
+
+    cells = list(grid)
+    queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(5)]
+
+    runs = [
+        ('manhattan', manhattan_a_star_search, False),
+        ('cube', a_star_search, False),
+        ('indexed', a_star_search, True),
+    ]
+    for name, search, indexed in runs:
+        if indexed:
+            grid.build_adjacency()
+        grid.expanded = 0
+        lengths = []
+        start = time.perf_counter()
+        for src, dest in queries:
+            came_from = search(grid, src, dest)
+            lengths.append(path_length(came_from, dest) if dest in came_from else None)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>9}: {grid.expanded:>8} expansions, {elapsed:6.2f}s, path lengths {lengths}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+    Measures the throughput of Grid.pixel_to_hex, locating random world points one (x, y) tuple
+    at a time and as whole NumPy arrays, for both hexagon types.
+"""
+
+import sys
+import timeit
+sys.path.append('..')
+
+import numpy as np
+
+from hexgrid import Grid, FLAT, POINTY
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for hexagon_type in (POINTY, FLAT):
+        grid = Grid(hexagon_type=hexagon_type)
+        for n in (10**4, 10**6):
+            points = rng.uniform(-10**5, 10**5, size=(n, 2))
+            batch = min(timeit.repeat(lambda: grid.pixel_to_hex(points, 10), number=1, repeat=3))
+            line = f'{hexagon_type.name:>6} {n:>8} points: array {n / batch / 1e6:7.2f}M points/s'
+            if n <= 10**4:
+                tuples = [tuple(p) for p in points.tolist()]
+                scalar = min(timeit.repeat(lambda: [grid.pixel_to_hex(p, 10) for p in tuples],
+                                           number=1, repeat=3))
+                line += f', tuples {n / scalar / 1e6:7.2f}M points/s, speedup {scalar / batch:.1f}x'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+    Compares computing the hexagon corners of a 100k cell map one cell at a time, as DrawGrid
+    does, with the vectorized geometry used by the headless renderer, and times writing the map
+    to SVG and PNG files.
+"""
+
+import math
+import os
+import sys
+import tempfile
+import timeit
+sys.path.append('..')
+
+from hexgrid import Grid, POINTY, AXIAL
+from hexgrid import render
+
+
+def per_cell_corners(grid, radius):
+    """The per-cell trigonometry of DrawGrid.hex_to_pixel and DrawGrid.hex_corners"""
+    polygons = []
+    for coord in grid:
+        q, r = Grid.convert(coord, grid.coordinate_system, AXIAL)
+        x = radius * math.sqrt(3) * (q + r / 2)
+        y = radius * (3 / 2) * r
+        corners = []
+        for i in range(6):
+            theta = (math.pi / 3) * i + math.pi / 6
+            corners.append((x + radius * math.cos(theta), y + radius * math.sin(theta)))
+        polygons.append(corners)
+    return polygons
+
+
+def vectorized_corners(grid, radius):
+    """The vectorized geometry of the headless renderer"""
+    _, centers = render._layout(grid, None, radius)
+    corners = render.arrays.unit_corners(POINTY) * radius
+    return (centers[:, None, :] + corners).tolist()
+
+
+def main():
+    grid = Grid.rectangle(400, 250, fill=0)
+    for x in range(0, 400, 3):
+        grid[x, 100] = 1
+
+    per_cell = min(timeit.repeat(lambda: per_cell_corners(grid, 10), number=1, repeat=3))
+    batch = min(timeit.repeat(lambda: vectorized_corners(grid, 10), number=1, repeat=3))
+    print(f'{len(grid)} cells: per-cell corners {per_cell:.3f}s, vectorized {batch:.3f}s, '
+          f'speedup {per_cell / batch:.1f}x')
+
+    with tempfile.TemporaryDirectory() as directory:
+        renderers = [('svg', render.render_svg, 10), ('png', render.render_png, 4)]
+        for name, function, radius in renderers:
+            path = os.path.join(directory, f'map.{name}')
+            seconds = min(timeit.repeat(
+                lambda: function(grid, path, radius=radius, fill={1: '#ff0000'}),
+                number=1, repeat=3))
+            size = os.path.getsize(path) / 2**20
+            print(f'{len(grid)} cells: render_{name} {seconds:.3f}s, {size:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+    Times switching a 2M cell Grid and DenseGrid between coordinate systems. Tracing allocations
+    is too slow at that size, so the peak memory allocated while switching is measured on a 200k
+    cell map instead, relative to the size of the map before and after the switch.
+"""
+
+import sys
+import time
+import tracemalloc
+sys.path.append('..')
+
+from hexgrid import Grid, DenseGrid, CUBIC, OFFSET_ODD_ROWS
+
+
+def build(grid_type, width, height):
+    """Builds a width by height rectangular map of the given type"""
+    if grid_type is Grid:
+        return Grid.rectangle(width, height)
+    grid = DenseGrid(width, height)
+    for i in range(width):
+        for j in range(height):
+            grid[i, j] = None
+    return grid
+
+
+def peak_memory(grid_type, systems):
+    """Returns the peak memory of each switch of a 200k cell map, and its size after each"""
+    tracemalloc.start()
+    grid = build(grid_type, 400, 500)
+    sizes = [tracemalloc.get_traced_memory()[0]]
+    peaks = []
+    for system in systems:
+        tracemalloc.reset_peak()
+        grid.set_coordinate_system(system)
+        size, peak = tracemalloc.get_traced_memory()
+        sizes.append(size)
+        peaks.append(peak)
+    tracemalloc.stop()
+    return [(peak / before, peak / after) for peak, before, after in zip(peaks, sizes, sizes[1:])]
+
+
+def main():
+    systems = [CUBIC, OFFSET_ODD_ROWS]
+    for grid_type in [Grid, DenseGrid]:
+        peaks = peak_memory(grid_type, systems)
+        grid = build(grid_type, 1000, 2000)
+        for system, (before, after) in zip(systems, peaks):
+            start = time.perf_counter()
+            grid.set_coordinate_system(system)
+            elapsed = time.perf_counter() - start
+            print(f'{grid_type.__name__:>9} to {system.name:>15}: {elapsed:5.2f}s, peak memory '
+                  f'{before:.2f}x the map before, {after:.2f}x after')
+
+if __name__ == '__main__':
+    main()
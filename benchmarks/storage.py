@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+    Saves a 1000x1000 Grid of integers and of strings with pickle and with Grid.save, and times
+    loading each file back: unpickling, Grid.load, and Grid.load(mmap=True) followed by 1000
+    random lookups. Reports the file sizes too.
+"""
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+SIZE = 1000
+LOOKUPS = 1000
+
+
+def timed(function):
+    """Returns the result of calling function and the seconds it took"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    kinds = {
+        'int': lambda i: i,
+        'str': lambda i: rng.choice(['land', 'water', 'forest', 'mountain']),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, 'grid.pickle')
+        saved = os.path.join(directory, 'grid.hex')
+        for kind, fill in kinds.items():
+            grid = Grid.rectangle(SIZE, SIZE)
+            for i, key in enumerate(grid):
+                grid[key] = fill(i)
+            keys = rng.sample(list(grid), LOOKUPS)
+
+            with open(pickled, 'wb') as f:
+                _, dump_time = timed(lambda: pickle.dump(dict(grid), f, pickle.HIGHEST_PROTOCOL))
+            _, save_time = timed(lambda: grid.save(saved))
+            print(f'{kind}: pickle {os.path.getsize(pickled) / 1e6:6.1f} MB in {dump_time:.3f} s, '
+                  f'save {os.path.getsize(saved) / 1e6:6.1f} MB in {save_time:.3f} s')
+
+            def unpickle():
+                with open(pickled, 'rb') as f:
+                    return pickle.load(f)
+
+            _, unpickle_time = timed(unpickle)
+            _, load_time = timed(lambda: Grid.load(saved))
+            mapped, map_time = timed(lambda: Grid.load(saved, mmap=True))
+            _, lookup_time = timed(lambda: [mapped[key] for key in keys])
+            mapped.close()
+            print(f'     unpickle {unpickle_time * 1e3:9.3f} ms, load {load_time * 1e3:9.3f} ms, '
+                  f'mmap {map_time * 1e3:9.3f} ms '
+                  f'+ {lookup_time / LOOKUPS * 1e6:.2f} us per lookup')
+
+
+if __name__ == '__main__':
+    main()
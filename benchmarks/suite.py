@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+    Times every Grid operation at several map sizes in every coordinate system, and compares the
+    timings against a stored baseline to catch speed regressions.
+
+    Usage:
+
+        python3 suite.py --save baseline.json          # Record a baseline on this machine
+        python3 suite.py --compare baseline.json       # Fail if anything got slower
+
+    Each result is the best time of a single call of the operation, in seconds. The results are
+    written as JSON, with one record per (system, cells, operation).
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import timeit
+sys.path.append('..')
+
+from hexgrid import Grid, FLAT, POINTY, CUBIC, AXIAL
+from hexgrid import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+
+SYSTEMS = [OFFSET_ODD_ROWS, OFFSET_EVEN_ROWS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_COLUMNS, AXIAL, CUBIC]
+SIZES = [10**3, 10**5, 10**6]
+SAMPLES = 1000
+
+
+def best(function, calls, repeat=3):
+    """Returns the best time of a single call of function, which makes `calls` calls"""
+    return min(timeit.repeat(function, number=1, repeat=repeat)) / calls
+
+
+def benchmark(system, cells):
+    """Yields (operation, seconds) for every operation on a map of the given size and system"""
+    rng = random.Random(0)
+    hexagon_type = FLAT if 'COLUMNS' in system.name else POINTY
+    side = math.isqrt(cells)
+
+    yield 'construction', best(lambda: Grid.rectangle(side, side, 0, hexagon_type, system), 1)
+    grid = Grid.rectangle(side, side, 0, hexagon_type, system)
+
+    keys = rng.sample(list(grid), min(SAMPLES, len(grid)))
+    pairs = list(zip(keys, reversed(keys)))
+    other = AXIAL if system is CUBIC else CUBIC
+
+    def set_all():
+        for k in keys:
+            grid[k] = 1
+
+    yield 'get', best(lambda: [grid[k] for k in keys], len(keys))
+    yield 'set', best(set_all, len(keys))
+    yield 'convert', best(lambda: [Grid.convert(k, system, other) for k in keys], len(keys))
+    yield 'neighbor_coordinates', best(lambda: [grid.neighbor_coordinates(k) for k in keys],
+                                       len(keys))
+    yield 'within_coordinates', best(lambda: [grid.within_coordinates(k, 5) for k in keys[:100]],
+                                     len(keys[:100]))
+    yield 'ring_coordinates', best(lambda: [grid.ring_coordinates(k, 5) for k in keys[:100]],
+                                   len(keys[:100]))
+    yield 'line_coordinates', best(lambda: [grid.line_coordinates(a, b) for a, b in pairs[:100]],
+                                   len(pairs[:100]))
+    yield 'distance', best(lambda: [grid.distance(a, b) for a, b in pairs], len(pairs))
+
+    # Routes of a fixed length, so that the work does not grow with the size of the map.
+    routes = []
+    for k in keys[:10]:
+        ring = grid.ring_coordinates(k, 20)
+        if ring:
+            routes.append((k, rng.choice(ring)))
+    yield 'shortest_path', best(lambda: [grid.shortest_path_coordinates(a, b) for a, b in routes],
+                                len(routes))
+
+    def switch():
+        grid.set_coordinate_system(other)
+        grid.set_coordinate_system(system)
+
+    yield 'set_coordinate_system', best(switch, 2, repeat=1)
+
+
+def run(systems, sizes):
+    """Returns the list of result records for the given systems and sizes"""
+    results = []
+    for cells in sizes:
+        for system in systems:
+            for operation, seconds in benchmark(system, cells):
+                results.append({
+                    'system': system.name,
+                    'cells': cells,
+                    'operation': operation,
+                    'seconds': seconds,
+                })
+                print(f'{system.name:>19} {cells:>8} {operation:>22}: {seconds * 1e6:12.2f} us')
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints and returns the results more than `threshold` times slower than the baseline"""
+    expected = {(r['system'], r['cells'], r['operation']): r['seconds'] for r in baseline}
+    regressions = []
+    for r in results:
+        key = (r['system'], r['cells'], r['operation'])
+        if key in expected and r['seconds'] > threshold * expected[key]:
+            ratio = r['seconds'] / expected[key]
+            regressions.append(r)
+            print(f'REGRESSION {r["system"]} {r["cells"]} {r["operation"]}: {ratio:.2f}x slower')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='The approximate numbers of cells to benchmark')
+    parser.add_argument('--systems', nargs='+', default=[s.name for s in SYSTEMS],
+                        choices=[s.name for s in SYSTEMS],
+                        help='The coordinate systems to benchmark')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--save', help='Write the results to this baseline JSON file')
+    parser.add_argument('--compare', help='Compare the results against this baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='How many times slower than the baseline counts as a regression')
+    args = parser.parse_args()
+
+    systems = [s for s in SYSTEMS if s.name in args.systems]
+    results = run(systems, args.sizes)
+    document = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    for path in [args.output, args.save]:
+        if path:
+            with open(path, 'w') as f:
+                json.dump(document, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+        print('No regressions')
+
+
+if __name__ == '__main__':
+    main()
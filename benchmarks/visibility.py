@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+    Times the visibility of a unit on a 200x200 Grid with scattered walls. Compares
+    Grid.field_of_view against casting a line_coordinates line to every cell within its radius, and
+    Grid.line_of_sight against checking a batch of pairs one line_coordinates line at a time.
+"""
+
+import random
+import sys
+import time
+sys.path.append('..')
+
+from hexgrid import Grid
+
+SIZE = 200
+RADII = [8, 16, 32]
+PAIRS = 20000
+
+
+def naive_field_of_view(grid, center, radius, walls):
+    """Casts a line from the center to every cell within the radius"""
+    visible = []
+    for cell in grid.iter_within(center, radius):
+        line = grid.line_coordinates(center, cell, validate=False)
+        if all(key in grid and key not in walls for key in line[1:-1]):
+            visible.append(cell)
+    return visible
+
+
+def main():
+    rng = random.Random(0)
+    grid = Grid.rectangle(SIZE, SIZE)
+    walls = set(rng.sample(list(grid), SIZE * SIZE // 10))
+    center = (SIZE // 2, SIZE // 2)
+
+    for radius in RADII:
+        start = time.perf_counter()
+        naive = naive_field_of_view(grid, center, radius, walls)
+        naive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        visible = grid.field_of_view(center, radius, walls)
+        fov_time = time.perf_counter() - start
+        print(f'field of view r={radius:2d}: {len(visible):5d} cells in {fov_time * 1e3:8.3f} ms, '
+              f'per-line {len(naive):5d} cells in {naive_time * 1e3:8.3f} ms, '
+              f'speedup {naive_time / fov_time:.1f}x')
+
+    cells = list(grid)
+    pairs = []
+    for _ in range(PAIRS):
+        src = rng.choice(cells)
+        dest = rng.choice(grid.within_coordinates(src, 10))
+        pairs.append((src, dest))
+
+    start = time.perf_counter()
+    for src, dest in pairs:
+        line = grid.line_coordinates(src, dest, validate=False)
+        all(key in grid and key not in walls for key in line[1:-1])
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid.line_of_sight(pairs, walls)
+    batch_time = time.perf_counter() - start
+    print(f'line of sight, {PAIRS} pairs: batched {batch_time:.3f} s, '
+          f'per-line {naive_time:.3f} s, speedup {naive_time / batch_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
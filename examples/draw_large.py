@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+import random
+import sys
+sys.path.append('..')
+
+from hexgrid import DenseGrid, DrawGrid
+
+
+def main():
+    # A million cell map of land and water. Only the hexagons in the window are ever drawn.
+    rng = random.Random(0)
+    g = DenseGrid(1000, 1000)
+    for i in range(1000):
+        for j in range(1000):
+            g[i, j] = 'water' if rng.random() < 0.3 else 'land'
+
+    draw_obj = DrawGrid(g, radius=20)
+    draw_obj.show(fill={'water': '#7070ff', 'land': '#70c070'}, labels=True)
+
+if __name__ == '__main__':
+    main()
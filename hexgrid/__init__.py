@@ -1,7 +1,10 @@
 """
 Defines a configurable hexagonal Grid. The Grid subclasses dict,
 but adds convenience wrappers for different hexagon types, different
-coordinate systems, and several operations on the Grid.
+coordinate systems, and several operations on the Grid. A DenseGrid
+supports the same operations, but stores its cells in a contiguous
+array for large, mostly-filled maps, and a ChunkedGrid stores them in
+tiles allocated on demand for unbounded, sparsely filled worlds.
 
 Example:
 >>> g = Grid()
@@ -18,9 +21,21 @@ KeyError: 'No item found at (-1, 1)'
 """
 
 from .grid import Grid
-from .draw import DrawGrid
+from .dense import DenseGrid
+from .chunked import ChunkedGrid
 
 from .enums import HexagonType, CoordinateSystem
 from .enums import FLAT, POINTY
 from .enums import OFFSET, CUBIC, AXIAL
 from .enums import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+
+
+def __getattr__(name):
+    """
+        Imports DrawGrid on first use, so that importing hexgrid does not import tkinter. The
+        drawing layer is optional, and tkinter may be missing or unusable on headless machines.
+    """
+    if name == 'DrawGrid':
+        from .draw import DrawGrid
+        return DrawGrid
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,49 @@
+"""
+Defines the neighbor index built by Grid.build_adjacency.
+"""
+
+
+class AdjacencyIndex(object):
+    """
+        Maps each occupied cell of a Grid to its six neighbors, in the same order as
+        `neighbor_coordinates`, with None in place of the unoccupied ones. Kept up to date as
+        cells are added to and removed from the Grid.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.neighbors = {}
+        for coordinates in grid:
+            self.cell_set(coordinates, None, True)
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Links newly added coordinates with their occupied neighbors.
+        """
+        if not added:
+            return
+
+        row = [None] * 6
+        adjacent = self.grid.neighbor_coordinates(coordinates, validate=False)
+        for direction, neighbor in enumerate(adjacent):
+            other = self.neighbors.get(neighbor)
+            if other is not None:
+                row[direction] = neighbor
+                # The opposite direction is three steps around the hexagon.
+                other[(direction + 3) % 6] = coordinates
+        self.neighbors[coordinates] = row
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Unlinks deleted coordinates from their neighbors.
+        """
+        row = self.neighbors.pop(coordinates)
+        for direction, neighbor in enumerate(row):
+            if neighbor is not None:
+                self.neighbors[neighbor][(direction + 3) % 6] = None
+
+    def cleared(self):
+        """
+            Forgets every cell.
+        """
+        self.neighbors = {}
@@ -0,0 +1,167 @@
+"""
+NumPy implementations of Grid operations over whole arrays of coordinates. Requires NumPy, which
+is only imported when one of the array methods on Grid is used.
+"""
+import math
+
+import numpy as np
+
+from .enums import POINTY
+from .enums import CUBIC, AXIAL
+from .enums import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+
+
+def as_coordinate_array(coordinates, system):
+    """
+        Returns the given coordinates as an (N, 2) or (N, 3) array, raising a ValueError if the
+        shape does not match the given coordinate system.
+    """
+    width = 3 if system is CUBIC else 2
+    coords = np.asarray(coordinates)
+    if coords.size == 0:
+        return coords.reshape(0, width)
+    if coords.ndim != 2 or coords.shape[1] != width:
+        raise ValueError(f'coordinates must be an (N, {width}) array, not {coords.shape}')
+    return coords
+
+
+def to_cube(coordinates, from_sys):
+    """
+        Converts an array of coordinates in the given system to an (N, 3) array of cube
+        coordinates.
+    """
+    coords = as_coordinate_array(coordinates, from_sys)
+    if from_sys is CUBIC:
+        return coords
+
+    a, b = coords[:, 0], coords[:, 1]
+    # NumPy's // and % are floor division and modulo, just like Python's, so the parity of
+    # negative rows and columns matches the scalar conversions.
+    if from_sys is AXIAL:
+        x, z = a, b
+    elif from_sys is OFFSET_ODD_ROWS:
+        x, z = a - (b - (b % 2)) // 2, b
+    elif from_sys is OFFSET_EVEN_ROWS:
+        x, z = a - (b + (b % 2)) // 2, b
+    elif from_sys is OFFSET_ODD_COLUMNS:
+        x, z = a, b - (a - (a % 2)) // 2
+    elif from_sys is OFFSET_EVEN_COLUMNS:
+        x, z = a, b - (a + (a % 2)) // 2
+    else:
+        raise ValueError(f'invalid coordinate system {from_sys}')
+
+    return np.stack((x, -x - z, z), axis=1)
+
+
+def from_cube(cube, to_sys):
+    """
+        Converts an (N, 3) array of cube coordinates to an array of coordinates in the given
+        system.
+    """
+    cube = as_coordinate_array(cube, CUBIC)
+    if to_sys is CUBIC:
+        return cube
+
+    x, z = cube[:, 0], cube[:, 2]
+    if to_sys is AXIAL:
+        a, b = x, z
+    elif to_sys is OFFSET_ODD_ROWS:
+        a, b = x + (z - (z % 2)) // 2, z
+    elif to_sys is OFFSET_EVEN_ROWS:
+        a, b = x + (z + (z % 2)) // 2, z
+    elif to_sys is OFFSET_ODD_COLUMNS:
+        a, b = x, z + (x - (x % 2)) // 2
+    elif to_sys is OFFSET_EVEN_COLUMNS:
+        a, b = x, z + (x + (x % 2)) // 2
+    else:
+        raise ValueError(f'invalid coordinate system {to_sys}')
+
+    return np.stack((a, b), axis=1)
+
+
+def convert(coordinates, from_sys, to_sys):
+    """
+        Converts an array of coordinates of one type to an array of coordinates of another type.
+        Always returns a new array.
+    """
+    if from_sys is to_sys:
+        return np.array(as_coordinate_array(coordinates, from_sys))
+    return from_cube(to_cube(coordinates, from_sys), to_sys)
+
+
+def cube_distances(a, b):
+    """
+        Returns the (N, M) array of the distances between every one of an (N, 3) array of cube
+        coordinates and every one of an (M, 3) array.
+    """
+    a = as_coordinate_array(a, CUBIC)
+    b = as_coordinate_array(b, CUBIC)
+    # Taking the maximum of each component in place keeps two (N, M) arrays alive rather than an
+    # (N, M, 3) one.
+    distances = np.abs(a[:, np.newaxis, 0] - b[np.newaxis, :, 0])
+    for i in (1, 2):
+        np.maximum(distances, np.abs(a[:, np.newaxis, i] - b[np.newaxis, :, i]), out=distances)
+    return distances
+
+
+def cube_round(cube):
+    """
+        Rounds an (N, 3) array of floating x, y, z cubic coordinates to the nearest hexagons,
+        exactly like the scalar rounding Grid uses for lines.
+    """
+    cube = np.asarray(cube, dtype=float)
+    rounded = np.round(cube)
+    dx, dy, dz = np.abs(rounded - cube).T
+    rx, ry, rz = rounded.T
+    # Recompute the component with the largest rounding error from the other two.
+    fix_x = (dx > dy) & (dx > dz)
+    fix_y = ~fix_x & (dy > dz)
+    fix_z = ~fix_x & ~fix_y
+    rx = np.where(fix_x, -ry - rz, rx)
+    ry = np.where(fix_y, -rx - rz, ry)
+    rz = np.where(fix_z, -rx - ry, rz)
+    return np.stack((rx, ry, rz), axis=1).astype(np.int64)
+
+
+def unit_corners(hexagon_type):
+    """
+        Returns the (6, 2) array of the corners of a hexagon of radius 1 centered on the origin.
+    """
+    start = math.pi / 6 if hexagon_type is POINTY else 0
+    theta = start + np.arange(6) * (math.pi / 3)
+    return np.stack((np.cos(theta), np.sin(theta)), axis=1)
+
+
+def axial_to_pixel(axial, hexagon_type, radius):
+    """
+        Converts an (N, 2) array of axial coordinates to the (N, 2) array of the cartesian pixel
+        coordinates of the hexagon centers.
+    """
+    axial = as_coordinate_array(axial, AXIAL)
+    q, r = axial[:, 0], axial[:, 1]
+    if hexagon_type is POINTY:
+        x = radius * math.sqrt(3) * (q + r / 2)
+        y = radius * (3 / 2) * r
+    else:
+        x = radius * (3 / 2) * q
+        y = radius * math.sqrt(3) * (r + q / 2)
+    return np.stack((x, y), axis=1)
+
+
+def pixel_to_cube(points, hexagon_type, radius, origin=(0, 0)):
+    """
+        Converts an (N, 2) array of cartesian pixel coordinates to the (N, 3) array of the cube
+        coordinates of the hexagons containing them, where the hexagon at the origin of the cube
+        coordinates is centered on the given pixel origin. Inverts axial_to_pixel.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if origin[0] or origin[1]:
+        points = points - origin
+    x, y = points[:, 0] / radius, points[:, 1] / radius
+    if hexagon_type is POINTY:
+        q = math.sqrt(3) / 3 * x - y / 3
+        r = 2 / 3 * y
+    else:
+        q = 2 / 3 * x
+        r = -x / 3 + math.sqrt(3) / 3 * y
+    return cube_round(np.stack((q, -q - r, r), axis=1))
@@ -0,0 +1,94 @@
+"""
+Defines the path cache built by Grid.build_path_cache.
+"""
+from collections import OrderedDict, namedtuple
+
+PathCacheInfo = namedtuple('PathCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class PathCache(object):
+    """
+        Remembers the results of the most recent `maxsize` uniform cost path queries on a Grid,
+        discarding the least recently used first.
+
+        Deleting a cell only discards the cached paths through it, since removing a cell cannot
+        shorten any other path. Adding a cell may open a shorter route anywhere, so it discards
+        every cached path, and so does clearing the Grid. Changing the value of a cell has no
+        effect on uniform cost paths.
+    """
+
+    def __init__(self, grid, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.grid = grid
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Counts the times every cached path was discarded at once.
+        self.generation = 0
+        self._paths = OrderedDict()
+        # Maps each cell to the keys of the cached paths through it.
+        self._through = {}
+
+    def get(self, key):
+        """
+            Returns the cached path for the given key as a tuple, or None if there is none.
+        """
+        path = self._paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths.move_to_end(key)
+        return path
+
+    def put(self, key, path):
+        """
+            Caches the given path, evicting the least recently used path if the cache is full.
+        """
+        path = tuple(path)
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        for coordinates in path:
+            self._through.setdefault(coordinates, set()).add(key)
+        if len(self._paths) > self.maxsize:
+            self._discard(next(iter(self._paths)))
+
+    def _discard(self, key):
+        """
+            Removes the path with the given key from the cache and the index.
+        """
+        for coordinates in self._paths.pop(key):
+            keys = self._through[coordinates]
+            keys.discard(key)
+            if not keys:
+                del self._through[coordinates]
+
+    def info(self):
+        """
+            Returns the hits, misses, maximum size and current size of the cache.
+        """
+        return PathCacheInfo(self.hits, self.misses, self.maxsize, len(self._paths))
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Discards every path when a cell is added.
+        """
+        if added:
+            self.cleared()
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Discards the paths through a deleted cell.
+        """
+        for key in list(self._through.get(coordinates, ())):
+            self._discard(key)
+
+    def cleared(self):
+        """
+            Discards every path.
+        """
+        if self._paths:
+            self._paths = OrderedDict()
+            self._through = {}
+            self.generation += 1
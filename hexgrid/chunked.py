@@ -0,0 +1,314 @@
+"""
+Defines a ChunkedGrid, which stores its cells in fixed-size tiles allocated as cells are added,
+for unbounded and sparsely filled worlds. It supports the same operations as a Grid.
+
+Example:
+>>> g = ChunkedGrid(tile_size=16)
+>>> g[1, 0] = '1 0'
+>>> g[-1000, 5000] = 'far away'
+>>> sorted(g.items())
+[((-1000, 5000), 'far away'), ((1, 0), '1 0')]
+>>> g.tile_count
+2
+"""
+import itertools
+import os
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from .grid import BaseGrid, _TO_CUBE, _converter
+from .enums import POINTY, OFFSET, CUBIC
+
+
+class _Tile(object):
+    """
+        The cells of one tile, in a list with a bytearray recording which slots are occupied.
+    """
+    __slots__ = ('cells', 'occupied', 'count')
+
+    def __init__(self, size):
+        self.cells = [None] * (size * size)
+        self.occupied = bytearray(size * size)
+        self.count = 0
+
+
+class ChunkedGrid(BaseGrid, MutableMapping):
+    """
+        Implements a configurable hexagonal Grid backed by tiles of `tile_size` by `tile_size`
+        coordinates, which are allocated when their first cell is set and freed when their last
+        cell is deleted. Like a DenseGrid, the tiles span the first and the last component of each
+        key, so they are rectangles in the offset coordinate systems and parallelograms in axial
+        and cube coordinates. Memory grows with the occupied area rather than with its extent.
+
+        With a `directory` and `max_tiles`, at most `max_tiles` tiles are kept in memory, and the
+        least recently used are pickled to files in the directory when more are needed. They are
+        loaded back when next touched.
+
+        Region queries such as `within_coordinates` visit the occupied tiles overlapping the
+        region rather than probing every coordinate in it.
+    """
+
+    def __init__(self, tile_size=32, hexagon_type=POINTY, coordinate_system=OFFSET,
+                 trusted=False, directory=None, max_tiles=None):
+        """
+            Constructs an empty ChunkedGrid with tiles of `tile_size` by `tile_size` coordinates.
+            The hexagon type, coordinate system and trusted options are the same as for a Grid.
+
+            Examples:
+
+            >>> ChunkedGrid(64, coordinate_system=CUBIC)
+            <ChunkedGrid POINTY, CUBIC>
+        """
+        super().__init__(hexagon_type, coordinate_system, trusted)
+        if not isinstance(tile_size, int) or tile_size < 1:
+            raise ValueError('tile_size must be a positive integer')
+        if max_tiles is not None and (directory is None or max_tiles < 1):
+            raise ValueError('max_tiles must be at least 1, and requires a directory')
+        self.tile_size = tile_size
+        self.directory = directory
+        self.max_tiles = max_tiles
+        # The tiles in memory, least recently used first, and the indexes of those on disk.
+        self._tiles = OrderedDict()
+        self._evicted = set()
+        self._length = 0
+
+    @property
+    def tile_count(self):
+        """
+            Returns the number of allocated tiles, in memory or on disk.
+        """
+        return len(self._tiles) + len(self._evicted)
+
+    def _locate(self, coordinates):
+        """
+            Returns the tile index and the slot within the tile of the given valid coordinates.
+        """
+        ti, a = divmod(coordinates[0], self.tile_size)
+        tj, b = divmod(coordinates[-1], self.tile_size)
+        return (ti, tj), b * self.tile_size + a
+
+    def _key(self, tile, slot):
+        """
+            Returns the coordinates of the given slot of a tile.
+        """
+        b, a = divmod(slot, self.tile_size)
+        a += tile[0] * self.tile_size
+        b += tile[1] * self.tile_size
+        if self.coordinate_system is CUBIC:
+            return a, -a - b, b
+        return a, b
+
+    def _path(self, tile):
+        """
+            Returns the path of the file holding an evicted tile.
+        """
+        return os.path.join(self.directory, f'tile_{tile[0]}_{tile[1]}.pickle')
+
+    def _tile(self, tile, create=False):
+        """
+            Returns the given tile, loading it from disk if it was evicted, or None if it has not
+            been allocated. Allocates it instead if `create` is True.
+        """
+        data = self._tiles.get(tile)
+        if data is not None:
+            if self.max_tiles is not None:
+                self._tiles.move_to_end(tile)
+            return data
+
+        if tile in self._evicted:
+            import pickle
+
+            path = self._path(tile)
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            os.remove(path)
+            self._evicted.discard(tile)
+        elif create:
+            data = _Tile(self.tile_size)
+        else:
+            return None
+
+        self._tiles[tile] = data
+        if self.max_tiles is not None:
+            while len(self._tiles) > self.max_tiles:
+                self._evict(next(iter(self._tiles)))
+        return data
+
+    def _evict(self, tile):
+        """
+            Writes the given tile to disk and frees it from memory.
+        """
+        import pickle
+
+        with open(self._path(tile), 'wb') as f:
+            pickle.dump(self._tiles.pop(tile), f, pickle.HIGHEST_PROTOCOL)
+        self._evicted.add(tile)
+
+    def _valid_index(self, coordinates):
+        """
+            Returns the tile index and slot of the given coordinates, or None if they cannot be
+            in the ChunkedGrid.
+        """
+        if not isinstance(coordinates, tuple):
+            return None
+        if len(coordinates) != (3 if self.coordinate_system is CUBIC else 2):
+            return None
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            return None
+        try:
+            return self._locate(coordinates)
+        except TypeError:
+            return None
+
+    def __contains__(self, coordinates):
+        """
+            Returns True if there is an item at the given coordinates.
+        """
+        index = self._valid_index(coordinates)
+        if index is None:
+            return False
+        data = self._tile(index[0])
+        return data is not None and data.occupied[index[1]] == 1
+
+    def __getitem__(self, coordinates):
+        """
+            Returns the cell at the given coordinates if it exists.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        index = self._valid_index(coordinates)
+        data = self._tile(index[0]) if index is not None else None
+        if data is None or not data.occupied[index[1]]:
+            raise KeyError(f'No item found at {coordinates}')
+        return data.cells[index[1]]
+
+    def __setitem__(self, coordinates, cell):
+        """
+            Set the cell at the given coordinates to the given cell, allocating its tile if
+            needed.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            raise ValueError('cube coordinates must sum to 0')
+        tile, slot = self._locate(coordinates)
+        data = self._tile(tile, create=True)
+
+        added = not data.occupied[slot]
+        if added:
+            data.occupied[slot] = 1
+            data.count += 1
+            self._length += 1
+        data.cells[slot] = cell
+        self._notify_set(coordinates, cell, added)
+
+    def __delitem__(self, coordinates):
+        """
+            Delete the cell at the given coordinates if it exists, freeing its tile if it was the
+            last cell in it.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        index = self._valid_index(coordinates)
+        data = self._tile(index[0]) if index is not None else None
+        if data is None or not data.occupied[index[1]]:
+            raise KeyError(f'No item found at {coordinates}')
+
+        tile, slot = index
+        cell = data.cells[slot]
+        data.cells[slot] = None
+        data.occupied[slot] = 0
+        data.count -= 1
+        self._length -= 1
+        if not data.count:
+            del self._tiles[tile]
+        self._notify_deleted(coordinates, cell)
+
+    def _iter_tile(self, tile, data):
+        """
+            Yields the coordinates of the occupied slots of a tile.
+        """
+        slots = range(len(data.occupied))
+        for slot in itertools.compress(slots, data.occupied):
+            yield self._key(tile, slot)
+
+    def __iter__(self):
+        """
+            Iterates over the coordinates of the occupied cells, one tile at a time.
+        """
+        for tile in list(self._tiles) + list(self._evicted):
+            data = self._tile(tile)
+            if data is not None:
+                yield from self._iter_tile(tile, data)
+
+    def __len__(self):
+        """
+            Returns the number of occupied cells.
+        """
+        return self._length
+
+    def clear(self):
+        """
+            Removes every item and frees every tile, deleting the evicted tiles from disk.
+        """
+        for tile in self._evicted:
+            os.remove(self._path(tile))
+        self._tiles = OrderedDict()
+        self._evicted = set()
+        self._length = 0
+        self._notify_cleared()
+
+    def iter_within(self, center, radius, validate=True):
+        """
+            Yields the coordinates within `radius` of `center`. When only occupied coordinates
+            are wanted from a region larger than the allocated tiles it overlaps, visits those
+            tiles one at a time instead of probing every coordinate, so empty space costs
+            nothing, and yields their coordinates in tile order.
+        """
+        if not validate:
+            yield from super().iter_within(center, radius, validate)
+            return
+
+        to_cube = _TO_CUBE[self.coordinate_system]
+        cx, cy, cz = to_cube(center)
+        a, b = center[0], center[-1]
+        # In offset coordinates, a cell within the radius can be half a step further along the
+        # offset axis, which one extra coordinate covers.
+        low = self._locate((a - radius - 1, b - radius - 1))[0]
+        high = self._locate((a + radius + 1, b + radius + 1))[0]
+        area = (high[0] - low[0] + 1) * (high[1] - low[1] + 1)
+        if area <= self.tile_count:
+            tiles = itertools.product(range(low[0], high[0] + 1), range(low[1], high[1] + 1))
+            tiles = [tile for tile in tiles if tile in self._tiles or tile in self._evicted]
+        else:
+            tiles = [tile for tile in itertools.chain(self._tiles, self._evicted)
+                     if low[0] <= tile[0] <= high[0] and low[1] <= tile[1] <= high[1]]
+        # Probing each coordinate is cheaper when the region is smaller than the tiles it touches.
+        if 3 * radius * (radius + 1) + 1 < len(tiles) * self.tile_size ** 2:
+            yield from super().iter_within(center, radius, validate)
+            return
+
+        for tile in tiles:
+            data = self._tile(tile)
+            for key in self._iter_tile(tile, data):
+                x, y, z = to_cube(key)
+                if max(abs(x - cx), abs(y - cy), abs(z - cz)) <= radius:
+                    yield key
+
+    def _rekey(self, new_system):
+        """
+            Moves every cell to its tile in the new coordinate system.
+        """
+        items = list(self.items())
+        convert = _converter(self.coordinate_system, new_system)
+        self.coordinate_system = new_system
+        self._tiles = OrderedDict()
+        for tile in self._evicted:
+            os.remove(self._path(tile))
+        self._evicted = set()
+        for coordinates, cell in items:
+            tile, slot = self._locate(convert(coordinates))
+            data = self._tile(tile, create=True)
+            data.occupied[slot] = 1
+            data.count += 1
+            data.cells[slot] = cell
@@ -0,0 +1,214 @@
+"""
+Defines the typed attribute columns added by Grid.add_column. Requires NumPy, which is only
+imported when the first column is added.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+from .enums import CUBIC
+
+
+class ColumnStore(Mapping):
+    """
+        Stores named, typed columns of values for every occupied cell of a Grid, as NumPy arrays
+        with one row per cell, and maps each column name to its Column. Kept up to date as cells
+        are added and removed: an added cell gets a new row holding the fill value of each
+        column, and a deleted cell's row is filled by moving the last row into it, so the rows
+        stay contiguous but are not in any particular order. `coordinates()` gives the
+        coordinates of every row.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.width = 3 if grid.coordinate_system is CUBIC else 2
+        # Maps the coordinates of each cell to its row, and each row to its coordinates.
+        self.rows = {}
+        self.keys = []
+        self.capacity = 0
+        self._columns = {}
+        self._coordinates = None
+        self._append(list(grid))
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def add(self, name, dtype, fill):
+        """
+            Adds a column of the given dtype, holding the fill value in every row.
+        """
+        if name in self._columns:
+            raise ValueError(f'the Grid already has a column named {name!r}')
+        column = Column(self, name, np.full(self.capacity, fill, dtype=dtype), fill)
+        self._columns[name] = column
+        return column
+
+    def remove(self, name):
+        """
+            Removes the column with the given name.
+        """
+        del self._columns[name]
+
+    def coordinates(self):
+        """
+            Returns the (N, 2) or (N, 3) array of the coordinates of every row, in row order.
+        """
+        if self._coordinates is None:
+            coords = np.array(self.keys, dtype=np.int64)
+            self._coordinates = coords.reshape(len(self.keys), self.width)
+        return self._coordinates
+
+    def row_indexes(self, coordinates):
+        """
+            Returns the array of the rows of the given coordinates.
+        """
+        rows = self.rows
+        if isinstance(coordinates, np.ndarray):
+            coordinates = map(tuple, coordinates.tolist())
+        return np.fromiter((rows[c] for c in coordinates), dtype=np.intp)
+
+    def _append(self, coordinates):
+        """
+            Adds rows for the given list of coordinates, holding the fill value of each column.
+        """
+        start = len(self.keys)
+        end = start + len(coordinates)
+        if end > self.capacity:
+            # Grows the arrays geometrically, so appending a row takes amortized constant time.
+            self.capacity = max(end, 2 * self.capacity, 16)
+            for column in self._columns.values():
+                data = np.full(self.capacity, column.fill, dtype=column.dtype)
+                data[:start] = column.data[:start]
+                column.data = data
+        for column in self._columns.values():
+            column.data[start:end] = column.fill
+        for row, key in enumerate(coordinates, start):
+            self.rows[key] = row
+        self.keys.extend(coordinates)
+        self._coordinates = None
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Adds a row for an added cell.
+        """
+        if added:
+            self._append([coordinates])
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Moves the last row into the row of the deleted cell.
+        """
+        row = self.rows.pop(coordinates)
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+            for column in self._columns.values():
+                column.data[row] = column.data[last]
+        self.keys.pop()
+        self._coordinates = None
+
+    def cleared(self):
+        """
+            Removes every row.
+        """
+        self.rows = {}
+        self.keys = []
+        self._coordinates = None
+
+    def rekeyed(self, convert):
+        """
+            Converts the coordinates of every row, keeping the values, after the Grid changed its
+            coordinate system.
+        """
+        self.width = 3 if self.grid.coordinate_system is CUBIC else 2
+        self.keys = [convert(key) for key in self.keys]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self._coordinates = None
+
+
+class Column(Mapping):
+    """
+        A named, typed column of values, mapping the coordinates of every occupied cell to its
+        value. Reading or writing a single value is a dict lookup and an array access. `array`
+        is a view of the values of every row, for vectorized operations over the whole column.
+    """
+
+    def __init__(self, store, name, data, fill):
+        self.store = store
+        self.name = name
+        self.fill = fill
+        self.data = data
+
+    @property
+    def dtype(self):
+        """
+            The NumPy dtype of the values.
+        """
+        return self.data.dtype
+
+    @property
+    def array(self):
+        """
+            A writable view of the values of every row, in the order of `coordinates`.
+        """
+        return self.data[:len(self.store.keys)]
+
+    @property
+    def coordinates(self):
+        """
+            The array of the coordinates of every row, in the order of `array`.
+        """
+        return self.store.coordinates()
+
+    def _row(self, coordinates):
+        """
+            Returns the row of the given coordinates, raising a KeyError if there is no cell.
+        """
+        row = self.store.rows.get(coordinates)
+        if row is None:
+            raise KeyError(f'No item found at {coordinates}')
+        return row
+
+    def __getitem__(self, coordinates):
+        """
+            Returns the value of the cell at the given coordinates, as a Python scalar.
+        """
+        return self.data[self._row(coordinates)].item()
+
+    def __setitem__(self, coordinates, value):
+        """
+            Sets the value of the cell at the given coordinates.
+        """
+        self.data[self._row(coordinates)] = value
+
+    def __contains__(self, coordinates):
+        return coordinates in self.store.rows
+
+    def __iter__(self):
+        return iter(self.store.keys)
+
+    def __len__(self):
+        return len(self.store.keys)
+
+    def take(self, coordinates):
+        """
+            Returns the array of the values of the cells at the given coordinates.
+        """
+        return self.data[self.store.row_indexes(coordinates)]
+
+    def put(self, coordinates, values):
+        """
+            Sets the cells at the given coordinates to the given values, or to a single value.
+        """
+        self.data[self.store.row_indexes(coordinates)] = values
+
+    def __repr__(self):
+        return f'<Column {self.name!r} {self.dtype} of {len(self)} cells>'
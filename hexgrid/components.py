@@ -0,0 +1,148 @@
+"""
+Defines the connected component index built by Grid.build_components.
+"""
+import itertools
+from collections import deque
+
+
+class ComponentIndex(object):
+    """
+        Labels every occupied cell of a Grid with the id of its connected component, the set of
+        cells reachable from it by stepping between adjacent occupied cells. Kept up to date as
+        cells are added and removed.
+
+        Adding a cell merges the components around it, relabeling all but the largest. Deleting a
+        cell can only split its component if its occupied neighbors fall into more than one arc
+        around it. Then a search runs outwards from each arc in turn, one cell at a time, until
+        all but one of the searches have met or run out of cells, so the cost follows the size of
+        the pieces cut off rather than that of the component.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        # Maps each cell to its component id, and each id to the set of its cells.
+        self.labels = {}
+        self.members = {}
+        self._ids = itertools.count()
+        for coordinates in grid:
+            if coordinates not in self.labels:
+                self._label(grid.flood_fill(coordinates), next(self._ids))
+
+    def _label(self, cells, component):
+        """
+            Assigns the given cells to the given component.
+        """
+        self.members.setdefault(component, set()).update(cells)
+        for cell in cells:
+            self.labels[cell] = component
+
+    def connected(self, src, dest):
+        """
+            Returns True if src and dest are occupied and in the same component.
+        """
+        component = self.labels.get(src)
+        return component is not None and component == self.labels.get(dest)
+
+    def components(self):
+        """
+            Returns the list of the sets of cells in each component.
+        """
+        return [set(cells) for cells in self.members.values()]
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Merges the components around an added cell.
+        """
+        if not added:
+            return
+        # Neighbors not labeled yet are only being added, and merge with this cell in turn. The
+        # labels are used rather than the adjacency index, which may not have seen the change yet.
+        neighbors = self.grid.neighbor_coordinates(coordinates, validate=False)
+        around = {self.labels.get(neighbor) for neighbor in neighbors}
+        around.discard(None)
+        if not around:
+            self._label([coordinates], next(self._ids))
+            return
+
+        largest = max(around, key=lambda component: len(self.members[component]))
+        for component in around - {largest}:
+            self._label(self.members.pop(component), largest)
+        self._label([coordinates], largest)
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Splits off the parts of the component that a deleted cell disconnects.
+        """
+        component = self.labels.pop(coordinates)
+        members = self.members[component]
+        members.discard(coordinates)
+        if not members:
+            del self.members[component]
+            return
+
+        # The neighbors in each arc of consecutive occupied neighbors are connected to each other.
+        around = self.grid.neighbor_coordinates(coordinates, validate=False)
+        occupied = [neighbor in self.labels for neighbor in around]
+        starts = [i for i in range(6) if occupied[i] and not occupied[i - 1]]
+        if len(starts) > 1:
+            self._split(component, [around[i] for i in starts])
+
+    def _split(self, component, seeds):
+        """
+            Searches outwards from every seed cell in turn, relabeling the cells reached by the
+            searches that run out of cells before meeting all the others.
+        """
+        grid = self.grid
+        labels = self.labels
+        owner = {seed: i for i, seed in enumerate(seeds)}
+        frontiers = [deque([seed]) for seed in seeds]
+        reached = [[seed] for seed in seeds]
+        # Searches that have met are merged, each pointing at the search that absorbed it.
+        merged = list(range(len(seeds)))
+
+        def find(i):
+            while merged[i] != i:
+                i = merged[i]
+            return i
+
+        open_groups = set(range(len(seeds)))
+        while len(open_groups) > 1:
+            for group in list(open_groups):
+                if group not in open_groups:
+                    continue
+                # Advance the group by one cell, from whichever of its searches has one left.
+                searches = [i for i in range(len(seeds)) if find(i) == group and frontiers[i]]
+                if not searches:
+                    # The group cut off a separate component.
+                    open_groups.discard(group)
+                    cells = [cell for i in range(len(seeds)) if find(i) == group
+                             for cell in reached[i]]
+                    self.members[component].difference_update(cells)
+                    self._label(cells, next(self._ids))
+                    if len(open_groups) == 1:
+                        break
+                    continue
+                i = searches[0]
+                current = frontiers[i].popleft()
+                for neighbor in grid.neighbor_coordinates(current, validate=False):
+                    if neighbor not in labels:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = i
+                        frontiers[i].append(neighbor)
+                        reached[i].append(neighbor)
+                    elif find(other) != group:
+                        # The searches met, so they are in the same piece.
+                        absorbed = find(other)
+                        merged[absorbed] = group
+                        open_groups.discard(absorbed)
+                        if len(open_groups) == 1:
+                            return
+
+    def cleared(self):
+        """
+            Forgets every component.
+        """
+        self.labels = {}
+        self.members = {}
@@ -0,0 +1,239 @@
+"""
+Defines a DenseGrid, which stores its cells in a contiguous array over a fixed rectangle of
+coordinates rather than in a dict. It supports the same operations as a Grid.
+
+Example:
+>>> g = DenseGrid(4, 3)
+>>> g[1, 0] = '1 0'
+>>> g[0, 2] = '0 2'
+>>> list(g.items())
+[((1, 0), '1 0'), ((0, 2), '0 2')]
+>>> g[-1, 1]
+Traceback (most recent call last):
+...
+KeyError: 'No item found at (-1, 1)'
+"""
+import itertools
+from collections.abc import MutableMapping
+
+from .grid import BaseGrid, _converter
+from .enums import POINTY, OFFSET, CUBIC
+
+
+class DenseGrid(BaseGrid, MutableMapping):
+    """
+        Implements a configurable hexagonal Grid backed by a contiguous array.
+
+        The cells are stored in a list covering a `width` by `height` rectangle of coordinates
+        starting at `origin`, along with a bytearray recording which slots are occupied. The
+        rectangle spans the first and the last component of each key: the column and row in the
+        offset coordinate systems, q and r in axial coordinates, and x and z in cube coordinates.
+        Rectangular maps in offset coordinates and parallelograms in axial coordinates fill the
+        array exactly.
+    """
+
+    def __init__(self, width, height, origin=(0, 0), hexagon_type=POINTY,
+                 coordinate_system=OFFSET, trusted=False):
+        """
+            Constructs an empty DenseGrid able to hold the `width` by `height` rectangle of
+            coordinates starting at `origin`. The hexagon type, coordinate system and trusted
+            options are the same as for a Grid.
+
+            Examples:
+
+            >>> DenseGrid(10, 10)
+            <DenseGrid POINTY, OFFSET_ODD_ROWS>
+            >>> DenseGrid(10, 10, origin=(-5, -5), coordinate_system=CUBIC).bounds
+            ((-5, -5), (4, 4))
+        """
+        super().__init__(hexagon_type, coordinate_system, trusted)
+        if width < 0 or height < 0:
+            raise ValueError('width and height must be non-negative')
+        self._allocate(width, height, origin)
+
+    def _allocate(self, width, height, origin):
+        """
+            Discards every item and allocates empty storage for the given rectangle.
+        """
+        self.width = width
+        self.height = height
+        self.origin = tuple(origin)
+        self._cells = [None] * (width * height)
+        self._occupied = bytearray(width * height)
+        self._length = 0
+
+    @property
+    def bounds(self):
+        """
+            The smallest and largest (first, last) key components the DenseGrid can hold.
+        """
+        a, b = self.origin
+        return (a, b), (a + self.width - 1, b + self.height - 1)
+
+    def _index(self, coordinates):
+        """
+            Returns the array index of the given valid coordinates, or -1 if they lie outside of
+            the DenseGrid.
+        """
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            return -1
+        a = coordinates[0] - self.origin[0]
+        b = coordinates[-1] - self.origin[1]
+        if 0 <= a < self.width and 0 <= b < self.height:
+            return b * self.width + a
+        return -1
+
+    def _key(self, index):
+        """
+            Returns the coordinates of the given array index.
+        """
+        b, a = divmod(index, self.width)
+        a += self.origin[0]
+        b += self.origin[1]
+        if self.coordinate_system is CUBIC:
+            return a, -a - b, b
+        return a, b
+
+    def __contains__(self, coordinates):
+        """
+            Returns True if there is an item at the given coordinates.
+        """
+        if not isinstance(coordinates, tuple):
+            return False
+        if len(coordinates) != (3 if self.coordinate_system is CUBIC else 2):
+            return False
+        try:
+            index = self._index(coordinates)
+            return index >= 0 and self._occupied[index] == 1
+        except TypeError:
+            return False
+
+    def __getitem__(self, coordinates):
+        """
+            Returns the cell at the given coordinates if it exists.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        index = self._index(coordinates)
+        if index < 0 or not self._occupied[index]:
+            raise KeyError(f'No item found at {coordinates}')
+        return self._cells[index]
+
+    def __setitem__(self, coordinates, cell):
+        """
+            Set the cell at the given coordinates to the given cell.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            raise ValueError('cube coordinates must sum to 0')
+        index = self._index(coordinates)
+        if index < 0:
+            raise ValueError(f'{coordinates} is outside of the bounds {self.bounds}')
+
+        added = not self._occupied[index]
+        if added:
+            self._occupied[index] = 1
+            self._length += 1
+        self._cells[index] = cell
+        self._notify_set(coordinates, cell, added)
+
+    def __delitem__(self, coordinates):
+        """
+            Delete the cell at the given coordinates if it exists.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        index = self._index(coordinates)
+        if index < 0 or not self._occupied[index]:
+            raise KeyError(f'No item found at {coordinates}')
+
+        cell = self._cells[index]
+        self._cells[index] = None
+        self._occupied[index] = 0
+        self._length -= 1
+        self._notify_deleted(coordinates, cell)
+
+    def __iter__(self):
+        """
+            Iterates over the coordinates of the occupied cells in array order.
+        """
+        for index in itertools.compress(range(len(self._occupied)), self._occupied):
+            yield self._key(index)
+
+    def __len__(self):
+        """
+            Returns the number of occupied cells.
+        """
+        return self._length
+
+    def clear(self):
+        """
+            Removes every item, keeping the bounds of the DenseGrid.
+        """
+        self._allocate(self.width, self.height, self.origin)
+        self._notify_cleared()
+
+    def _rekey(self, new_system):
+        """
+            Resizes the array to the bounding rectangle of the old rectangle in the new coordinate
+            system, then moves every cell to its new slot in place, so the old and the new array
+            are never held at the same time.
+        """
+        convert = _converter(self.coordinate_system, new_system)
+        old_cubic = self.coordinate_system is CUBIC
+        old_width = self.width
+        old_a, old_b = self.origin
+
+        # Along each row of the old rectangle, the converted coordinates of the cells in odd and
+        # in even positions are monotone. So the two cells at either end of the rows bound the
+        # whole rectangle in the new coordinate system.
+        edges = []
+        ends = sorted({0, 1, self.width - 2, self.width - 1} & set(range(self.width)))
+        for row in range(self.height):
+            edges.extend(convert(self._key(row * self.width + col)) for col in ends)
+
+        self.coordinate_system = new_system
+        if not edges:
+            self._allocate(self.width, self.height, self.origin)
+            return
+        first = [key[0] for key in edges]
+        last = [key[-1] for key in edges]
+        new_a, new_b = min(first), min(last)
+        width = max(first) - new_a + 1
+        size = width * (max(last) - new_b + 1)
+
+        cells, occupied = self._cells, self._occupied
+        if size > len(cells):
+            cells.extend(itertools.repeat(None, size - len(cells)))
+            occupied.extend(bytes(size - len(occupied)))
+        # Each cell moves into its new slot, and the cell that was there moves on to its own new
+        # slot, until a free slot is reached. Moved cells are marked with a 2 rather than a 1, so
+        # they are told apart from the cells still waiting to move.
+        start = occupied.find(1)
+        while start >= 0:
+            index = start
+            cell = cells[index]
+            cells[index] = None
+            occupied[index] = 0
+            while True:
+                b, a = divmod(index, old_width)
+                a += old_a
+                b += old_b
+                key = convert((a, -a - b, b) if old_cubic else (a, b))
+                target = (key[-1] - new_b) * width + key[0] - new_a
+                if occupied[target] != 1:
+                    break
+                cells[target], cell = cell, cells[target]
+                occupied[target] = 2
+                index = target
+            cells[target] = cell
+            occupied[target] = 2
+            start = occupied.find(1, start + 1)
+        del cells[size:]
+        del occupied[size:]
+
+        self._occupied = occupied.replace(b'\x02', b'\x01')
+        self.width = width
+        self.height = size // width
+        self.origin = new_a, new_b
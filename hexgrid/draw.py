@@ -1,22 +1,59 @@
 import itertools
 import math
-from tkinter import Tk, Canvas, ALL, BOTH
+from collections.abc import Mapping
+from tkinter import Canvas, ALL, BOTH
 
-from .grid import Grid
+from .grid import Grid, _converter
 from .enums import HexagonType, CoordinateSystem
 from .enums import FLAT, POINTY
 from .enums import OFFSET, CUBIC, AXIAL
 from .enums import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
 
+DEFAULT_FILL = '#7070ff'
+VIEW_TAG = 'view'
+
+
+def visible_tiles(hexagon_type, radius, rect, size=1):
+    """
+        Yields the axial (q, r) coordinates of the `size` by `size` tiles of hexagons that may
+        intersect the given (x0, y0, x1, y1) rectangle of world pixel coordinates. Tile (q, r)
+        holds the hexagons with axial coordinates (q * size + i, r * size + j) for i and j in
+        range(size), so with the default size of 1 the tiles are the hexagons themselves.
+
+        Only the tiles overlapping the rectangle are visited, so the cost grows with the area of
+        the rectangle and not with the size of the Grid.
+
+        >>> sorted(visible_tiles(POINTY, 10, (-1, -1, 1, 1)))
+        [(-1, -1), (-1, 0), (0, -1), (0, 0), (1, -1)]
+    """
+    x0, y0, x1, y1 = rect
+    # Grow the rectangle by a hexagon, so that partially visible hexagons are included.
+    x0, y0, x1, y1 = x0 - radius, y0 - radius, x1 + radius, y1 + radius
+    step = radius * math.sqrt(3)
+    # One axial component only depends on one pixel axis: r on y for pointy hexagons, and q on x
+    # for flat ones. Walk that component, and bound the other one on each band of tiles.
+    if hexagon_type is POINTY:
+        outer, inner = (y0 / (1.5 * radius), y1 / (1.5 * radius)), (x0 / step, x1 / step)
+    else:
+        outer, inner = (x0 / (1.5 * radius), x1 / (1.5 * radius)), (y0 / step, y1 / step)
+
+    for band in range(math.floor(outer[0] / size), math.floor(outer[1] / size) + 1):
+        low, high = band * size, band * size + size - 1
+        first = math.floor((inner[0] - high / 2) / size)
+        last = math.floor((inner[1] - low / 2) / size)
+        for tile in range(first, last + 1):
+            yield (tile, band) if hexagon_type is POINTY else (band, tile)
+
 
 class DrawGrid(Canvas):
     """
         Draws a Grid object for debugging purposes.
     """
-    def __init__(self, grid, radius=50, master=Tk()):
+    def __init__(self, grid, radius=50, master=None):
         """
             Draws the given Grid. If an iterable of coordinates is given, only draw the cells with
-            the given coordinates. The default radius for the hexagonal cells is 50 pixels.
+            the given coordinates. The default radius for the hexagonal cells is 50 pixels. The
+            master defaults to the Tk root window, which is only created once a DrawGrid is.
         """
         super().__init__(master=master, highlightthickness=0)
         self.height = self.winfo_height()
@@ -24,6 +61,14 @@ class DrawGrid(Canvas):
         self.bind("<Configure>", self.on_resize)
         self.grid = grid
         self.radius = radius
+        # The state of the view drawn by show(): the world pixel coordinates shown at the top left
+        # corner of the canvas, the zoom factor, and the canvas items of every visible tile.
+        self.pan = (-radius, -radius)
+        self.zoom = 1.0
+        self._view = None
+        self._tiles = {}
+        self._tile_size = 1
+        self._drag = None
 
     def draw_hexagon(self, coord, label=False, fill='#7070ff'):
         """
@@ -50,6 +95,13 @@ class DrawGrid(Canvas):
         """
             Callback for resize events.
         """
+        if self._view is not None:
+            # Only the visible part of the Grid is drawn, so there is nothing to rescale.
+            self.width = event.width
+            self.height = event.height
+            self.update_view()
+            return
+
         # determine the ratio of old width/height to new width/height
         wscale = event.width / self.width
         hscale = event.height / self.height
@@ -75,11 +127,149 @@ class DrawGrid(Canvas):
         self.pack(fill=BOTH, expand=True)
         self.master.mainloop()
 
+    def show(self, fill=DEFAULT_FILL, labels=False, min_radius=4):
+        """
+            Draws the Grid interactively, only creating canvas items for the hexagons inside the
+            window. Dragging with the left mouse button pans the view and the mouse wheel zooms
+            it. Items are created and deleted as hexagons enter and leave the window, so large
+            Grids stay responsive.
+
+            The fill is either a single color, a mapping from cell values to colors, or a
+            callable taking a cell value and returning its color. Once zoomed out so far that the
+            hexagons would be smaller than `min_radius` pixels, neighboring hexagons are merged
+            into coarser tiles, colored after the cell in their middle. Labels are only drawn on
+            single hexagons.
+        """
+        self._view = {'fill': fill, 'labels': labels, 'min_radius': min_radius}
+        self.bind('<ButtonPress-1>', self.on_press)
+        self.bind('<B1-Motion>', self.on_drag)
+        self.bind('<MouseWheel>', self.on_wheel)
+        self.bind('<Button-4>', self.on_wheel)
+        self.bind('<Button-5>', self.on_wheel)
+        self.pack(fill=BOTH, expand=True)
+        self.update_view()
+        self.master.mainloop()
+
+    def on_press(self, event):
+        """
+            Callback for mouse button presses, starting a drag.
+        """
+        self._drag = (event.x, event.y)
+
+    def on_drag(self, event):
+        """
+            Callback for mouse drags, panning the view along with the mouse.
+        """
+        x, y = self._drag
+        self._drag = (event.x, event.y)
+        self.pan_by(event.x - x, event.y - y)
+
+    def on_wheel(self, event):
+        """
+            Callback for mouse wheel events, zooming the view around the mouse.
+        """
+        zoom_in = event.num == 4 or event.delta > 0
+        self.zoom_at(1.25 if zoom_in else 0.8, event.x, event.y)
+
+    def pan_by(self, dx, dy):
+        """
+            Moves the view by the given number of screen pixels.
+        """
+        x, y = self.pan
+        self.pan = (x - dx / self.zoom, y - dy / self.zoom)
+        # Only the items of the visible tiles exist, so moving them is cheap.
+        self.move(VIEW_TAG, dx, dy)
+        self.update_view()
+
+    def zoom_at(self, factor, x, y):
+        """
+            Zooms the view by the given factor, keeping the given screen point in place.
+        """
+        px, py = self.pan
+        self.pan = (px + x / self.zoom - x / (self.zoom * factor),
+                    py + y / self.zoom - y / (self.zoom * factor))
+        self.zoom *= factor
+        self.scale(VIEW_TAG, x, y, factor, factor)
+        self.update_view()
+
+    def update_view(self):
+        """
+            Brings the canvas up to date with the visible part of the Grid, deleting the items of
+            the tiles that left the window and drawing the tiles that entered it.
+        """
+        size = max(1, math.ceil(self._view['min_radius'] / (self.radius * self.zoom)))
+        if size != self._tile_size:
+            self.delete(VIEW_TAG)
+            self._tiles = {}
+            self._tile_size = size
+
+        x, y = self.pan
+        rect = (x, y, x + self.winfo_width() / self.zoom, y + self.winfo_height() / self.zoom)
+        visible = set(visible_tiles(self.grid.hexagon_type, self.radius, rect, size))
+        for tile in self._tiles.keys() - visible:
+            items = self._tiles.pop(tile)
+            if items:
+                self.delete(*items)
+
+        convert = _converter(AXIAL, self.grid.coordinate_system)
+        for tile in visible - self._tiles.keys():
+            self._tiles[tile] = self._draw_tile(tile, size, convert)
+
+    def _draw_tile(self, tile, size, convert):
+        """
+            Draws the tile with the given axial coordinates, and returns its canvas items.
+        """
+        q, r = tile
+        middle = (q * size + size // 2, r * size + size // 2)
+        # A tile is drawn if the cell in its middle exists.
+        coord = convert(middle)
+        if coord not in self.grid:
+            return ()
+
+        fill = self._view['fill']
+        value = self.grid[coord]
+        if isinstance(fill, Mapping):
+            fill = fill.get(value, DEFAULT_FILL)
+        elif callable(fill):
+            fill = fill(value)
+
+        if size == 1:
+            center = self.axial_to_pixel(q, r, self.radius)
+            vertices = self.hex_corners(center, self.radius)
+        else:
+            # The parallelogram covering the hexagons of the tile.
+            q0, r0 = q * size - 0.5, r * size - 0.5
+            vertices = [self.axial_to_pixel(a, b, self.radius)
+                        for a, b in [(q0, r0), (q0 + size, r0), (q0 + size, r0 + size),
+                                     (q0, r0 + size)]]
+
+        items = [self.create_polygon(tuple(itertools.chain.from_iterable(map(self._to_screen,
+                                                                             vertices))),
+                                     fill=fill, outline='black' if size == 1 else '',
+                                     tags=VIEW_TAG)]
+        if size == 1 and self._view['labels']:
+            items.append(self.create_text(*self._to_screen(center), text=f'{coord}',
+                                          tags=VIEW_TAG))
+        return items
+
+    def _to_screen(self, point):
+        """
+            Converts world pixel coordinates to coordinates on the canvas.
+        """
+        x, y = point
+        return (x - self.pan[0]) * self.zoom, (y - self.pan[1]) * self.zoom
+
     def hex_to_pixel(self, coord, radius):
         """
             Converts hexagonal coordinates to cartesian pixel coordinates for drawing on a screen.
         """
         q, r = Grid.convert(coord, self.grid.coordinate_system, AXIAL)
+        return self.axial_to_pixel(q, r, radius)
+
+    def axial_to_pixel(self, q, r, radius):
+        """
+            Converts possibly fractional axial coordinates to cartesian pixel coordinates.
+        """
         if self.grid.hexagon_type == POINTY:
             x = radius * math.sqrt(3) * (q + r / 2)
             y = radius * (3 / 2) * r
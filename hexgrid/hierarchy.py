@@ -0,0 +1,364 @@
+"""
+Defines the hierarchical path planner built by Grid.build_hierarchy.
+"""
+import heapq
+import math
+
+from .utils import step_cost_function
+from .grid import _TO_CUBE, _FROM_CUBE
+
+
+def _dijkstra(graph, start, goal=None):
+    """
+        Runs Dijkstra's algorithm over a graph {node: [(neighbor, cost)]} outwards from start,
+        stopping early once goal is reached. Returns the dicts (costs, came_from).
+    """
+    costs = {start: 0}
+    came_from = {start: None}
+    frontier = [(0, start)]
+    while frontier:
+        cost, current = heapq.heappop(frontier)
+        if current == goal:
+            break
+        if cost > costs[current]:
+            continue
+        for neighbor, step in graph[current]:
+            new_cost = cost + step
+            if neighbor not in costs or new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                came_from[neighbor] = current
+                heapq.heappush(frontier, (new_cost, neighbor))
+    return costs, came_from
+
+
+class PathHierarchy(object):
+    """
+        Plans paths over a Grid in two levels, as in HPA*. The Grid is split into clusters of
+        `cluster_size` by `cluster_size` hexagons along the x and z cube axes. Where a cluster
+        borders another, each contiguous run of passable crossings gets an entrance, and the
+        costs of the paths between the entrances of a cluster are found by searching the cluster
+        alone. A route is planned over the entrances, then refined into cells one cluster at a
+        time.
+
+        The entrances and the paths between them are computed the first time a cluster is
+        visited, and are discarded when a cell in the cluster, or on its border, is set or
+        deleted. Call `invalidate` after changing the cost of a cell some other way.
+
+        The path is refined with one search over the clusters along the route and beside its
+        corners, so it is only longer than the shortest when the shortest leaves those clusters.
+        Paths are only guaranteed to be found when the cost of a step depends on the cell stepped
+        onto, as with a cost mapping.
+    """
+
+    def __init__(self, grid, cluster_size=16, cost=None, min_cost=1):
+        if not isinstance(cluster_size, int) or cluster_size < 2:
+            raise ValueError('cluster_size must be an integer of at least 2')
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cost = cost
+        self.min_cost = min_cost
+        self._step = step_cost_function(cost)
+        # The crossings kept as entrances between pairs of clusters, keyed by the ordered pair.
+        self._borders = {}
+        # The costs from each entrance of a cluster to the other cells it leads to directly.
+        self._edges = {}
+
+    def cluster(self, coordinates):
+        """
+            Returns the (x, z) index of the cluster holding the given coordinates.
+        """
+        x, _, z = _TO_CUBE[self.grid.coordinate_system](coordinates)
+        return x // self.cluster_size, z // self.cluster_size
+
+    def _cube(self, cluster, i, j):
+        """
+            Returns the grid coordinates of the cell (i, j) of the given cluster.
+        """
+        x = cluster[0] * self.cluster_size + i
+        z = cluster[1] * self.cluster_size + j
+        return _FROM_CUBE[self.grid.coordinate_system]((x, -x - z, z))
+
+    def _passable(self, src, dest):
+        """
+            Returns the cost of the step from src to dest, or None if it is impassable.
+        """
+        step = self._step(src, dest)
+        if step is None or step == math.inf:
+            return None
+        return step
+
+    @staticmethod
+    def _neighbors(cluster):
+        """
+            Returns the six clusters bordering the given cluster.
+        """
+        x, z = cluster
+        return [(x + 1, z), (x + 1, z - 1), (x, z - 1), (x - 1, z), (x - 1, z + 1), (x, z + 1)]
+
+    def _border(self, first, second):
+        """
+            Returns the list of entrances (a, b, cost from a to b, cost from b to a) between the
+            cells a of the first cluster and b of the second.
+        """
+        key = (first, second) if first < second else (second, first)
+        if key not in self._borders:
+            self._borders.update(self._find_borders(key[0]))
+        crossings = self._borders[key]
+        if key[0] == first:
+            return crossings
+        return [(b, a, ba, ab) for a, b, ab, ba in crossings]
+
+    def _find_borders(self, cluster):
+        """
+            Returns the entrances between the given cluster and each of its neighbors, as a dict
+            keyed by the ordered pairs of clusters.
+        """
+        size = self.cluster_size
+        grid = self.grid
+        perimeter = {(i, j) for i in range(size) for j in (0, size - 1)}
+        perimeter.update((i, j) for i in (0, size - 1) for j in range(size))
+
+        crossings = {}
+        for i, j in perimeter:
+            a = self._cube(cluster, i, j)
+            if a not in grid:
+                continue
+            for b in grid.neighbor_coordinates(a):
+                other = self.cluster(b)
+                if other == cluster:
+                    continue
+                ab, ba = self._passable(a, b), self._passable(b, a)
+                if ab is not None or ba is not None:
+                    crossings.setdefault(other, []).append((a, b, ab, ba))
+
+        borders = {}
+        for other in self._neighbors(cluster):
+            entrances = []
+            for run in self._runs(crossings.get(other, [])):
+                # Keep the middle crossing of every run, and its ends too on long runs.
+                run.sort()
+                picks = {len(run) // 2}
+                if len(run) > size:
+                    picks.update((0, len(run) - 1))
+                entrances.extend(run[i] for i in sorted(picks))
+            if cluster < other:
+                borders[cluster, other] = entrances
+            else:
+                borders[other, cluster] = [(b, a, ba, ab) for a, b, ab, ba in entrances]
+        return borders
+
+    def _runs(self, edges):
+        """
+            Splits the crossings between two clusters into runs, along which the cells on either
+            side are each adjacent or the same.
+        """
+        grid = self.grid
+
+        def near(c, d):
+            return c == d or grid.distance(c, d) == 1
+
+        runs = []
+        remaining = list(edges)
+        while remaining:
+            run = [remaining.pop()]
+            frontier = list(run)
+            while frontier:
+                a, b = frontier.pop()[:2]
+                linked = [e for e in remaining if near(a, e[0]) and near(b, e[1])]
+                remaining = [e for e in remaining if not (near(a, e[0]) and near(b, e[1]))]
+                run.extend(linked)
+                frontier.extend(linked)
+            runs.append(run)
+        return runs
+
+    def _cluster_edges(self, cluster):
+        """
+            Returns {entrance: [(cell, cost)]} for every entrance of the given cluster, listing
+            the entrances it reaches inside the cluster and the cells it crosses over to.
+        """
+        edges = self._edges.get(cluster)
+        if edges is not None:
+            return edges
+
+        edges = {}
+        for other in self._neighbors(cluster):
+            for a, b, ab, _ in self._border(cluster, other):
+                edges.setdefault(a, [])
+                if ab is not None:
+                    edges[a].append((b, ab))
+
+        graph = self._local_graph(cluster)
+        for entrance in edges:
+            costs, _ = _dijkstra(graph, entrance)
+            edges[entrance].extend((other, costs[other]) for other in edges
+                                   if other != entrance and other in costs)
+        self._edges[cluster] = edges
+        return edges
+
+    def _local_graph(self, cluster, reverse=False):
+        """
+            Returns the graph {cell: [(neighbor, cost)]} of the passable steps between the cells
+            of the given cluster, or of the steps into each cell if `reverse` is True.
+        """
+        grid = self.grid
+        size = self.cluster_size
+        cells = [self._cube(cluster, i, j) for i in range(size) for j in range(size)]
+        graph = {cell: [] for cell in cells if cell in grid}
+        for cell, steps in graph.items():
+            for neighbor in grid.neighbor_coordinates(cell):
+                if neighbor in graph:
+                    if reverse:
+                        step = self._passable(neighbor, cell)
+                    else:
+                        step = self._passable(cell, neighbor)
+                    if step is not None:
+                        steps.append((neighbor, step))
+        return graph
+
+    def invalidate(self, coordinates):
+        """
+            Discards the entrances and paths of the cluster holding the given coordinates, and
+            those of the neighboring clusters if the coordinates are on the cluster's border.
+        """
+        cluster = self.cluster(coordinates)
+        affected = {cluster}
+        x, _, z = _TO_CUBE[self.grid.coordinate_system](coordinates)
+        edge = (0, self.cluster_size - 1)
+        if x % self.cluster_size in edge or z % self.cluster_size in edge:
+            for neighbor in self.grid.neighbor_coordinates(coordinates, validate=False):
+                affected.add(self.cluster(neighbor))
+
+        for other in affected:
+            self._edges.pop(other, None)
+            if other != cluster:
+                self._borders.pop((cluster, other) if cluster < other else (other, cluster), None)
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Invalidates the clusters around a set cell, whose value may change its cost.
+        """
+        self.invalidate(coordinates)
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Invalidates the clusters around a deleted cell.
+        """
+        self.invalidate(coordinates)
+
+    def cleared(self):
+        """
+            Forgets every cluster.
+        """
+        self._borders = {}
+        self._edges = {}
+
+    def shortest_path_coordinates(self, src, dest):
+        """
+            Returns an ordered list of coordinates of a short path from src to dest, or an empty
+            list if none was found.
+        """
+        if src not in self.grid or dest not in self.grid:
+            return []
+        if src == dest:
+            return [src]
+
+        grid = self.grid
+        to_cube = _TO_CUBE[grid.coordinate_system]
+        gx, gy, gz = to_cube(dest)
+        dest_cluster = self.cluster(dest)
+        # The costs from src to the cells of its cluster, and to dest from the cells of its own.
+        from_src, _ = _dijkstra(self._local_graph(self.cluster(src)), src)
+        to_dest, _ = _dijkstra(self._local_graph(dest_cluster, reverse=True), dest)
+
+        def neighbors(node):
+            """Yields the (node, cost) steps of the abstract graph out of the given node"""
+            cluster = self.cluster(node)
+            if node == src:
+                for entrance in self._cluster_edges(cluster):
+                    if entrance in from_src and entrance != src:
+                        yield entrance, from_src[entrance]
+            yield from self._cluster_edges(cluster).get(node, ())
+            if cluster == dest_cluster and node in to_dest:
+                yield dest, to_dest[node]
+
+        # A* over the abstract graph, with the same heuristic as the flat search.
+        frontier = [(0, 0, src)]
+        came_from = {src: None}
+        cost_so_far = {src: 0}
+        counter = 1
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if current == dest:
+                break
+            for node, step in neighbors(current):
+                new_cost = cost_so_far[current] + step
+                if node not in cost_so_far or new_cost < cost_so_far[node]:
+                    cost_so_far[node] = new_cost
+                    came_from[node] = current
+                    x, y, z = to_cube(node)
+                    priority = new_cost + self.min_cost * max(abs(x - gx), abs(y - gy),
+                                                              abs(z - gz))
+                    heapq.heappush(frontier, (priority, counter, node))
+                    counter += 1
+
+        if dest not in came_from:
+            return []
+        route = [dest]
+        while came_from[route[-1]] is not None:
+            route.append(came_from[route[-1]])
+        route.reverse()
+        return self._refine(route)
+
+    def _refine(self, route):
+        """
+            Expands a route over the abstract graph into the cells along it, with a single search
+            over the clusters the route goes through and those beside its corners. The path may
+            cross between these clusters anywhere rather than only through the entrances on the
+            route, so it is the shortest path that stays within them.
+        """
+        src, dest = route[0], route[-1]
+        grid = self.grid
+        size = self.cluster_size
+        to_cube = _TO_CUBE[grid.coordinate_system]
+        gx, gy, gz = to_cube(dest)
+
+        # The clusters along the route, and those bordering two of them, through which a shorter
+        # path may cut a corner of the route.
+        clusters = {self.cluster(node) for node in route}
+        corridor = set(clusters)
+        for cluster in clusters:
+            for neighbor in self._neighbors(cluster):
+                if len(clusters.intersection(self._neighbors(neighbor))) >= 2:
+                    corridor.add(neighbor)
+
+        step_cost = self._passable
+        uniform = self.cost is None
+        costs = {src: 0}
+        came_from = {src: None}
+        frontier = [(0, 0, src)]
+        while frontier:
+            _, cost, current = heapq.heappop(frontier)
+            if current == dest:
+                break
+            if cost > costs[current]:
+                continue
+            for neighbor in grid.neighbor_coordinates(current):
+                x, y, z = to_cube(neighbor)
+                if (x // size, z // size) not in corridor:
+                    continue
+                step = 1 if uniform else step_cost(current, neighbor)
+                if step is None:
+                    continue
+                new_cost = cost + step
+                if neighbor not in costs or new_cost < costs[neighbor]:
+                    costs[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    priority = new_cost + self.min_cost * max(abs(x - gx), abs(y - gy),
+                                                              abs(z - gz))
+                    heapq.heappush(frontier, (priority, new_cost, neighbor))
+
+        path = [dest]
+        while path[-1] != src:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
@@ -0,0 +1,209 @@
+"""
+Defines the change journal built by Grid.build_journal, and the binary deltas returned by
+Grid.changes_since and Grid.diff and read by Grid.apply.
+
+A delta is a header followed by sections starting on 8 byte boundaries, in the byte order of the
+machine that wrote it:
+
+    * the magic bytes b'HEXDELTA', whether the Grid was cleared first, the byte order, the
+      typecode of the deleted coordinates, the versions the delta goes from and to, and the
+      number of deleted cells
+    * the first and the last component of the coordinates of every deleted cell
+    * the cells set, as a saved Grid, which records the coordinate system of every key
+"""
+import io
+import struct
+import sys
+from array import array
+
+from .enums import CUBIC
+from .grid import _converter
+from .storage import _INT32, _align, _read, _write
+
+MAGIC = b'HEXDELTA'
+# magic, cleared, byte order, coordinate typecode, from version, to version, number of deletes.
+_HEADER = struct.Struct('<8s?cc5xQQQ')
+
+
+class ChangeJournal(object):
+    """
+        Records the coordinates of every cell set or deleted on a Grid, numbering the changes
+        with a version that goes up by one per change. Only the version of the latest change to
+        each cell is kept, so the journal grows with the number of distinct cells changed rather
+        than with the number of changes, and a delta holds the current value of each changed cell.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.version = 0
+        # The oldest version deltas can be made from, and the version of the latest clear.
+        self.oldest = 0
+        self._cleared = 0
+        # Maps the coordinates of each changed cell to the version of its latest change, in
+        # version order.
+        self._changed = {}
+
+    def _record(self, coordinates):
+        """
+            Records a change to the cell at the given coordinates.
+        """
+        self.version += 1
+        self._changed.pop(coordinates, None)
+        self._changed[coordinates] = self.version
+
+    def cell_set(self, coordinates, cell, added):
+        """
+            Records a set cell.
+        """
+        self._record(coordinates)
+
+    def cell_deleted(self, coordinates, cell):
+        """
+            Records a deleted cell.
+        """
+        self._record(coordinates)
+
+    def cleared(self):
+        """
+            Records that every cell was deleted, which replaces every change recorded before.
+        """
+        self.version += 1
+        self._cleared = self.version
+        self._changed = {}
+
+    def changed_since(self, version):
+        """
+            Returns whether the Grid was cleared since the given version, and the list of
+            coordinates changed since, from the latest change back.
+        """
+        if not self.oldest <= version <= self.version:
+            raise ValueError(f'version must be between {self.oldest} and {self.version}')
+        changed = []
+        for coordinates, changed_at in reversed(self._changed.items()):
+            if changed_at <= version:
+                break
+            changed.append(coordinates)
+        return version < self._cleared, changed
+
+    def truncate(self, version):
+        """
+            Forgets the changes up to the given version, after which deltas can only be made from
+            it or later versions.
+        """
+        if not self.oldest <= version <= self.version:
+            raise ValueError(f'version must be between {self.oldest} and {self.version}')
+        self.oldest = version
+        for coordinates, changed_at in list(self._changed.items()):
+            if changed_at > version:
+                break
+            del self._changed[coordinates]
+
+
+def encode(grid, deleted, items, cleared=False, start=0, end=0):
+    """
+        Returns the delta deleting the given coordinates and setting the given (coordinates,
+        cell) pairs, in the coordinate system of the Grid.
+    """
+    first = [key[0] for key in deleted]
+    last = [key[-1] for key in deleted]
+    if not all(type(c) is int for c in first + last):
+        raise ValueError('only Grids with integer coordinates have deltas')
+    coordinate = 'i' if all(c in _INT32 for c in first + last) else 'q'
+    byteorder = b'<' if sys.byteorder == 'little' else b'>'
+
+    f = io.BytesIO()
+    f.write(_HEADER.pack(MAGIC, cleared, byteorder, coordinate.encode(), start, end,
+                         len(deleted)))
+    for section in [array(coordinate, first), array(coordinate, last)]:
+        f.write(bytes(_align(f.tell()) - f.tell()))
+        f.write(section)
+    f.write(bytes(_align(f.tell()) - f.tell()))
+    _write(f, grid.hexagon_type, grid.coordinate_system, items)
+    return f.getvalue()
+
+
+def changes_since(grid, version):
+    """
+        Returns the delta from the given version to the current one. See `Grid.changes_since`.
+    """
+    if grid.journal is None:
+        raise ValueError('the Grid has no journal; call build_journal first')
+    cleared, changed = grid.journal.changed_since(version)
+    deleted, items = [], []
+    for coordinates in changed:
+        if coordinates in grid:
+            items.append((coordinates, grid[coordinates]))
+        elif not cleared:
+            deleted.append(coordinates)
+    return encode(grid, deleted, items, cleared, version, grid.journal.version)
+
+
+def diff(grid, other):
+    """
+        Returns the delta turning the Grid into the other. See `Grid.diff`.
+    """
+    if other.coordinate_system is not grid.coordinate_system:
+        raise ValueError('both Grids must use the same coordinate system')
+    deleted = [coordinates for coordinates in grid if coordinates not in other]
+    items = []
+    for coordinates, cell in other.items():
+        if coordinates not in grid:
+            items.append((coordinates, cell))
+        else:
+            current = grid[coordinates]
+            if current is not cell and current != cell:
+                items.append((coordinates, cell))
+    start = grid.journal.version if grid.journal is not None else 0
+    end = other.journal.version if other.journal is not None else 0
+    return encode(grid, deleted, items, False, start, end)
+
+
+def decode(delta):
+    """
+        Returns (cleared, from version, to version, deleted, system, items) read from a delta,
+        where deleted and items are in the returned coordinate system.
+    """
+    delta = memoryview(delta)
+    if len(delta) < _HEADER.size:
+        raise ValueError('truncated delta')
+    magic, cleared, byteorder, coordinate, start, end, count = _HEADER.unpack_from(delta)
+    if magic != MAGIC:
+        raise ValueError('not a hexgrid delta')
+    if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+        raise ValueError('the delta was written with a different byte order')
+
+    coordinate = coordinate.decode()
+    offset = _HEADER.size
+    columns = []
+    for _ in range(2):
+        offset = _align(offset)
+        size = count * struct.calcsize(coordinate)
+        if offset + size > len(delta):
+            raise ValueError('truncated delta')
+        columns.append(delta[offset:offset + size].cast(coordinate).tolist())
+        offset += size
+    _, system, keys, values = _read(delta[_align(offset):])
+    if system is CUBIC:
+        deleted = [(a, -a - b, b) for a, b in zip(*columns)]
+    else:
+        deleted = list(zip(*columns))
+    if values is None:
+        values = [None] * len(keys)
+    return cleared, start, end, deleted, system, list(zip(keys, values))
+
+
+def apply(grid, delta):
+    """
+        Applies a delta to the Grid. See `Grid.apply`.
+    """
+    cleared, _, end, deleted, system, items = decode(delta)
+    convert = _converter(system, grid.coordinate_system)
+    if cleared:
+        grid.clear()
+    for coordinates in deleted:
+        coordinates = convert(coordinates)
+        if coordinates in grid:
+            del grid[coordinates]
+    for coordinates, cell in items:
+        grid[convert(coordinates)] = cell
+    return end
@@ -0,0 +1,63 @@
+"""
+Implements Grid.nearest. Requires NumPy.
+"""
+import numpy as np
+
+from . import arrays
+from .grid import _FROM_CUBE, _TO_CUBE, _RING_DIRECTIONS
+
+
+def nearest(grid, coordinates, k=1):
+    """
+        Returns the lists of the k nearest occupied cells to each of the given coordinates. See
+        `Grid.nearest`.
+    """
+    if k < 1:
+        raise ValueError('k must be at least 1')
+    coordinates = list(coordinates)
+    if not grid:
+        return [[] for _ in coordinates]
+    results = []
+    # The occupied cells as cube coordinates, built the first time a search falls back on them.
+    keys = None
+    occupied = None
+    # Walking the rings probes one coordinate at a time, while comparing against every occupied
+    # cell takes a few vectorized passes, so the rings only pay off while they stay small.
+    budget = len(grid) // 100
+
+    from_cube = _FROM_CUBE[grid.coordinate_system]
+    to_cube = _TO_CUBE[grid.coordinate_system]
+    for center in coordinates:
+        found = [center] if center in grid else []
+        cx, cy, cz = to_cube(center)
+        radius = 1
+        probed = 1
+        while len(found) < k and probed <= budget:
+            # Walks around the ring from the cell `radius` steps away in direction 4.
+            x, y, z = cx - radius, cy, cz + radius
+            for dx, dy, dz in _RING_DIRECTIONS:
+                for _ in range(radius):
+                    cell = from_cube((x, y, z))
+                    if cell in grid:
+                        found.append(cell)
+                    x, y, z = x + dx, y + dy, z + dz
+                if len(found) >= k:
+                    break
+            probed += 6 * radius
+            radius += 1
+        if len(found) >= k:
+            results.append(found[:k])
+            continue
+
+        if occupied is None:
+            keys = list(grid)
+            occupied = arrays.to_cube(np.array(keys, dtype=np.int64), grid.coordinate_system)
+        center = arrays.to_cube(np.array([center], dtype=np.int64), grid.coordinate_system)
+        distances = arrays.cube_distances(center, occupied)[0]
+        if k < len(keys):
+            closest = np.argpartition(distances, k - 1)[:k]
+        else:
+            closest = np.arange(len(keys))
+        closest = closest[np.argsort(distances[closest], kind='stable')]
+        results.append([keys[i] for i in closest.tolist()])
+    return results
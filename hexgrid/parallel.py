@@ -0,0 +1,182 @@
+"""
+Solves batches of shortest path queries across a pool of processes, for Grid.shortest_paths.
+
+The pool never receives the Grid itself. Its occupied cells are written once to a block of shared
+memory, which each worker maps as a read-only Grid, so only the queries and the paths travel
+between processes. Compact maps are stored as one byte per coordinate in the bounding rectangle
+of their cells, which workers map as the occupancy array of a DenseGrid. Maps whose rectangle is
+mostly empty, such as sparse worlds or a few far apart cells, are stored as the sorted packed
+coordinates of their cells instead, which workers search in place like a MappedGrid.
+"""
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from .dense import DenseGrid
+from .enums import CUBIC
+from .grid import BaseGrid
+
+# The snapshot and search options of the worker process.
+_worker = {}
+
+# The bytes per cell of the packed coordinates, two 64 bit integers.
+_PACKED_SIZE = 16
+
+
+class _PackedGrid(BaseGrid, Mapping):
+    """
+        A read-only Grid of None cells over the sorted first and last components of the
+        coordinates of its cells, found by binary search like the cells of a MappedGrid.
+    """
+
+    def __init__(self, first, last, hexagon_type, coordinate_system):
+        super().__init__(hexagon_type, coordinate_system, trusted=True)
+        self._first = first
+        self._last = last
+
+    def _find(self, coordinates):
+        """
+            Returns the index of the given coordinates, or -1 if there is no cell.
+        """
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            return -1
+        a, b = coordinates[0], coordinates[-1]
+        lo = bisect_left(self._last, b)
+        hi = bisect_right(self._last, b, lo)
+        index = bisect_left(self._first, a, lo, hi)
+        if index < hi and self._first[index] == a:
+            return index
+        return -1
+
+    def __contains__(self, coordinates):
+        """
+            Returns True if there is a cell at the given coordinates.
+        """
+        return self._find(coordinates) >= 0
+
+    def __getitem__(self, coordinates):
+        """
+            Returns None if there is a cell at the given coordinates.
+        """
+        if self._find(coordinates) < 0:
+            raise KeyError(f'No item found at {coordinates}')
+        return None
+
+    def __iter__(self):
+        """
+            Iterates over the coordinates in sorted order.
+        """
+        if self.coordinate_system is CUBIC:
+            for a, b in zip(self._first, self._last):
+                yield a, -a - b, b
+        else:
+            yield from zip(self._first, self._last)
+
+    def __len__(self):
+        """
+            Returns the number of cells.
+        """
+        return len(self._first)
+
+
+def _snapshot(grid):
+    """
+        Returns (data, layout) describing the occupied cells of the Grid, where data is the
+        bytes to share and layout is either ('dense', width, height, origin), with data holding
+        1 for every occupied cell of the bounding rectangle in row order, or ('packed', count),
+        with data holding the first and then the last components of the coordinates of the cells,
+        sorted by last and then first component.
+    """
+    if isinstance(grid, DenseGrid):
+        return bytearray(grid._occupied), ('dense', grid.width, grid.height, grid.origin)
+
+    keys = list(grid)
+    if not keys:
+        return bytearray(), ('dense', 0, 0, (0, 0))
+    first = [key[0] for key in keys]
+    last = [key[-1] for key in keys]
+    origin = min(first), min(last)
+    width = max(first) - origin[0] + 1
+    height = max(last) - origin[1] + 1
+    if width * height > _PACKED_SIZE * len(keys):
+        # The rectangle would take more memory than the packed coordinates.
+        pairs = sorted(zip(last, first))
+        data = array('q', [a for _, a in pairs]).tobytes() + array('q', [b for b, _ in pairs])
+        return data, ('packed', len(keys))
+    occupancy = bytearray(width * height)
+    for a, b in zip(first, last):
+        occupancy[(b - origin[1]) * width + a - origin[0]] = 1
+    return occupancy, ('dense', width, height, origin)
+
+
+def _attach(name):
+    """
+        Attaches to the named shared memory block without taking ownership of it.
+    """
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 the block is registered again, but with the resource tracker the
+        # workers share with the process that created it, which unlinks it exactly once.
+        return SharedMemory(name)
+
+
+def _initialize(name, layout, length, hexagon_type, coordinate_system, options):
+    """
+        Builds the read-only snapshot Grid of a worker process over the shared memory block.
+    """
+    memory = _attach(name)
+    if layout[0] == 'packed':
+        count = layout[1]
+        columns = memory.buf[:2 * 8 * count].cast('q')
+        grid = _PackedGrid(columns[:count], columns[count:], hexagon_type, coordinate_system)
+    else:
+        _, width, height, origin = layout
+        grid = DenseGrid(0, 0, origin, hexagon_type, coordinate_system, trusted=True)
+        grid.width = width
+        grid.height = height
+        grid._occupied = memory.buf[:width * height]
+        grid._length = length
+    _worker.update(memory=memory, grid=grid, options=options)
+
+
+def _solve(pairs):
+    """
+        Returns the shortest paths between the given pairs of coordinates in the worker's Grid.
+    """
+    grid = _worker['grid']
+    cost, min_cost, algorithm = _worker['options']
+    return [grid.shortest_path_coordinates(src, dest, cost, min_cost, algorithm)
+            for src, dest in pairs]
+
+
+def shortest_paths(grid, pairs, workers=None, cost=None, min_cost=1, algorithm='astar',
+                   chunksize=64):
+    """
+        Returns the shortest path between every (src, dest) pair, in order, solving the queries
+        in `workers` processes. See `Grid.shortest_paths`.
+    """
+    pairs = list(pairs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    if workers == 1 or len(pairs) <= 1:
+        return [grid.shortest_path_coordinates(src, dest, cost, min_cost, algorithm)
+                for src, dest in pairs]
+
+    data, layout = _snapshot(grid)
+    memory = SharedMemory(create=True, size=max(1, len(data)))
+    try:
+        memory.buf[:len(data)] = data
+        initargs = (memory.name, layout, len(grid), grid.hexagon_type, grid.coordinate_system,
+                    (cost, min_cost, algorithm))
+        chunks = [pairs[i:i + chunksize] for i in range(0, len(pairs), chunksize)]
+        with ProcessPoolExecutor(workers, initializer=_initialize, initargs=initargs) as pool:
+            return [path for paths in pool.map(_solve, chunks) for path in paths]
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,224 @@
+"""
+Renders Grids to SVG and PNG files without tkinter or a display. Requires NumPy.
+
+The hexagon geometry of every cell is computed in one vectorized pass from a precomputed unit
+hexagon, and the files are written out in chunks, so that maps with hundreds of thousands of
+cells render in seconds.
+
+Example:
+>>> import io
+>>> out = io.StringIO()
+>>> render_svg(Grid.hexagon(1), out, fill={None: '#ff7070'})
+>>> out.getvalue().count('<polygon')
+7
+"""
+import struct
+import zlib
+from collections.abc import Mapping
+from html import escape
+
+import numpy as np
+
+from . import arrays
+from .grid import Grid
+from .enums import AXIAL
+
+DEFAULT_FILL = '#7070ff'
+
+_POLYGON = '<polygon points="' + ' '.join(['%.2f,%.2f'] * 6) + '" fill="%s"/>\n'
+_LABEL = '<text x="%.2f" y="%.2f" text-anchor="middle" dominant-baseline="central">%s</text>\n'
+
+
+def _layout(grid, coordinates, radius):
+    """
+        Returns the list of coordinates to draw, and the (N, 2) array of their pixel centers.
+    """
+    coordinates = list(grid if coordinates is None else coordinates)
+    if not coordinates:
+        return coordinates, np.zeros((0, 2))
+    axial = arrays.convert(coordinates, grid.coordinate_system, AXIAL)
+    return coordinates, arrays.axial_to_pixel(axial, grid.hexagon_type, radius)
+
+
+def _fill_colors(grid, coordinates, fill, column=None):
+    """
+        Returns the list of fill colors of the given coordinates. The fill is either a single
+        color, a mapping from cell values to colors, or a callable taking a cell value and
+        returning its color. If a column name is given, its values are colored instead of the
+        cell values, looking up each distinct value once.
+    """
+    if fill is None or isinstance(fill, str):
+        return [fill or DEFAULT_FILL] * len(coordinates)
+    if column is not None:
+        distinct, inverse = np.unique(grid.columns[column].take(coordinates),
+                                      return_inverse=True)
+        values = distinct.tolist()
+    else:
+        values = [grid.get(c) for c in coordinates]
+    if isinstance(fill, Mapping):
+        colors = [fill.get(value, DEFAULT_FILL) for value in values]
+    else:
+        colors = [fill(value) for value in values]
+    if column is not None:
+        return [colors[i] for i in inverse.tolist()]
+    return colors
+
+
+def _open(path, mode):
+    """
+        Returns a context manager for writing to the given path, or to the given file object.
+    """
+    if hasattr(path, 'write'):
+        return _Borrowed(path)
+    return open(path, mode)
+
+
+class _Borrowed(object):
+    """
+        Wraps a file object passed in by the caller so that `with` does not close it.
+    """
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        return self.f
+
+    def __exit__(self, *exc):
+        return False
+
+
+def render_svg(grid, path, coordinates=None, radius=10, fill=None, labels=False,
+               outline='black', chunk_size=10000, column=None):
+    """
+        Renders the hexagons at the given coordinates, or every cell of the Grid, to an SVG file.
+        `path` is a file name or a writable text file object.
+
+        The fill is either a single color, a mapping from cell values to colors, or a callable
+        taking a cell value and returning its color. Cells without a color in the mapping use
+        the default fill. If `column` names a column added by `Grid.add_column`, the fill
+        colors its values rather than the cell values. If `labels` is True, every hexagon is
+        labelled with its coordinates. The hexagons are formatted and written `chunk_size` at
+        a time.
+    """
+    coordinates, centers = _layout(grid, coordinates, radius)
+    corners = arrays.unit_corners(grid.hexagon_type) * radius
+
+    if len(coordinates):
+        x0, y0 = centers.min(axis=0) - radius
+        x1, y1 = centers.max(axis=0) + radius
+    else:
+        x0 = y0 = x1 = y1 = 0.0
+    width, height = x1 - x0, y1 - y0
+
+    with _open(path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'viewBox="{x0:.2f} {y0:.2f} {width:.2f} {height:.2f}" '
+                f'width="{width:.0f}" height="{height:.0f}">\n')
+        f.write(f'<g stroke="{escape(outline)}">\n')
+        for start in range(0, len(coordinates), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            # Every corner of every hexagon in the chunk at once: (n, 1, 2) + (6, 2) -> (n, 6, 2)
+            points = (centers[chunk, np.newaxis, :] + corners).reshape(-1, 12).tolist()
+            colors = _fill_colors(grid, coordinates[chunk], fill, column)
+            f.write(''.join(_POLYGON % (*p, escape(c)) for p, c in zip(points, colors)))
+        f.write('</g>\n')
+
+        if labels:
+            f.write('<g font-size="%.1f">\n' % (radius / 3))
+            for start in range(0, len(coordinates), chunk_size):
+                chunk = slice(start, start + chunk_size)
+                text = zip(centers[chunk].tolist(), coordinates[chunk])
+                f.write(''.join(_LABEL % (x, y, escape(str(c))) for (x, y), c in text))
+            f.write('</g>\n')
+        f.write('</svg>\n')
+
+
+def _rgb(color):
+    """
+        Parses a '#rgb' or '#rrggbb' color into a tuple of three bytes.
+    """
+    if not isinstance(color, str) or not color.startswith('#') or len(color) not in (4, 7):
+        raise ValueError(f'PNG colors must be of the form #rrggbb, not {color!r}')
+    digits = color[1:]
+    if len(digits) == 3:
+        digits = ''.join(d * 2 for d in digits)
+    return tuple(bytes.fromhex(digits))
+
+
+def _png_chunk(kind, data):
+    """
+        Returns a PNG chunk of the given type and data.
+    """
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def render_png(grid, path, coordinates=None, radius=10, fill=None, outline='#000000',
+               background='#ffffff', chunk_rows=256, column=None):
+    """
+        Renders the hexagons at the given coordinates, or every cell of the Grid, to an RGB PNG
+        file with one pixel per unit of radius. `path` is a file name or a writable binary file
+        object. The fill and column options are the same as for `render_svg`, but colors must
+        be given as '#rrggbb'. Labels are not supported.
+
+        Rather than drawing each polygon, every pixel is mapped back to the hexagon containing
+        it, `chunk_rows` rows of pixels at a time, and each chunk is compressed and written out
+        before the next one is computed.
+    """
+    coordinates, centers = _layout(grid, coordinates, radius)
+
+    # The palette holds the background, the outline, then each distinct fill color.
+    colors = _fill_colors(grid, coordinates, fill, column)
+    palette = list(dict.fromkeys(colors))
+    color_ids = {color: i + 2 for i, color in enumerate(palette)}
+    palette = np.array([_rgb(background), _rgb(outline)] + [_rgb(c) for c in palette],
+                       dtype=np.uint8)
+
+    if len(coordinates):
+        # Look up hexagons by their axial coordinates in a table over their bounding box.
+        axial = arrays.convert(coordinates, grid.coordinate_system, AXIAL)
+        low = axial.min(axis=0)
+        table = np.zeros(tuple(axial.max(axis=0) - low + 1), dtype=np.int32)
+        table[tuple((axial - low).T)] = [color_ids[c] for c in colors]
+        x0, y0 = np.floor(centers.min(axis=0) - radius)
+        x1, y1 = np.ceil(centers.max(axis=0) + radius)
+    else:
+        x0 = y0 = x1 = y1 = 0
+    width, height = int(x1 - x0), int(y1 - y0)
+
+    def cell_ids(rows):
+        """Returns the palette index of the hexagon under every pixel in the given rows"""
+        xs = x0 + 0.5 + np.arange(width)
+        ys = y0 + 0.5 + rows
+        points = np.stack(np.broadcast_arrays(xs[np.newaxis, :], ys[:, np.newaxis]), axis=-1)
+        axial = arrays.pixel_to_cube(points.reshape(-1, 2), grid.hexagon_type, radius)[:, [0, 2]]
+        axial -= low
+        inside = np.all((axial >= 0) & (axial < table.shape), axis=1)
+        ids = np.zeros(len(axial), dtype=np.int32)
+        ids[inside] = table[tuple(axial[inside].T)]
+        return ids.reshape(len(rows), width)
+
+    compressor = zlib.compressobj()
+    with _open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        for start in range(0, height, chunk_rows):
+            rows = np.arange(start, min(start + chunk_rows + 1, height))
+            ids = cell_ids(rows)
+            # Outline the pixels where the hexagon changes to the right or below.
+            edge = np.zeros(ids.shape, dtype=bool)
+            edge[:, :-1] |= ids[:, :-1] != ids[:, 1:]
+            edge[:-1, :] |= ids[:-1, :] != ids[1:, :]
+            ids[edge] = 1
+            if start + chunk_rows < height:
+                # The extra row was only needed to find the edges.
+                ids = ids[:-1]
+
+            pixels = palette[ids]
+            # Every row of a PNG starts with its filter type, which is 0 for none.
+            scanlines = np.concatenate(
+                (np.zeros((len(ids), 1), dtype=np.uint8), pixels.reshape(len(ids), -1)), axis=1)
+            data = compressor.compress(scanlines.tobytes())
+            if data:
+                f.write(_png_chunk(b'IDAT', data))
+        f.write(_png_chunk(b'IDAT', compressor.flush()))
+        f.write(_png_chunk(b'IEND', b''))
@@ -0,0 +1,356 @@
+"""
+Implements Grid.save and Grid.load, and defines the read-only MappedGrid returned by memory-mapped
+loads.
+
+A saved Grid is a header followed by sections starting on 8 byte boundaries, all in the byte
+order of the machine that saved it:
+
+    * the magic bytes b'HEXGRID\\0', the format version, the byte order, the names of the hexagon
+      type and coordinate system, the typecodes of the coordinates and of the values, and the
+      number of cells
+    * the first component of every key, as 32 or 64 bit integers
+    * the last component of every key, in the same type; cube keys are rebuilt from the two
+    * the values, as a column of bools, 32 or 64 bit integers or doubles; as 32 bit indexes into a
+      table of the distinct strings, stored as 64 bit end offsets into a blob of UTF-8; or as end
+      offsets into a blob of the values pickled one by one. Grids holding only None have no value
+      column
+
+The cells are sorted by their last key component and then their first, so that a mapped file can
+be searched in place.
+"""
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+
+from .grid import BaseGrid, Grid
+from .enums import HexagonType, CoordinateSystem, CUBIC
+
+MAGIC = b'HEXGRID\0'
+VERSION = 1
+# magic, version, byte order, hexagon type, coordinate system, coordinate and value typecodes,
+# number of distinct strings, number of cells.
+_HEADER = struct.Struct('<8sHc13s24scc2xIQ')
+
+_INT32 = range(-2**31, 2**31)
+_INT64 = range(-2**63, 2**63)
+
+
+def _align(offset):
+    """
+        Rounds the offset up to the next multiple of 8.
+    """
+    return -(-offset // 8) * 8
+
+
+def _value_kind(values):
+    """
+        Returns the typecode of the narrowest column holding every value exactly: 'n' for None,
+        '?' for bools, 'i' or 'q' for 32 or 64 bit integers, 'd' for floats, 's' for strings, or
+        'o' for pickled objects.
+    """
+    types = set(map(type, values))
+    if not types or types == {type(None)}:
+        return 'n'
+    if types == {bool}:
+        return '?'
+    if types == {int}:
+        if all(value in _INT32 for value in values):
+            return 'i'
+        if all(value in _INT64 for value in values):
+            return 'q'
+    if types == {float}:
+        return 'd'
+    if types == {str}:
+        return 's'
+    return 'o'
+
+
+def save(grid, path):
+    """
+        Writes the cells of the Grid to a binary file. See `Grid.save`.
+    """
+    with open(path, 'wb') as f:
+        _write(f, grid.hexagon_type, grid.coordinate_system, grid.items())
+
+
+def _write(f, hexagon_type, coordinate_system, items):
+    """
+        Writes the given (coordinates, cell) pairs to the file object in the saved Grid format.
+    """
+    items = sorted(items, key=lambda item: (item[0][-1], item[0][0]))
+    first = [key[0] for key, _ in items]
+    last = [key[-1] for key, _ in items]
+    if not all(type(c) is int for c in first + last):
+        raise ValueError('only Grids with integer coordinates can be saved')
+    coordinate = 'i' if all(c in _INT32 for c in first + last) else 'q'
+    values = [value for _, value in items]
+    kind = _value_kind(values)
+
+    sections = [array(coordinate, first), array(coordinate, last)]
+    distinct = 0
+    if kind in '?iqd':
+        sections.append(array('b' if kind == '?' else kind, values))
+    elif kind == 's':
+        # Maps usually repeat a few terrain names, so each string is only stored once.
+        table = {}
+        codes = array('I', [table.setdefault(value, len(table)) for value in values])
+        distinct = len(table)
+        sections.append(codes)
+        sections.extend(_blobs([value.encode() for value in table]))
+    elif kind == 'o':
+        # Equal objects are pickled separately, so that loading does not alias mutable values.
+        sections.extend(_blobs([pickle.dumps(value) for value in values]))
+
+    byteorder = b'<' if sys.byteorder == 'little' else b'>'
+    header = _HEADER.pack(MAGIC, VERSION, byteorder, hexagon_type.name.encode(),
+                          coordinate_system.name.encode(), coordinate.encode(),
+                          kind.encode(), distinct, len(items))
+    f.write(header)
+    offset = len(header)
+    for section in sections:
+        f.write(bytes(_align(offset) - offset))
+        f.write(section)
+        offset = _align(offset) + len(memoryview(section).cast('B'))
+
+
+def _blobs(blobs):
+    """
+        Returns the sections storing the given byte strings: their end offsets, and the blob of
+        them all.
+    """
+    ends = array('Q', [0] * len(blobs))
+    end = 0
+    for i, blob in enumerate(blobs):
+        end += len(blob)
+        ends[i] = end
+    return [ends, b''.join(blobs)]
+
+
+def _parse(buffer):
+    """
+        Returns (hexagon type, coordinate system, first, last, kind, column, table) views into a
+        saved Grid. The column holds the values, their indexes into the table of strings, or is
+        None. The table is a list of the distinct strings, or a tuple of the end offsets of the
+        pickled values and their blob.
+    """
+    buffer = memoryview(buffer)
+    if len(buffer) < _HEADER.size or bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError('not a saved Grid')
+    _, version, byteorder, hexagon_type, system, coordinate, kind, distinct, length = \
+        _HEADER.unpack_from(buffer)
+    if version != VERSION:
+        raise ValueError(f'unsupported Grid file version {version}')
+    if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+        raise ValueError('the Grid was saved on a machine with a different byte order')
+    hexagon_type = HexagonType[hexagon_type.rstrip(b'\0').decode()]
+    system = CoordinateSystem[system.rstrip(b'\0').decode()]
+    coordinate, kind = coordinate.decode(), kind.decode()
+
+    offset = _HEADER.size
+
+    def section(typecode, count):
+        """Returns a view of the next section, holding count items of the given type"""
+        nonlocal offset
+        start = _align(offset)
+        size = struct.calcsize(typecode) * count
+        offset = start + size
+        if offset > len(buffer):
+            raise ValueError('truncated Grid file')
+        return buffer[start:offset].cast(typecode)
+
+    first = section(coordinate, length)
+    last = section(coordinate, length)
+    column = table = None
+    if kind == '?':
+        column = section('?', length)
+    elif kind in 'iqd':
+        column = section(kind, length)
+    elif kind == 's':
+        column = section('I', length)
+        ends = section('Q', distinct)
+        blob = section('B', ends[-1] if distinct else 0)
+        starts = [0] + ends.tolist()
+        table = [str(blob[start:end], 'utf-8') for start, end in zip(starts, starts[1:])]
+        ends.release()
+        blob.release()
+    elif kind == 'o':
+        ends = section('Q', length)
+        table = ends, section('B', ends[-1] if length else 0)
+    return hexagon_type, system, first, last, kind, column, table
+
+
+def _decoder(kind, column, table):
+    """
+        Returns a function of a row index returning its value.
+    """
+    if kind == 'n':
+        return lambda index: None
+    if kind in '?iqd':
+        return column.__getitem__
+    if kind == 's':
+        return lambda index: table[column[index]]
+    ends, blob = table
+
+    def value(index):
+        """Unpickles the value of the given row"""
+        start = ends[index - 1] if index else 0
+        return pickle.loads(blob[start:ends[index]])
+    return value
+
+
+def load(path, use_mmap=False):
+    """
+        Reads a saved Grid. See `Grid.load`.
+    """
+    if use_mmap:
+        return MappedGrid(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    hexagon_type, system, keys, values = _read(data)
+    grid = Grid(hexagon_type, system)
+    if values is None:
+        grid._insert_unchecked(keys, None)
+    else:
+        dict.update(grid, zip(keys, values))
+    return grid
+
+
+def _read(buffer):
+    """
+        Returns the hexagon type, the coordinate system, and the lists of keys and of values of a
+        saved Grid, where the values are None if they are all None.
+    """
+    hexagon_type, system, first, last, kind, column, table = _parse(buffer)
+    first, last = first.tolist(), last.tolist()
+    if system is CUBIC:
+        keys = [(a, -a - b, b) for a, b in zip(first, last)]
+    else:
+        keys = list(zip(first, last))
+    if kind == 'n':
+        values = None
+    elif kind in '?iqd':
+        values = column.tolist()
+    elif kind == 's':
+        values = list(map(table.__getitem__, column.tolist()))
+    else:
+        values = list(map(_decoder(kind, column, table), range(len(keys))))
+    return hexagon_type, system, keys, values
+
+
+class MappedGrid(BaseGrid, Mapping):
+    """
+        A read-only Grid backed by a memory-mapped file written by `Grid.save`. Opening one only
+        reads the header, and cells are found by binary search in the mapped file, so even huge
+        maps open instantly. Processes mapping the same file share its pages through the
+        operating system, and pickling a MappedGrid only pickles its path.
+
+        Supports every operation of a Grid that does not change it. Call `close` to unmap the
+        file before deleting or replacing it.
+    """
+
+    def __init__(self, path, trusted=False):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        hexagon_type, system, first, last, kind, column, table = _parse(self._mmap)
+        super().__init__(hexagon_type, system, trusted)
+        self._first = first
+        self._last = last
+        self._views = [first, last]
+        if column is not None:
+            self._views.append(column)
+        if kind == 'o':
+            self._views.extend(table)
+        self._value = _decoder(kind, column, table)
+
+    def __reduce__(self):
+        return type(self), (self.path, self.trusted)
+
+    def close(self):
+        """
+            Unmaps the file. The MappedGrid cannot be used afterwards.
+        """
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _find(self, coordinates):
+        """
+            Returns the row of the given coordinates in the file, or -1 if there is none.
+        """
+        if self.coordinate_system is CUBIC and sum(coordinates) != 0:
+            return -1
+        a, b = coordinates[0], coordinates[-1]
+        lo = bisect_left(self._last, b)
+        hi = bisect_right(self._last, b, lo)
+        index = bisect_left(self._first, a, lo, hi)
+        if index < hi and self._first[index] == a:
+            return index
+        return -1
+
+    def __contains__(self, coordinates):
+        """
+            Returns True if there is an item at the given coordinates.
+        """
+        if not isinstance(coordinates, tuple):
+            return False
+        if len(coordinates) != (3 if self.coordinate_system is CUBIC else 2):
+            return False
+        try:
+            return self._find(coordinates) >= 0
+        except TypeError:
+            return False
+
+    def __getitem__(self, coordinates):
+        """
+            Returns the cell at the given coordinates if it exists.
+        """
+        if not self.trusted:
+            self._assert_valid_coordinates(coordinates)
+        index = self._find(coordinates)
+        if index < 0:
+            raise KeyError(f'No item found at {coordinates}')
+        return self._value(index)
+
+    def get(self, coordinates, default=None):
+        """
+            Returns the cell at the given coordinates, or the default if there is none, without
+            checking the coordinates.
+        """
+        if coordinates not in self:
+            return default
+        return self._value(self._find(coordinates))
+
+    def __iter__(self):
+        """
+            Iterates over the coordinates in file order.
+        """
+        if self.coordinate_system is CUBIC:
+            for a, b in zip(self._first, self._last):
+                yield a, -a - b, b
+        else:
+            yield from zip(self._first, self._last)
+
+    def __len__(self):
+        """
+            Returns the number of cells.
+        """
+        return len(self._first)
+
+    def set_coordinate_system(self, new_system):
+        """
+            Raises a TypeError, since the keys of a MappedGrid cannot be changed. Load the file
+            into a Grid to convert it.
+        """
+        raise TypeError('a MappedGrid is read-only')
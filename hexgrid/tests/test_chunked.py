@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from hexgrid import Grid, ChunkedGrid
+from hexgrid import OFFSET, CUBIC, AXIAL
+from hexgrid import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+from hexgrid.tests.test_dense import filled
+
+
+class TestChunkedGrid(unittest.TestCase):
+    def test_init(self):
+        g = ChunkedGrid()
+        self.assertEqual(g.coordinate_system, OFFSET_ODD_ROWS)
+        self.assertEqual(g.tile_size, 32)
+        self.assertRaises(ValueError, ChunkedGrid, 0)
+        self.assertRaises(ValueError, ChunkedGrid, 4, max_tiles=2)
+
+    def test_insert_remove(self):
+        g = ChunkedGrid(4)
+        g[0, 0] = True
+        g[-9, 100] = False
+        self.assertTrue((0, 0) in g)
+        self.assertTrue((-9, 100) in g)
+        self.assertFalse((0, 1) in g)
+        self.assertFalse((0, 0, 0) in g)
+        self.assertFalse('invalid' in g)
+        self.assertEqual(len(g), 2)
+        self.assertEqual(g.tile_count, 2)
+        self.assertEqual(g[-9, 100], False)
+        g[1, 1] = None
+        self.assertEqual(g.tile_count, 2)
+
+        # A tile is freed along with its last cell.
+        del g[-9, 100]
+        self.assertEqual(g.tile_count, 1)
+        self.assertEqual(sorted(g), [(0, 0), (1, 1)])
+        self.assertRaises(KeyError, g.__getitem__, (-9, 100))
+        self.assertRaises(KeyError, g.__delitem__, (-9, 100))
+        self.assertRaises(ValueError, g.__getitem__, (0, 0, 0))
+
+        g.clear()
+        self.assertEqual(len(g), 0)
+        self.assertEqual(g.tile_count, 0)
+
+    def test_cubic(self):
+        g = ChunkedGrid(3, coordinate_system=CUBIC)
+        g[1, 0, -1] = 'a'
+        g[-7, 2, 5] = 'b'
+        self.assertEqual(g[1, 0, -1], 'a')
+        self.assertFalse((1, 1, -1) in g)
+        self.assertRaises(ValueError, g.__setitem__, (1, 1, -1), None)
+        self.assertCountEqual(g.keys(), [(1, 0, -1), (-7, 2, 5)])
+
+    def test_matches_grid(self):
+        for system in [OFFSET_ODD_ROWS, OFFSET_EVEN_ROWS, AXIAL, CUBIC]:
+            g = filled(Grid, coordinate_system=system)
+            c = filled(ChunkedGrid, 3, coordinate_system=system)
+            self.assertEqual(dict(g), dict(c))
+
+            start = Grid.convert((-3, -3), OFFSET_ODD_ROWS, system)
+            end = Grid.convert((3, 3), OFFSET_ODD_ROWS, system)
+            self.assertCountEqual(c.neighbor_coordinates(start), g.neighbor_coordinates(start))
+            self.assertCountEqual(c.ring_coordinates(end, 2), g.ring_coordinates(end, 2))
+            self.assertEqual(c.line_coordinates(start, end), g.line_coordinates(start, end))
+            self.assertEqual(len(c.shortest_path_coordinates(start, end)),
+                             len(g.shortest_path_coordinates(start, end)))
+            for center in [start, end, (0, 0, 0) if system is CUBIC else (0, 0)]:
+                for radius in range(6):
+                    self.assertCountEqual(c.within_coordinates(center, radius),
+                                          g.within_coordinates(center, radius))
+            self.assertCountEqual(c.within_coordinates(start, 1, validate=False),
+                                  g.within_coordinates(start, 1, validate=False))
+
+    def test_set_coordinate_system(self):
+        for system in [CUBIC, AXIAL, OFFSET_EVEN_ROWS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_COLUMNS]:
+            g = filled(Grid)
+            c = filled(ChunkedGrid, 4)
+            g.set_coordinate_system(system)
+            c.set_coordinate_system(system)
+            self.assertEqual(c.coordinate_system, system)
+            self.assertEqual(dict(g), dict(c))
+            self.assertEqual(len(c), len(g))
+
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            g = ChunkedGrid(4, directory=directory, max_tiles=2)
+            for i in range(5):
+                g[i * 4, 0] = i
+            self.assertEqual(g.tile_count, 5)
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+            # Evicted tiles are loaded back when touched, evicting the coldest in turn.
+            self.assertEqual(g[0, 0], 0)
+            self.assertEqual(g.get((1, 0)), None)
+            self.assertEqual(dict(g), {(i * 4, 0): i for i in range(5)})
+            self.assertEqual(len(os.listdir(directory)), 3)
+            self.assertCountEqual(g.within_coordinates((8, 0), 4), [(4, 0), (8, 0), (12, 0)])
+
+            del g[16, 0]
+            g.set_coordinate_system(AXIAL)
+            self.assertEqual(sorted(g.values()), [0, 1, 2, 3])
+            self.assertEqual(len(os.listdir(directory)), g.tile_count - 2)
+            g.clear()
+            self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from hexgrid import Grid, DenseGrid
+from hexgrid import FLAT, POINTY
+from hexgrid import OFFSET, CUBIC, AXIAL
+from hexgrid import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+
+
+def filled(grid_type, *args, **kwargs):
+    """Returns the given grid type filled with a 7x7 offset rectangle, with a wall in the middle"""
+    g = grid_type(*args, **kwargs)
+    for i in range(-3, 4):
+        for j in range(-3, 4):
+            if i == 0 and j != 3:
+                continue
+            g[Grid.convert((i, j), OFFSET_ODD_ROWS, g.coordinate_system)] = (i, j)
+    return g
+
+
+class TestDenseGrid(unittest.TestCase):
+    def test_init(self):
+        g = DenseGrid(3, 4)
+        self.assertEqual(g.coordinate_system, OFFSET_ODD_ROWS)
+        self.assertEqual(g.bounds, ((0, 0), (2, 3)))
+        g = DenseGrid(3, 4, origin=(-1, -1), hexagon_type=FLAT, coordinate_system=CUBIC)
+        self.assertEqual(g.bounds, ((-1, -1), (1, 2)))
+
+        self.assertRaises(ValueError, DenseGrid, -1, 4)
+        self.assertRaises(ValueError, DenseGrid, 3, 4, (0, 0), FLAT, OFFSET_ODD_ROWS)
+
+    def test_insert_remove(self):
+        g = DenseGrid(2, 2)
+        g[0, 0] = True
+        g[1, 1] = False
+        self.assertTrue((0, 0) in g)
+        self.assertTrue((1, 1) in g)
+        self.assertFalse((0, 1) in g)
+        self.assertFalse((5, 5) in g)
+        self.assertFalse((0, 0, 0) in g)
+        self.assertFalse('invalid' in g)
+        self.assertEqual(len(g), 2)
+        self.assertEqual(g[0, 0], True)
+        self.assertEqual(g[1, 1], False)
+        g[0, 0] = None
+        self.assertEqual(len(g), 2)
+        self.assertIsNone(g[0, 0])
+        del g[0, 0]
+        self.assertFalse((0, 0) in g)
+        self.assertEqual(len(g), 1)
+        self.assertEqual(list(g), [(1, 1)])
+
+        self.assertRaises(KeyError, g.__getitem__, (0, 0))
+        self.assertRaises(KeyError, g.__getitem__, (5, 5))
+        self.assertRaises(KeyError, g.__delitem__, (0, 0))
+        self.assertRaises(ValueError, g.__setitem__, (5, 5), None)
+        self.assertRaises(ValueError, g.__getitem__, (0, 0, 0))
+
+        g.clear()
+        self.assertEqual(len(g), 0)
+        self.assertEqual(g.bounds, ((0, 0), (1, 1)))
+
+    def test_cubic(self):
+        g = DenseGrid(3, 3, origin=(-1, -1), coordinate_system=CUBIC)
+        g[1, 0, -1] = 'a'
+        self.assertEqual(g[1, 0, -1], 'a')
+        self.assertFalse((1, 1, -1) in g)
+        self.assertRaises(ValueError, g.__setitem__, (1, 1, -1), None)
+        self.assertEqual(list(g.keys()), [(1, 0, -1)])
+
+    def test_matches_grid(self):
+        for system in [OFFSET_ODD_ROWS, OFFSET_EVEN_ROWS, AXIAL, CUBIC]:
+            g = filled(Grid, coordinate_system=system)
+            d = filled(DenseGrid, 20, 20, origin=(-10, -10), coordinate_system=system)
+            self.assertEqual(dict(g), dict(d))
+
+            start = Grid.convert((-3, -3), OFFSET_ODD_ROWS, system)
+            end = Grid.convert((3, 3), OFFSET_ODD_ROWS, system)
+            self.assertCountEqual(d.neighbor_coordinates(start), g.neighbor_coordinates(start))
+            self.assertCountEqual(d.within_coordinates(start, 3), g.within_coordinates(start, 3))
+            self.assertCountEqual(d.ring_coordinates(end, 2), g.ring_coordinates(end, 2))
+            self.assertEqual(d.line_coordinates(start, end), g.line_coordinates(start, end))
+
+            path = d.shortest_path_coordinates(start, end)
+            self.assertEqual(len(path), len(g.shortest_path_coordinates(start, end)))
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], end)
+
+    def test_set_coordinate_system(self):
+        for system in [CUBIC, AXIAL, OFFSET_EVEN_ROWS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_COLUMNS]:
+            g = filled(Grid)
+            d = filled(DenseGrid, 7, 7, origin=(-3, -3))
+            g.set_coordinate_system(system)
+            d.set_coordinate_system(system)
+            self.assertEqual(d.coordinate_system, system)
+            self.assertEqual(d.hexagon_type, g.hexagon_type)
+            self.assertEqual(dict(g), dict(d))
+
+            # The new bounds cover the whole of the old rectangle, not just the occupied cells.
+            for i in range(-3, 4):
+                for j in range(-3, 4):
+                    d[Grid.convert((i, j), OFFSET_ODD_ROWS, system)] = None
+            self.assertEqual(len(d), 49)
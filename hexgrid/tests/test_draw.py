@@ -0,0 +1,36 @@
+import itertools
+import math
+import unittest
+from hexgrid import FLAT, POINTY
+
+try:
+    from hexgrid.draw import visible_tiles
+except ImportError:
+    visible_tiles = None
+
+
+def center(hexagon_type, radius, q, r):
+    """The pixel center of the hexagon with the given axial coordinates"""
+    if hexagon_type is POINTY:
+        return radius * math.sqrt(3) * (q + r / 2), radius * 1.5 * r
+    return radius * 1.5 * q, radius * math.sqrt(3) * (r + q / 2)
+
+
+@unittest.skipIf(visible_tiles is None, 'tkinter is not installed')
+class TestDrawGrid(unittest.TestCase):
+    def test_visible_tiles(self):
+        rect = (-35, 20, 140, 95)
+        for hexagon_type, size in itertools.product([POINTY, FLAT], [1, 3]):
+            tiles = set(visible_tiles(hexagon_type, 10, rect, size))
+            for q, r in itertools.product(range(-30, 30), repeat=2):
+                x, y = center(hexagon_type, 10, q, r)
+                if rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]:
+                    self.assertIn((q // size, r // size), tiles)
+
+            # Only the tiles near the rectangle are visited.
+            hexagons = (rect[2] - rect[0] + 20) * (rect[3] - rect[1] + 20) / (2.5 * 10 ** 2)
+            self.assertLess(len(tiles), 2 * hexagons / size ** 2 + 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
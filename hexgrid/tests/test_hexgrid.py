@@ -1,8 +1,24 @@
 import unittest
-from hexgrid import Grid, CoordinateSystem, HexagonType
+import itertools
+import random
+import os
+import subprocess
+import sys
+from hexgrid import Grid, DenseGrid, CoordinateSystem, HexagonType
 from hexgrid import FLAT, POINTY
 from hexgrid import OFFSET, CUBIC, AXIAL
 from hexgrid import OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS, OFFSET_ODD_ROWS
+from hexgrid.utils import jump_point_search
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def empty_grids(width, height, origin=(0, 0), **kwargs):
+    """Returns an empty Grid and an empty DenseGrid holding the given rectangle of coordinates"""
+    return [Grid(**kwargs), DenseGrid(width, height, origin, **kwargs)]
 
 
 class TestGrid(unittest.TestCase):
@@ -35,6 +51,16 @@ class TestGrid(unittest.TestCase):
         g = Grid(hexagon_type=FLAT, coordinate_system=OFFSET)
         self.assertEqual(g.coordinate_system, OFFSET_ODD_COLUMNS)
 
+    def test_import_is_headless(self):
+        # Importing hexgrid must not pull in, or need, the optional drawing and array libraries.
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        code = 'import sys, hexgrid; print(sorted({"tkinter", "numpy"} & set(sys.modules)))'
+        env = dict(os.environ)
+        env.pop('DISPLAY', None)
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
     def test_conversion_invertible(self):
         c = (2, -6, 4)
         out = Grid.convert(c, CUBIC, AXIAL)
@@ -80,6 +106,25 @@ class TestGrid(unittest.TestCase):
             out = Grid.convert(c, OFFSET_ODD_ROWS, OFFSET_EVEN_COLUMNS)
             self.assertSequenceEqual(out, e)
 
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_convert_many(self):
+        systems = [AXIAL, CUBIC, OFFSET_EVEN_COLUMNS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_ROWS,
+                   OFFSET_ODD_ROWS]
+        cube = [Grid.convert((q, r), AXIAL, CUBIC)
+                for q, r in itertools.product(range(-5, 6), repeat=2)]
+
+        # The batch conversion must agree with the scalar conversion, including negative parity.
+        for from_sys, to_sys in itertools.product(systems, repeat=2):
+            coords = [Grid.convert(c, CUBIC, from_sys) for c in cube]
+            expected = [Grid.convert(c, from_sys, to_sys) for c in coords]
+            out = Grid.convert_many(numpy.array(coords), from_sys, to_sys)
+            self.assertEqual([tuple(c) for c in out.tolist()], expected)
+
+        self.assertEqual(Grid.convert_many([], AXIAL, CUBIC).shape, (0, 3))
+        self.assertRaises(ValueError, Grid.convert_many, [(0, 0)], CUBIC, AXIAL)
+        self.assertRaises(ValueError, Grid.convert_many, [(0, 0)], OFFSET, CUBIC)
+        self.assertRaises(ValueError, Grid.convert_many, [(0, 0)], 'invalid', CUBIC)
+
     def test_valid_coordinates(self):
         g = Grid()
         self.assertRaises(ValueError, g._assert_valid_coordinates, 1)
@@ -290,3 +335,692 @@ class TestGrid(unittest.TestCase):
 
         expected = [None] * 4
         self.assertCountEqual(g.ring((3, -6, 3), 3), expected)
+
+    def test_shortest_path_coordinates(self):
+        g = Grid(HexagonType.POINTY, CoordinateSystem.AXIAL)
+        for q in range(7):
+            for r in range(7):
+                # A wall with a single gap at the far end
+                if q != 3 or r == 6:
+                    g[q, r] = None
+
+        path = g.shortest_path_coordinates((0, 0), (6, 0))
+        self.assertEqual(len(path), 16)
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (6, 0))
+        self.assertIn((3, 6), path)
+        for a, b in zip(path, path[1:]):
+            self.assertEqual(g.distance(a, b), 1)
+
+        del g[3, 6]
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (6, 0)), [])
+
+    def test_shortest_path_cost(self):
+        g = Grid(HexagonType.POINTY, CoordinateSystem.AXIAL)
+        for c in [(0, 0), (1, 0), (2, 0), (1, -1), (2, -1)]:
+            g[c] = c
+        direct = [(0, 0), (1, 0), (2, 0)]
+        detour = [(0, 0), (1, -1), (2, -1), (2, 0)]
+
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0)), direct)
+
+        costs = {(0, 0): 1, (1, 0): 10, (2, 0): 1, (1, -1): 1, (2, -1): 1}
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0), cost=costs), detour)
+        self.assertEqual(g.shortest_path((0, 0), (2, 0), cost=costs), detour)
+
+        def edge_cost(src, dest):
+            return 10 if dest == (1, 0) else 1
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0), cost=edge_cost), detour)
+
+        # Cells missing from the cost mapping and steps costing None are impassable.
+        del costs[1, -1]
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0), cost=costs), direct)
+        self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0), cost=lambda a, b: None), [])
+
+        # Steps cheaper than one need a smaller min_cost to stay optimal.
+        costs = {(0, 0): 0.1, (1, 0): 0.5, (2, 0): 0.1, (1, -1): 0.1, (2, -1): 0.1}
+        path = g.shortest_path_coordinates((0, 0), (2, 0), cost=costs, min_cost=0.1)
+        self.assertEqual(path, detour)
+
+        self.assertRaises(ValueError, g.shortest_path_coordinates, (0, 0), (2, 0), cost=1)
+
+    def test_shortest_path_algorithms(self):
+        # A maze of walls with gaps, in a system where jump point search converts every cell.
+        g = Grid.rectangle(20, 20, hexagon_type=FLAT, coordinate_system=OFFSET_EVEN_COLUMNS)
+        for col in range(3, 20, 4):
+            for row in range(20):
+                if row != (1 if col % 8 == 3 else 18):
+                    del g[col, row]
+        for row in range(5, 15):
+            del g[1, row]
+
+        pairs = [((0, 0), (18, 19)), ((0, 10), (2, 10)), ((5, 5), (5, 5)), ((2, 2), (6, 17))]
+        for src, dest in pairs:
+            expected = len(g.shortest_path_coordinates(src, dest))
+            for algorithm in ['bidirectional', 'jps']:
+                path = g.shortest_path_coordinates(src, dest, algorithm=algorithm)
+                self.assertEqual(len(path), expected)
+                self.assertEqual((path[0], path[-1]), (src, dest))
+                self.assertTrue(all(g.distance(a, b) == 1 for a, b in zip(path, path[1:])))
+                self.assertTrue(all(c in g for c in path))
+
+        # Scattered obstacles, where jump point search reports the jump points it expands.
+        rng = random.Random(0)
+        for density in [0, 0.2, 0.4]:
+            scattered = Grid.hexagon(8, coordinate_system=CUBIC)
+            for key in rng.sample(list(scattered), int(density * len(scattered))):
+                del scattered[key]
+            cells = list(scattered)
+            for _ in range(20):
+                src, dest = rng.choice(cells), rng.choice(cells)
+                expanded = []
+                path = jump_point_search(scattered, src, dest, expanded=expanded.append)
+                self.assertEqual(len(path), len(scattered.shortest_path_coordinates(src, dest)))
+                self.assertTrue(all(c in scattered for c in path + expanded))
+                self.assertTrue(all(scattered.distance(a, b) == 1 for a, b in zip(path, path[1:])))
+
+        # Walled off cells cannot be reached.
+        del g[0, 0], g[1, 0], g[1, 1], g[0, 2], g[0, 1]
+        g[0, 0] = None
+        for algorithm in ['astar', 'bidirectional', 'jps']:
+            self.assertEqual(g.shortest_path_coordinates((0, 0), (18, 19), algorithm=algorithm), [])
+            self.assertEqual(g.shortest_path_coordinates((2, 2), (19, 19), algorithm=algorithm), [])
+
+        costs = {key: 1 + key[0] % 3 for key in g}
+        expected = g.shortest_path_coordinates((2, 2), (18, 19), cost=costs)
+        path = g.shortest_path_coordinates((2, 2), (18, 19), costs, algorithm='bidirectional')
+        self.assertEqual(sum(costs[c] for c in path[1:]), sum(costs[c] for c in expected[1:]))
+        self.assertEqual(len(g.shortest_path((0, 10), (2, 10), algorithm='jps')), 11)
+        self.assertRaises(ValueError, g.shortest_path_coordinates, (2, 2), (4, 4), costs, 1, 'jps')
+        self.assertRaises(ValueError, g.shortest_path_coordinates, (2, 2), (4, 4), algorithm='bfs')
+
+    def test_adjacency(self):
+        for system in [OFFSET_ODD_ROWS, OFFSET_EVEN_ROWS, AXIAL, CUBIC]:
+            grids = empty_grids(10, 10, (-5, -5), coordinate_system=system)
+            indexed_grids = empty_grids(10, 10, (-5, -5), coordinate_system=system)
+            for g, indexed in zip(grids, indexed_grids):
+                indexed.build_adjacency()
+
+                def check():
+                    self.assertEqual(set(indexed.adjacency.neighbors), set(indexed))
+                    for c in list(g):
+                        self.assertEqual(indexed.neighbor_coordinates(c), g.neighbor_coordinates(c))
+
+                # Mirror the same edits on both grids and make sure the neighbors match.
+                cells = [Grid.convert((i, j), AXIAL, system)
+                         for i in range(-2, 3) for j in range(-2, 3)]
+                for c in cells:
+                    g[c] = c
+                    indexed[c] = c
+                check()
+                for c in cells[::3]:
+                    del g[c]
+                    del indexed[c]
+                check()
+
+                g.pop(cells[1])
+                indexed.pop(cells[1])
+                self.assertEqual(indexed.pop(cells[1], 'default'), 'default')
+                g.setdefault(cells[0])
+                indexed.setdefault(cells[0])
+                g.update({cells[3]: None})
+                indexed.update({cells[3]: None})
+                g.popitem()
+                indexed.popitem()
+                check()
+
+                g.set_coordinate_system(OFFSET_ODD_COLUMNS)
+                indexed.set_coordinate_system(OFFSET_ODD_COLUMNS)
+                check()
+
+                indexed.clear()
+                self.assertEqual(indexed.adjacency.neighbors, {})
+                c = Grid.convert(cells[0], system, OFFSET_ODD_COLUMNS)
+                indexed[c] = None
+                self.assertEqual(indexed.neighbor_coordinates(c), [])
+
+                indexed.drop_adjacency()
+                self.assertIsNone(indexed.adjacency)
+
+    def test_bulk_construction(self):
+        for hexagon_type, system in [(POINTY, OFFSET), (POINTY, OFFSET_EVEN_ROWS), (FLAT, OFFSET),
+                                     (FLAT, OFFSET_EVEN_COLUMNS), (POINTY, AXIAL), (FLAT, CUBIC)]:
+            offset = OFFSET_ODD_ROWS if hexagon_type is POINTY else OFFSET_ODD_COLUMNS
+            if system is not AXIAL and system is not CUBIC:
+                offset = Grid(hexagon_type, system).coordinate_system
+
+            expected = Grid(hexagon_type, system)
+            for col in range(4):
+                for row in range(3):
+                    expected[Grid.convert((col, row), offset, expected.coordinate_system)] = 0
+            g = Grid.rectangle(4, 3, 0, hexagon_type, system)
+            self.assertEqual(g, expected)
+            self.assertEqual(g.coordinate_system, expected.coordinate_system)
+            self.assertIs(type(g), Grid)
+
+            expected = Grid(hexagon_type, system)
+            origin = Grid.convert((0, 0, 0), CUBIC, expected.coordinate_system)
+            for c in expected.within_coordinates(origin, 3, validate=False):
+                expected[c] = 'x'
+            self.assertEqual(Grid.hexagon(3, 'x', hexagon_type, system), expected)
+
+            expected = Grid(hexagon_type, system)
+            for q in range(3):
+                for r in range(5):
+                    expected[Grid.convert((q, r), AXIAL, expected.coordinate_system)] = None
+            self.assertEqual(Grid.parallelogram(3, 5, None, hexagon_type, system), expected)
+
+        self.assertEqual(len(Grid.rectangle(0, 5)), 0)
+        self.assertEqual(len(Grid.hexagon(0)), 1)
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_from_arrays(self):
+        coords = numpy.array([(0, 0, 0), (1, -1, 0), (-2, 1, 1)])
+        g = Grid.from_arrays(coords, numpy.arange(3), coordinate_system=CUBIC)
+        self.assertEqual(g, {(0, 0, 0): 0, (1, -1, 0): 1, (-2, 1, 1): 2})
+        for key, value in g.items():
+            self.assertIs(type(key[0]), int)
+            self.assertIs(type(value), int)
+            self.assertEqual(g[key], value)
+
+        g = Grid.from_arrays([(0, 0), (1, 0)])
+        self.assertEqual(g, {(0, 0): None, (1, 0): None})
+        self.assertEqual(len(Grid.from_arrays([])), 0)
+
+        self.assertRaises(ValueError, Grid.from_arrays, [(0, 0)], coordinate_system=CUBIC)
+        self.assertRaises(ValueError, Grid.from_arrays, [(0.5, 0)])
+        self.assertRaises(ValueError, Grid.from_arrays, [(0, 0)], [1, 2])
+
+    def test_distance_field(self):
+        for g in empty_grids(7, 7):
+            for i in range(7):
+                for j in range(7):
+                    # A wall with a gap at either end
+                    if j != 3 or i in (0, 6):
+                        g[i, j] = None
+
+            sources = [(1, 0), (5, 6)]
+            distances, next_hops = g.distance_field(sources)
+            self.assertEqual(set(distances), set(g))
+            for cell, distance in distances.items():
+                nearest = min(len(g.shortest_path_coordinates(cell, s)) - 1 for s in sources)
+                self.assertEqual(distance, nearest)
+
+                # Following the next hops walks a shortest path to a source.
+                steps = 0
+                while next_hops[cell] is not None:
+                    self.assertEqual(g.distance(cell, next_hops[cell]), 1)
+                    cell = next_hops[cell]
+                    steps += 1
+                self.assertIn(cell, sources)
+                self.assertEqual(steps, distance)
+
+        # The cost is measured towards the sources, so entering the source is what is expensive.
+        g = Grid.parallelogram(3, 1, coordinate_system=AXIAL)
+        distances, next_hops = g.distance_field([(0, 0)], cost={(0, 0): 10, (1, 0): 1, (2, 0): 1})
+        self.assertEqual(distances, {(0, 0): 0, (1, 0): 10, (2, 0): 11})
+        self.assertEqual(next_hops, {(0, 0): None, (1, 0): (0, 0), (2, 0): (1, 0)})
+
+        self.assertEqual(g.distance_field([(5, 5)]), ({}, {}))
+
+    def test_iter_coordinates(self):
+        g = Grid.rectangle(6, 6, hexagon_type=FLAT)
+        center = (2, 2)
+
+        # The iterators stream the same coordinates as the list queries.
+        for validate in [True, False]:
+            self.assertEqual(list(g.iter_within(center, 3, validate)),
+                             g.within_coordinates(center, 3, validate))
+            self.assertEqual(list(g.iter_ring(center, 3, validate)),
+                             g.ring_coordinates(center, 3, validate))
+            self.assertEqual(list(g.iter_line((0, 0), (5, 4), validate)),
+                             g.line_coordinates((0, 0), (5, 4), validate))
+
+        # Callers can stop early, without visiting the rest of a huge radius.
+        first = next(g.iter_within(center, 10**9, validate=False))
+        self.assertEqual(g.distance(center, first), 10**9)
+        self.assertEqual(g.line_coordinates(center, center), [center])
+
+        spiral = list(g.iter_spiral(center, 2))
+        self.assertEqual(spiral[0], center)
+        self.assertCountEqual(spiral, g.within_coordinates(center, 2))
+        distances = [g.distance(center, c) for c in spiral]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(list(g.iter_spiral(center, 0)), [center])
+        self.assertEqual(list(g.iter_spiral((10, 10), 1)), [])
+
+        self.assertRaises(ValueError, g.iter_ring, center, -1)
+        self.assertRaises(ValueError, g.iter_spiral, center, 1.5)
+
+    def test_pixel_to_hex(self):
+        systems = [OFFSET_ODD_ROWS, OFFSET_EVEN_ROWS, OFFSET_ODD_COLUMNS, OFFSET_EVEN_COLUMNS,
+                   AXIAL, CUBIC]
+        for hexagon_type, system in itertools.product([POINTY, FLAT], systems):
+            if ('ROWS' if hexagon_type is FLAT else 'COLUMNS') in system.name:
+                continue
+            g = Grid(hexagon_type=hexagon_type, coordinate_system=system)
+            points, expected = [], []
+            for q, r in itertools.product(range(-4, 5), repeat=2):
+                if hexagon_type is POINTY:
+                    x, y = 10 * 3 ** 0.5 * (q + r / 2), 15 * r
+                else:
+                    x, y = 15 * q, 10 * 3 ** 0.5 * (r + q / 2)
+                coord = Grid.convert((q, r), AXIAL, system)
+                # Any point inside the circle inscribed in the hexagon belongs to it.
+                for dx, dy in [(0, 0), (8, 0), (0, -8), (-5, 6)]:
+                    point = (x + dx + 100, y + dy - 50)
+                    self.assertEqual(g.pixel_to_hex(point, 10, origin=(100, -50)), coord)
+                    points.append(point)
+                    expected.append(coord)
+
+            if numpy is not None:
+                batch = g.pixel_to_hex(numpy.array(points), 10, origin=(100, -50))
+                self.assertEqual(list(map(tuple, batch.tolist())), expected)
+
+    def test_hierarchy(self):
+        g = Grid.rectangle(24, 24, hexagon_type=FLAT)
+        # A wall across the map, with a gap at one end.
+        for row in range(2, 24):
+            del g[12, row]
+        g.build_hierarchy(cluster_size=5)
+
+        def check(src, dest):
+            path = g.hierarchy.shortest_path_coordinates(src, dest)
+            flat = g.shortest_path_coordinates(src, dest)
+            self.assertEqual(bool(path), bool(flat))
+            if path:
+                self.assertEqual((path[0], path[-1]), (src, dest))
+                self.assertTrue(all(g.distance(a, b) == 1 for a, b in zip(path, path[1:])))
+                self.assertTrue(all(c in g for c in path))
+                self.assertLessEqual(len(path), 1.05 * len(flat))
+            return path
+
+        self.assertEqual(check((3, 3), (3, 3)), [(3, 3)])
+        self.assertTrue({(12, 0), (12, 1)} & set(check((0, 20), (23, 20))))
+        check((10, 10), (11, 12))
+
+        # Across an open map, the paths are as short as those of flat A*.
+        open_map = Grid.rectangle(30, 30)
+        open_map.build_hierarchy(cluster_size=6)
+        rng = random.Random(0)
+        cells = list(open_map)
+        for _ in range(50):
+            src, dest = rng.choice(cells), rng.choice(cells)
+            path = open_map.hierarchy.shortest_path_coordinates(src, dest)
+            flat = open_map.shortest_path_coordinates(src, dest)
+            self.assertLessEqual(len(path), 1.05 * len(flat))
+
+        # Edits invalidate the clusters around them, so paths follow the new walls.
+        del g[12, 0]
+        self.assertIn((12, 1), check((0, 20), (23, 20)))
+        del g[12, 1]
+        self.assertEqual(check((0, 20), (23, 20)), [])
+        g[12, 1] = None
+        self.assertIn((12, 1), check((0, 20), (23, 20)))
+        self.assertEqual(g.hierarchy.shortest_path_coordinates((0, 0), (50, 50)), [])
+
+        # Costs are fixed when the planner is built.
+        cost = {key: 1 for key in g}
+        cost[12, 1] = None
+        g.build_hierarchy(cluster_size=4, cost=cost)
+        self.assertEqual(g.hierarchy.shortest_path_coordinates((0, 20), (23, 20)), [])
+        g.drop_hierarchy()
+        self.assertIsNone(g.hierarchy)
+        g[12, 5] = None
+        self.assertRaises(ValueError, g.build_hierarchy, 1)
+
+    def test_path_cache(self):
+        for g in empty_grids(8, 8):
+            for key in Grid.rectangle(8, 8):
+                g[key] = None
+            g.build_path_cache(maxsize=2)
+
+            path = g.shortest_path_coordinates((0, 0), (0, 4))
+            self.assertEqual(g.shortest_path_coordinates((0, 0), (0, 4)), path)
+            self.assertEqual(g.path_cache.info(), (1, 1, 2, 1))
+
+            # Only the paths through a deleted cell are discarded.
+            other = g.shortest_path_coordinates((7, 7), (5, 7))
+            del g[path[2]]
+            self.assertEqual(g.path_cache.info().currsize, 1)
+            detour = g.shortest_path_coordinates((0, 0), (0, 4))
+            self.assertNotIn(path[2], detour)
+            self.assertGreaterEqual(len(detour), len(path))
+            self.assertEqual(g.shortest_path_coordinates((7, 7), (5, 7)), other)
+
+            # Changing a value keeps the paths, adding a cell discards them all.
+            g[0, 0] = 'changed'
+            self.assertEqual(g.path_cache.info().currsize, 2)
+            g[path[2]] = None
+            self.assertEqual(g.path_cache.info().currsize, 0)
+            self.assertEqual(g.shortest_path_coordinates((0, 0), (0, 4)), path)
+
+            # The least recently used path is evicted, and other costs bypass the cache.
+            g.shortest_path_coordinates((0, 0), (3, 3), algorithm='bidirectional')
+            g.shortest_path_coordinates((1, 1), (3, 3))
+            hits, misses, _, size = g.path_cache.info()
+            self.assertEqual(size, 2)
+            g.shortest_path_coordinates((0, 0), (0, 4), cost=lambda a, b: 1)
+            g.shortest_path_coordinates((0, 0), (0, 4))
+            self.assertEqual(g.path_cache.info()[:2], (hits, misses + 1))
+
+            # Mutating a returned path does not change the cache.
+            g.shortest_path_coordinates((1, 1), (3, 3)).clear()
+            self.assertTrue(g.shortest_path_coordinates((1, 1), (3, 3)))
+
+            g.drop_path_cache()
+            self.assertIsNone(g.path_cache)
+            self.assertRaises(ValueError, g.build_path_cache, 0)
+
+    def test_field_of_view(self):
+        g = Grid.hexagon(4, coordinate_system=CUBIC)
+        self.assertEqual(sorted(g.field_of_view((0, 0, 0), 4)), sorted(g))
+        self.assertEqual(g.field_of_view((0, 0, 0), 0), [(0, 0, 0)])
+        self.assertEqual(g.field_of_view((9, -9, 0), 2), [])
+        self.assertRaises(ValueError, g.field_of_view, (0, 0, 0), -1)
+
+        # A wall is visible, but hides the cells straight behind it.
+        wall = {(1, -1, 0)}
+        visible = g.field_of_view((0, 0, 0), 4, blocks=wall)
+        self.assertIn((1, -1, 0), visible)
+        self.assertNotIn((2, -2, 0), visible)
+        self.assertIn((2, -1, -1), visible)
+        self.assertEqual(g.line_of_sight([((0, 0, 0), (2, -2, 0)), ((0, 0, 0), (2, -1, -1))],
+                                         blocks=wall), [False, True])
+        # The line passes between two cells, so both must block it.
+        between = [((0, 0, 0), (2, -1, -1))]
+        self.assertTrue(g.line_of_sight(between, blocks=lambda key: key == (1, 0, -1))[0])
+        self.assertFalse(g.line_of_sight(between, blocks={(1, 0, -1), (1, -1, 0)})[0])
+
+        # Every cell in the field of view has a line of sight to the center, and no other.
+        rng = random.Random(0)
+        for system in [OFFSET, CUBIC, AXIAL]:
+            g = Grid.rectangle(14, 12, coordinate_system=system)
+            keys = list(g)
+            for key in rng.sample(keys, 10):
+                del g[key]
+            keys = list(g)
+            walls = set(rng.sample(keys, 30))
+            for center in rng.sample(keys, 5):
+                within = g.within_coordinates(center, 7)
+                sight = g.line_of_sight([(center, key) for key in within], walls)
+                visible = g.field_of_view(center, 7, walls)
+                self.assertEqual(len(visible), len(set(visible)))
+                self.assertEqual(set(visible), {key for key, s in zip(within, sight) if s})
+                self.assertEqual(g.line_of_sight([(key, center) for key in within], walls), sight)
+
+    def test_flood_fill(self):
+        g = Grid.rectangle(7, 5)
+        for row in range(5):
+            del g[3, row]
+        left = {(col, row) for col in range(3) for row in range(5)}
+
+        filled = g.flood_fill((0, 0))
+        self.assertEqual(filled[0], (0, 0))
+        self.assertEqual(set(filled), left)
+        self.assertEqual(len(filled), len(left))
+        self.assertEqual(g.flood_fill((3, 0)), [])
+        self.assertEqual(g.flood_fill((0, 0), passable=lambda key: key[0] == 0),
+                         [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4)])
+        self.assertEqual(g.flood_fill((0, 0), passable={(0, 0), (1, 0), (6, 0)}), [(0, 0), (1, 0)])
+        self.assertEqual(g.flood_fill((6, 0), passable=set()), [])
+
+        components = g.connected_components()
+        self.assertCountEqual(components, [left, set(g) - left])
+        self.assertEqual(len(g.connected_components(passable=lambda key: key[1] != 2)), 4)
+
+    def test_components(self):
+        for system in [OFFSET_ODD_ROWS, CUBIC]:
+            g = Grid.rectangle(7, 5, coordinate_system=system)
+            wall = [Grid.convert((3, row), OFFSET_ODD_ROWS, system) for row in range(5)]
+            start = Grid.convert((0, 0), OFFSET_ODD_ROWS, system)
+            end = Grid.convert((6, 4), OFFSET_ODD_ROWS, system)
+            g.build_components()
+            self.assertEqual(len(g.connected_components()), 1)
+
+            # Deleting the wall splits the map, and restoring any of it joins it again.
+            for key in wall:
+                del g[key]
+            self.assertFalse(g.components.connected(start, end))
+            self.assertEqual(g.shortest_path_coordinates(start, end), [])
+            self.assertCountEqual(g.connected_components(),
+                                  g.connected_components(passable=lambda key: True))
+            g[wall[2]] = None
+            self.assertTrue(g.components.connected(start, end))
+            self.assertEqual(len(g.shortest_path_coordinates(start, end)),
+                             len(g.shortest_path_coordinates(start, end, cost=lambda a, b: 1)))
+
+            # Isolated cells are components of their own, and vanish with their cell.
+            del g[start]
+            self.assertFalse(g.components.connected(start, start))
+            g[start] = None
+            neighbors = g.neighbor_coordinates(start)
+            for key in neighbors:
+                del g[key]
+            self.assertEqual(len(g.connected_components()), 2)
+            self.assertEqual(g.shortest_path_coordinates(start, end), [])
+            for key in neighbors:
+                g[key] = None
+            self.assertEqual(len(g.connected_components()), 1)
+
+            g.set_coordinate_system(AXIAL)
+            self.assertEqual(len(g.connected_components()), 1)
+            g.drop_components()
+            self.assertIsNone(g.components)
+
+    def test_components_with_adjacency(self):
+        # The component index must not rely on the adjacency index, whichever is built first.
+        rng = random.Random(0)
+        for first in ['components', 'adjacency']:
+            g = Grid.rectangle(3, 1)
+            for name in [first, 'adjacency' if first == 'components' else 'components']:
+                getattr(g, 'build_' + name)()
+            del g[1, 0]
+            self.assertFalse(g.components.connected((0, 0), (2, 0)))
+            self.assertEqual(g.shortest_path_coordinates((0, 0), (2, 0)), [])
+            g[1, 0] = None
+            self.assertTrue(g.components.connected((0, 0), (2, 0)))
+
+            g = Grid.rectangle(8, 8)
+            for name in [first, 'adjacency' if first == 'components' else 'components']:
+                getattr(g, 'build_' + name)()
+            cells = sorted(Grid.rectangle(8, 8))
+            for _ in range(300):
+                key = rng.choice(cells)
+                if key in g:
+                    del g[key]
+                else:
+                    g[key] = None
+                self.assertCountEqual(g.components.components(),
+                                      g.connected_components(passable=lambda key: True))
+
+    def test_shortest_paths(self):
+        for system in [OFFSET, CUBIC]:
+            g = Grid.rectangle(12, 10, coordinate_system=system)
+            for key in list(g)[5::7]:
+                del g[key]
+            keys = sorted(g)
+            pairs = list(zip(keys[::5], reversed(keys[::5]))) + [(keys[0], keys[0])]
+            cost = {key: 1 + i % 3 for i, key in enumerate(keys)}
+            expected = [g.shortest_path_coordinates(src, dest, cost) for src, dest in pairs]
+
+            self.assertEqual(g.shortest_paths(pairs, workers=2, cost=cost), expected)
+            self.assertEqual(g.shortest_paths(iter(pairs), workers=1, cost=cost), expected)
+
+        dense = DenseGrid(6, 6, origin=(-2, -3))
+        for key in Grid.rectangle(6, 6):
+            dense[key[0] - 2, key[1] - 3] = None
+        del dense[0, 0]
+        pairs = [((-2, -3), (3, 2)), ((3, 2), (0, 0)), ((-1, 1), (2, -2))]
+        expected = [dense.shortest_path_coordinates(*pair, algorithm='jps') for pair in pairs]
+        self.assertEqual(dense.shortest_paths(pairs, workers=2, algorithm='jps'), expected)
+        self.assertEqual(dense.shortest_paths([], workers=2), [])
+        self.assertRaises(ValueError, dense.shortest_paths, pairs, workers=0)
+
+        # Far apart cells are shared as packed coordinates rather than as their huge rectangle.
+        for system in [OFFSET_ODD_ROWS, CUBIC]:
+            g = Grid.rectangle(8, 8, coordinate_system=system)
+            far = Grid.rectangle(8, 8, coordinate_system=system)
+            far.set_coordinate_system(AXIAL)
+            for q, r in list(far):
+                g[Grid.convert((q + 10**9, r + 10**9), AXIAL, system)] = None
+            keys = sorted(g)
+            pairs = [(keys[0], keys[40]), (keys[3], keys[-1]), (keys[-1], keys[-20])]
+            expected = [g.shortest_path_coordinates(src, dest) for src, dest in pairs]
+            self.assertEqual(expected[1], [])
+            self.assertEqual(g.shortest_paths(pairs, workers=2), expected)
+
+    def test_journal(self):
+        for system in [OFFSET_ODD_ROWS, CUBIC]:
+            g = Grid.rectangle(6, 6, fill='land', coordinate_system=system)
+            replica = Grid.rectangle(6, 6, fill='land', coordinate_system=system)
+            self.assertRaises(ValueError, g.changes_since, 0)
+            g.build_journal()
+            self.assertEqual(replica.apply(g.changes_since(0)), 0)
+            self.assertEqual(replica, g)
+
+            # Only the latest value of each changed cell is sent.
+            keys = sorted(g)
+            g[keys[0]] = 'water'
+            g[keys[0]] = 'hill'
+            del g[keys[1]]
+            g.pop(keys[2])
+            g.update({keys[3]: 3, keys[4]: 4.5})
+            version = replica.apply(g.changes_since(0))
+            self.assertEqual(version, g.journal.version)
+            self.assertEqual(replica, g)
+            delta = g.changes_since(version)
+            self.assertLess(len(delta), len(g.changes_since(0)))
+
+            g[keys[1]] = None
+            g.popitem()
+            self.assertEqual(replica.apply(g.changes_since(version)), g.journal.version)
+            self.assertEqual(replica, g)
+            version = g.journal.version
+
+            # Clearing the Grid replaces the earlier changes.
+            g.clear()
+            g[keys[5]] = [1, 2]
+            replica.apply(g.changes_since(version))
+            self.assertEqual(replica, g)
+            self.assertRaises(ValueError, g.changes_since, g.journal.version + 1)
+            g.journal.truncate(version)
+            self.assertRaises(ValueError, g.changes_since, 0)
+
+            # Deltas can be applied across coordinate systems.
+            other = Grid(coordinate_system=AXIAL)
+            other.apply(g.changes_since(version))
+            self.assertEqual(other[Grid.convert(keys[5], system, AXIAL)], [1, 2])
+            g.drop_journal()
+            self.assertIsNone(g.journal)
+
+        a = Grid.rectangle(5, 5, fill=0)
+        b = Grid.rectangle(4, 6, fill=0)
+        b[0, 0] = 1
+        b[-3, -3] = 2**40
+        copy = Grid.rectangle(5, 5, fill=0)
+        copy.apply(a.diff(b))
+        self.assertEqual(copy, b)
+        self.assertEqual(len(a.diff(a)), len(Grid().diff(Grid())))
+
+        dense = DenseGrid(5, 6)
+        dense.update(a)
+        dense.build_journal()
+        del b[-3, -3]
+        dense.apply(a.diff(b))
+        self.assertEqual(dict(dense.items()), b)
+        self.assertEqual(dense.journal.version, 10)
+        self.assertRaises(ValueError, a.diff, Grid(coordinate_system=CUBIC))
+        self.assertRaises(ValueError, a.apply, b'not a delta')
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_columns(self):
+        for system in [OFFSET_ODD_ROWS, CUBIC]:
+            g = Grid.rectangle(5, 5, fill='land', coordinate_system=system)
+            keys = sorted(g)
+            cost = g.add_column('cost', dtype=numpy.float32, fill=1)
+            owner = g.add_column('owner', dtype=numpy.int8, fill=-1)
+            self.assertIs(g.columns['cost'], cost)
+            self.assertEqual(len(cost), 25)
+            self.assertEqual(cost.array.dtype, numpy.float32)
+            self.assertRaises(ValueError, g.add_column, 'cost')
+
+            # Rows follow the cells as they are added and deleted.
+            cost[keys[0]] = 2.5
+            owner[keys[1]] = 3
+            del g[keys[2]]
+            self.assertNotIn(keys[2], cost)
+            self.assertRaises(KeyError, cost.__getitem__, keys[2])
+            g[keys[2]] = 'land'
+            self.assertEqual(cost[keys[2]], 1)
+            for key in keys[3:10]:
+                del g[key]
+            self.assertEqual((cost[keys[0]], owner[keys[1]]), (2.5, 3))
+            self.assertEqual(len(cost.array), len(g))
+            self.assertCountEqual(map(tuple, cost.coordinates.tolist()), g)
+            self.assertEqual(dict(zip(map(tuple, cost.coordinates.tolist()),
+                                      cost.array.tolist())), dict(cost))
+
+            # Whole column operations are vectorized, and read by the pathfinding.
+            cost.array[:] *= 2
+            owner.put(keys[10:15], 7)
+            self.assertEqual(owner.take(keys[10:15]).tolist(), [7] * 5)
+            self.assertEqual(owner.take(numpy.array(keys[10:12])).tolist(), [7] * 2)
+            path = g.shortest_path_coordinates(keys[-1], keys[0], cost=cost)
+            self.assertEqual(path, g.shortest_path_coordinates(keys[-1], keys[0],
+                                                               cost=dict(cost)))
+            wall = g.add_column('wall', dtype=bool, fill=False)
+            wall.put(keys[10:15], True)
+            blocked = [key in keys[10:15] for key in g]
+            blocks = {key for key, b in zip(g, blocked) if b}
+            self.assertEqual(g.field_of_view(keys[0], 6, blocks=wall.get),
+                             g.field_of_view(keys[0], 6, blocks=blocks))
+
+            # Converting the coordinates keeps the values, and clearing removes every row.
+            g.set_coordinate_system(AXIAL)
+            self.assertEqual(cost[Grid.convert(keys[0], system, AXIAL)], 5)
+            self.assertEqual(cost.coordinates.shape, (len(g), 2))
+            g.clear()
+            self.assertEqual(len(cost.array), 0)
+            for name in ['cost', 'owner', 'wall']:
+                g.drop_column(name)
+            self.assertIsNone(g.columns)
+            self.assertRaises(KeyError, g.drop_column, 'cost')
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_distance_matrix(self):
+        rng = random.Random(0)
+        for system in [OFFSET_ODD_ROWS, OFFSET_EVEN_COLUMNS, AXIAL, CUBIC]:
+            hexagon_type = FLAT if 'COLUMNS' in system.name else POINTY
+            g = Grid(hexagon_type, system)
+            cells = [Grid.convert((rng.randrange(-50, 50), rng.randrange(-50, 50)), AXIAL, system)
+                     for _ in range(40)]
+            matrix = g.distance_matrix(cells[:15], cells[15:])
+            self.assertEqual(matrix.shape, (15, 25))
+            self.assertEqual(matrix.tolist(), [[g.distance(a, b) for b in cells[15:]]
+                                               for a in cells[:15]])
+            self.assertEqual(g.distance_matrix([], cells).shape, (0, 40))
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_nearest(self):
+        rng = random.Random(0)
+        for system in [OFFSET_ODD_ROWS, CUBIC]:
+            g = Grid.rectangle(30, 30, coordinate_system=system)
+            for key in rng.sample(sorted(g), 850):
+                del g[key]
+            queries = [Grid.convert((rng.randrange(-200, 200), rng.randrange(-200, 200)),
+                                    OFFSET_ODD_ROWS, system) for _ in range(30)]
+            queries += list(g)[:5]
+            for k in [1, 5, 50, 100]:
+                results = g.nearest(queries, k)
+                self.assertEqual(len(results), len(queries))
+                for query, found in zip(queries, results):
+                    self.assertEqual(len(found), min(k, len(g)))
+                    self.assertEqual(len(set(found)), len(found))
+                    self.assertTrue(all(key in g for key in found))
+                    # The distances are the k smallest, in order.
+                    expected = sorted(g.distance(query, key) for key in g)[:k]
+                    self.assertEqual([g.distance(query, key) for key in found], expected)
+
+        self.assertEqual(Grid().nearest([(0, 0)], k=3), [[]])
+        self.assertRaises(ValueError, g.nearest, queries, k=0)
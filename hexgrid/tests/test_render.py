@@ -0,0 +1,119 @@
+import io
+import struct
+import unittest
+import xml.etree.ElementTree as ElementTree
+import zlib
+from hexgrid import Grid
+from hexgrid import FLAT, POINTY
+from hexgrid import OFFSET_ODD_COLUMNS
+
+try:
+    import numpy
+    from hexgrid import render
+except ImportError:
+    numpy = None
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def decode_png(data):
+    """Returns the width, height and rows of RGB tuples of an unfiltered 8 bit RGB PNG"""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    position, idat = 8, b''
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        if kind == b'IHDR':
+            width, height = struct.unpack('>II', body[:8])
+        elif kind == b'IDAT':
+            idat += body
+        position += 12 + length
+
+    raw = zlib.decompress(idat)
+    stride = 1 + 3 * width
+    rows = []
+    for y in range(height):
+        line = raw[y * stride + 1:(y + 1) * stride]
+        rows.append([tuple(line[x:x + 3]) for x in range(0, len(line), 3)])
+    return width, height, rows
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestRender(unittest.TestCase):
+    def test_svg(self):
+        g = Grid.hexagon(2, fill='land')
+        g[0, 0] = 'water'
+        out = io.StringIO()
+        render.render_svg(g, out, radius=10, fill={'water': '#0000ff'}, labels=True)
+
+        root = ElementTree.fromstring(out.getvalue())
+        polygons = root.findall(f'.//{SVG}polygon')
+        self.assertEqual(len(polygons), len(g))
+        fills = [p.get('fill') for p in polygons]
+        self.assertEqual(fills.count('#0000ff'), 1)
+        self.assertEqual(fills.count(render.DEFAULT_FILL), len(g) - 1)
+        self.assertEqual(len(root.findall(f'.//{SVG}text')), len(g))
+
+        # The first hexagon matches the corners DrawGrid would compute for it.
+        first = next(iter(g))
+        q, r = Grid.convert(first, g.coordinate_system, render.AXIAL)
+        x, y = 10 * 3 ** 0.5 * (q + r / 2), 10 * 1.5 * r
+        points = [tuple(map(float, p.split(','))) for p in polygons[0].get('points').split()]
+        self.assertEqual(len(points), 6)
+        for px, py in points:
+            self.assertAlmostEqual(((px - x) ** 2 + (py - y) ** 2) ** 0.5, 10, places=1)
+
+    def test_svg_chunks(self):
+        g = Grid.rectangle(7, 5, hexagon_type=FLAT, coordinate_system=OFFSET_ODD_COLUMNS)
+        whole, chunked = io.StringIO(), io.StringIO()
+        render.render_svg(g, whole, fill=lambda value: '#123456')
+        render.render_svg(g, chunked, fill=lambda value: '#123456', chunk_size=3)
+        self.assertEqual(whole.getvalue(), chunked.getvalue())
+
+        empty = io.StringIO()
+        render.render_svg(Grid(), empty)
+        self.assertEqual(ElementTree.fromstring(empty.getvalue()).findall(f'.//{SVG}polygon'), [])
+
+    def test_png(self):
+        for hexagon_type in [POINTY, FLAT]:
+            g = Grid.hexagon(3, fill=0, hexagon_type=hexagon_type)
+            g[0, 0] = 1
+            out = io.BytesIO()
+            render.render_png(g, out, radius=20, fill={1: '#ff0000'}, chunk_rows=7)
+            width, height, rows = decode_png(out.getvalue())
+            self.assertEqual(len(rows), height)
+
+            # The center pixel is inside the red hexagon at the origin, the corners are background.
+            self.assertEqual(rows[height // 2][width // 2], (255, 0, 0))
+            self.assertEqual(rows[0][0], (255, 255, 255))
+            self.assertIn((0, 0, 0), rows[height // 2])
+            self.assertIn((0x70, 0x70, 0xff), rows[height // 2])
+
+            # Rendering in chunks does not change the image.
+            whole = io.BytesIO()
+            render.render_png(g, whole, radius=20, fill={1: '#ff0000'}, chunk_rows=height)
+            self.assertEqual(decode_png(whole.getvalue())[2], rows)
+
+        self.assertRaises(ValueError, render.render_png, g, io.BytesIO(), fill='red')
+
+    def test_column_fill(self):
+        g = Grid.hexagon(2)
+        height = g.add_column('height', dtype='int16')
+        height[0, 0] = 3
+        for fill in [{3: '#ff0000'}, lambda value: '#ff0000' if value == 3 else '#00ff00']:
+            by_column, by_value = io.StringIO(), io.StringIO()
+            render.render_svg(g, by_column, fill=fill, column='height')
+            values = Grid.hexagon(2, fill=0)
+            values[0, 0] = 3
+            render.render_svg(values, by_value, fill=fill)
+            self.assertEqual(by_column.getvalue(), by_value.getvalue())
+            self.assertEqual(by_column.getvalue().count('#ff0000'), 1)
+
+        out = io.BytesIO()
+        render.render_png(g, out, radius=20, fill={3: '#ff0000'}, column='height')
+        width, height, rows = decode_png(out.getvalue())
+        self.assertEqual(rows[height // 2][width // 2], (255, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
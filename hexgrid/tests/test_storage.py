@@ -0,0 +1,115 @@
+import os
+import pickle
+import tempfile
+import unittest
+from hexgrid import Grid, DenseGrid
+from hexgrid import FLAT
+from hexgrid import CUBIC, AXIAL, OFFSET_EVEN_COLUMNS
+from hexgrid.storage import MappedGrid
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'grid.hex')
+
+    def load_mapped(self):
+        mapped = Grid.load(self.path, mmap=True)
+        self.addCleanup(mapped.close)
+        return mapped
+
+    def test_round_trip(self):
+        values = {
+            'none': [None] * 6,
+            'bool': [True, False] * 3,
+            'int32': [0, -1, 2**31 - 1, -2**31, 7, 7],
+            'int64': [0, -1, 2**40, -2**63, 7, 2**63 - 1],
+            'float': [0.5, -1e300, float('inf'), 2.0, -0.0, 3.25],
+            'str': ['', 'water', 'ünïcode', 'x' * 1000, 'water', ''],
+            'object': [None, 1, 'two', (3, 4), {'five': 5}, 2**70],
+        }
+        for name, column in values.items():
+            for system in [AXIAL, CUBIC, OFFSET_EVEN_COLUMNS]:
+                g = Grid.hexagon(1, hexagon_type=FLAT, coordinate_system=system)
+                for key, value in zip(sorted(g), column):
+                    g[key] = value
+                g.save(self.path)
+
+                loaded = Grid.load(self.path)
+                self.assertIs(type(loaded), Grid)
+                self.assertEqual((loaded.hexagon_type, loaded.coordinate_system), (FLAT, system))
+                self.assertEqual(loaded, g, name)
+                for key in g:
+                    self.assertIs(type(loaded[key]), type(g[key]))
+
+                with Grid.load(self.path, mmap=True) as mapped:
+                    self.assertIsInstance(mapped, MappedGrid)
+                    self.assertEqual(mapped.coordinate_system, system)
+                    self.assertEqual(dict(mapped.items()), g, name)
+
+        # Coordinates beyond 32 bits, and empty Grids, survive too.
+        g = Grid()
+        g[2**40, -2**35] = 1
+        g.save(self.path)
+        self.assertEqual(Grid.load(self.path), g)
+        Grid().save(self.path)
+        self.assertEqual(Grid.load(self.path), {})
+        self.assertEqual(len(self.load_mapped()), 0)
+
+        d = DenseGrid(3, 3, origin=(-1, -1))
+        d[0, 0] = 'center'
+        d.save(self.path)
+        self.assertEqual(Grid.load(self.path), {(0, 0): 'center'})
+
+    def test_mapped(self):
+        g = Grid.rectangle(9, 7, fill=1)
+        del g[4, 3]
+        g[0, 0] = 2
+        g.save(self.path)
+        mapped = self.load_mapped()
+
+        self.assertEqual(len(mapped), len(g))
+        self.assertEqual(sorted(mapped), sorted(g))
+        self.assertEqual(mapped[0, 0], 2)
+        self.assertNotIn((4, 3), mapped)
+        self.assertNotIn((0, 0, 0), mapped)
+        self.assertNotIn('invalid', mapped)
+        self.assertRaises(KeyError, mapped.__getitem__, (4, 3))
+        self.assertRaises(ValueError, mapped.__getitem__, (1, 2, 3))
+        self.assertEqual(mapped.get((4, 3), 'missing'), 'missing')
+        self.assertEqual(mapped.get((8, 6)), 1)
+
+        # The Grid operations work, but nothing can change the cells.
+        self.assertEqual(mapped.shortest_path_coordinates((0, 3), (8, 3)),
+                         g.shortest_path_coordinates((0, 3), (8, 3)))
+        self.assertEqual(sorted(mapped.neighbor_coordinates((4, 2))),
+                         sorted(g.neighbor_coordinates((4, 2))))
+        with self.assertRaises(TypeError):
+            mapped[0, 0] = 3
+        self.assertRaises(TypeError, mapped.set_coordinate_system, CUBIC)
+        self.assertEqual(mapped.coordinate_system, g.coordinate_system)
+
+        # Pickling a mapped Grid only sends its path.
+        self.assertLess(len(pickle.dumps(mapped)), 200)
+        copy = pickle.loads(pickle.dumps(mapped))
+        self.addCleanup(copy.close)
+        self.assertEqual(dict(copy.items()), g)
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a grid')
+        self.assertRaises(ValueError, Grid.load, self.path)
+
+        Grid.rectangle(4, 4, fill='x').save(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(ValueError, Grid.load, self.path)
+
+        g = Grid(trusted=True)
+        g[0.5, 1] = None
+        self.assertRaises(ValueError, g.save, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,10 @@
 hexgrid internal utils. Not intended for external use.
 """
 import heapq
+import math
+from collections.abc import Mapping
+
+from .enums import CUBIC
 
 def tuple_add(t1, t2):
     """
@@ -54,38 +58,389 @@ class PriorityQueue(object):
         return heapq.heappop(self.elements)[1]
 
 
-def __heuristic(a, b):
+def step_cost_function(cost):
     """
-        The heuristic for A* Grid search
+        Returns a function `step(src, dest)` giving the cost of stepping from src to the adjacent
+        dest, given one of the cost options accepted by `a_star_search`.
     """
-    return sum(abs(ai - bi) for ai, bi in zip(a, b))
+    if cost is None:
+        return lambda src, dest: 1
+    if isinstance(cost, Mapping):
+        return lambda src, dest: cost.get(dest)
+    if callable(cost):
+        return cost
+    raise ValueError(f'cost must be None, a callable, or a mapping, not {type(cost)}')
 
 
-def a_star_search(grid, start, goal):
+def a_star_search(grid, start, goal, cost=None, min_cost=1):
     """
         Runs A* on a given Grid to find the shortest weighted path from start to goal.
+
+        The cost of each step is given by `cost`, which is one of
+
+            * None, for a uniform cost of 1 per step (default)
+            * a callable `cost(src, dest)` returning the cost of stepping from src to the
+              adjacent dest
+            * a mapping from coordinates to the cost of stepping onto them
+
+        Steps costing None or infinity, and cells missing from a cost mapping, are impassable.
+        The heuristic is the cube distance to the goal scaled by `min_cost`, which must be no
+        larger than the cheapest step for the path found to be the shortest.
     """
-    frontier = PriorityQueue()
-    frontier.put(start, 0)
+    step_cost = step_cost_function(cost)
+    system = grid.coordinate_system
+    gx, gy, gz = grid.convert(goal, system, CUBIC)
+
+    # heapq is used directly rather than through PriorityQueue to save a method call per push
+    # and pop; the (priority, coordinates) entries are the same.
+    frontier = [(0, start)]
     came_from = {}
     cost_so_far = {}
     came_from[start] = None
     cost_so_far[start] = 0
 
-    while not frontier.empty():
-        current = frontier.get()
+    while frontier:
+        current = heapq.heappop(frontier)[1]
 
         if current == goal:
             break
 
         for coord in grid.neighbor_coordinates(current):
-            # TODO: Pass in a cost function?
-            new_cost = cost_so_far[current] + 1 # grid.cost(current, coord)
+            step = step_cost(current, coord)
+            if step is None or step == math.inf:
+                continue
+            new_cost = cost_so_far[current] + step
 
             if coord not in cost_so_far or new_cost < cost_so_far[coord]:
                 cost_so_far[coord] = new_cost
-                priority = new_cost + __heuristic(goal, coord)
-                frontier.put(coord, priority)
+                x, y, z = grid.convert(coord, system, CUBIC)
+                # The cube distance is the exact number of steps on an empty Grid.
+                priority = new_cost + min_cost * max(abs(x - gx), abs(y - gy), abs(z - gz))
+                heapq.heappush(frontier, (priority, coord))
                 came_from[coord] = current
 
     return came_from
+
+
+def dijkstra_search(grid, sources, cost=None):
+    """
+        Runs Dijkstra's algorithm outwards from every one of the given sources at once. Returns
+        the dicts (cost_so_far, came_from), where cost_so_far maps every reachable cell to the cost
+        of the cheapest path from it to the nearest source, and came_from maps it to the next cell
+        on that path, or None for the sources themselves.
+
+        Accepts the same `cost` options as `a_star_search`. The search runs backwards, so the cost
+        of a step is that of moving from a cell towards the sources.
+    """
+    step_cost = step_cost_function(cost)
+    frontier = []
+    came_from = {}
+    cost_so_far = {}
+    for source in sources:
+        if source in grid:
+            came_from[source] = None
+            cost_so_far[source] = 0
+            frontier.append((0, source))
+    heapq.heapify(frontier)
+
+    while frontier:
+        current_cost, current = heapq.heappop(frontier)
+        if current_cost > cost_so_far[current]:
+            # A cheaper path to current has already been expanded.
+            continue
+
+        for coord in grid.neighbor_coordinates(current):
+            step = step_cost(coord, current)
+            if step is None or step == math.inf:
+                continue
+            new_cost = current_cost + step
+
+            if coord not in cost_so_far or new_cost < cost_so_far[coord]:
+                cost_so_far[coord] = new_cost
+                heapq.heappush(frontier, (new_cost, coord))
+                came_from[coord] = current
+
+    return cost_so_far, came_from
+
+
+def flood_fill(grid, start, passable=None):
+    """
+        Returns the list of occupied cells reachable from start by stepping between adjacent
+        passable cells, in breadth first order starting with start itself. Returns an empty list
+        if start is not an occupied, passable cell.
+
+        `passable` is either None for every occupied cell, a callable `passable(coordinates)`
+        returning True for passable cells, or a container of the passable coordinates.
+    """
+    if passable is None:
+        allowed = lambda coordinates: True
+    elif callable(passable):
+        allowed = passable
+    else:
+        allowed = passable.__contains__
+    if start not in grid or not allowed(start):
+        return []
+
+    seen = {start}
+    order = [start]
+    # order doubles as the queue, read from index i onwards.
+    i = 0
+    while i < len(order):
+        for neighbor in grid.neighbor_coordinates(order[i]):
+            if neighbor not in seen and allowed(neighbor):
+                seen.add(neighbor)
+                order.append(neighbor)
+        i += 1
+    return order
+
+
+def bidirectional_search(grid, start, goal, cost=None, min_cost=1):
+    """
+        Runs A* from start towards goal and backwards from goal towards start at the same time,
+        always advancing the smaller frontier, until no path through the unexplored cells could
+        be cheaper than the best meeting point found. Returns the shortest path as a list of
+        coordinates, or an empty list if there is none.
+
+        Accepts the same `cost` and `min_cost` options as `a_star_search`.
+    """
+    if start == goal:
+        return [start]
+    if goal not in grid:
+        return []
+
+    step_cost = step_cost_function(cost)
+    system = grid.coordinate_system
+    ends = [grid.convert(start, system, CUBIC), grid.convert(goal, system, CUBIC)]
+
+    frontiers = [[(0, start)], [(0, goal)]]
+    cost_so_far = [{start: 0}, {goal: 0}]
+    came_from = [{start: None}, {goal: None}]
+    closed = [set(), set()]
+    best, meeting = math.inf, None
+
+    while frontiers[0] and frontiers[1]:
+        # Each frontier holds a lower bound on the cost of any path not found yet.
+        if best <= max(frontiers[0][0][0], frontiers[1][0][0]):
+            break
+
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        current = heapq.heappop(frontiers[side])[1]
+        if current in closed[side]:
+            continue
+        closed[side].add(current)
+
+        costs, other_costs = cost_so_far[side], cost_so_far[1 - side]
+        # The forward search heads for the goal, and the backward search for the start.
+        tx, ty, tz = ends[1 - side]
+        for coord in grid.neighbor_coordinates(current):
+            if side == 0:
+                step = step_cost(current, coord)
+            else:
+                step = step_cost(coord, current)
+            if step is None or step == math.inf:
+                continue
+            new_cost = costs[current] + step
+
+            if coord not in costs or new_cost < costs[coord]:
+                costs[coord] = new_cost
+                came_from[side][coord] = current
+                x, y, z = grid.convert(coord, system, CUBIC)
+                priority = new_cost + min_cost * max(abs(x - tx), abs(y - ty), abs(z - tz))
+                heapq.heappush(frontiers[side], (priority, coord))
+                if coord in other_costs and new_cost + other_costs[coord] < best:
+                    best = new_cost + other_costs[coord]
+                    meeting = coord
+
+    if meeting is None:
+        return []
+    path = [meeting]
+    while came_from[0][path[-1]] is not None:
+        path.append(came_from[0][path[-1]])
+    path.reverse()
+    while came_from[1][path[-1]] is not None:
+        path.append(came_from[1][path[-1]])
+    return path
+
+
+def jump_point_search(grid, start, goal, expanded=None):
+    """
+        Runs jump point search, a variant of A* for uniform cost Grids, from start to goal. Returns
+        the shortest path as a list of coordinates, or an empty list if there is none. If given,
+        `expanded` is called with the coordinates of every jump point taken from the heap.
+
+        Rather than pushing every neighbor onto the heap, the search jumps along straight lines of
+        cells and only stops at the goal and at cells next to obstacles, where the shortest paths
+        may turn. Every shortest path on an empty hexagonal grid goes in one direction d and then
+        in direction d + 1, so while jumping in a direction d, the search also scans the line
+        from every cell in direction d + 1. Each scan stops after a couple of cells and pushes the
+        cell it reached, which is only walked further if it is taken from the heap. A line reached
+        by a scan is not scanned itself until its next jump point, as turning a second time never
+        gives a shorter path in the open.
+    """
+    if start == goal:
+        return [start]
+
+    from .grid import _TO_CUBE, _FROM_CUBE
+
+    to_cube = _TO_CUBE[grid.coordinate_system]
+    from_cube = _FROM_CUBE[grid.coordinate_system]
+    # The six directions, in order around the hexagon.
+    directions = [(1, -1, 0), (1, 0, -1), (0, 1, -1), (-1, 1, 0), (-1, 0, 1), (0, -1, 1)]
+    # The number of cells each scan walks before its cell is pushed onto the heap.
+    scan_length = 2
+
+    def free(cube):
+        return from_cube(cube) in grid
+
+    def step(cube, direction):
+        dx, dy, dz = directions[direction % 6]
+        return cube[0] + dx, cube[1] + dy, cube[2] + dz
+
+    def forced(previous, cube, direction):
+        """Returns the turns forced at cube by obstacles beside previous, the cell before it"""
+        turns = []
+        for turn in (direction - 1, direction + 1):
+            if not free(step(previous, turn)) and free(step(cube, turn)):
+                turns.append(turn % 6)
+        return turns
+
+    def push(node, parent, steps):
+        """Pushes the node reached from parent in the given number of steps, if it is shorter"""
+        new_cost = cost_so_far[parent] + steps
+        if node not in cost_so_far or new_cost < cost_so_far[node]:
+            cost_so_far[node] = new_cost
+            came_from[node] = parent
+            x, y, z = node[0]
+            distance = max(abs(x - tx), abs(y - ty), abs(z - tz))
+            # Ties are broken towards the target, as many cells lie on equally short paths.
+            heapq.heappush(frontier, (new_cost + distance, distance, node))
+
+    def walk(cube, direction, limit=None):
+        """
+            Walks from cube in the given direction, returning the first cell that is the target
+            or has a forced turn, or else the cell `limit` steps away, along with the number of
+            steps taken and whether the cell is a jump point. Returns None once the line is
+            blocked.
+        """
+        x, y, z = cube
+        dx, dy, dz = directions[direction]
+        lx, ly, lz = directions[(direction - 1) % 6]
+        rx, ry, rz = directions[(direction + 1) % 6]
+        # Whether the cells on either side of the line are free, carried along the walk so that
+        # each step only looks up three cells.
+        left = free((x + lx, y + ly, z + lz))
+        right = free((x + rx, y + ry, z + rz))
+        steps = 0
+        while True:
+            x, y, z = x + dx, y + dy, z + dz
+            steps += 1
+            cube = (x, y, z)
+            if not free(cube):
+                return None
+            if cube == target:
+                return cube, steps, True
+            next_left = free((x + lx, y + ly, z + lz))
+            next_right = free((x + rx, y + ry, z + rz))
+            if (next_left and not left) or (next_right and not right):
+                return cube, steps, True
+            if steps == limit:
+                return cube, steps, False
+            left, right = next_left, next_right
+
+    def jump(node, direction):
+        """
+            Jumps from the node in the given direction, pushing the cell the line stops at and
+            the cells reached by the scans in direction + 1 from every cell along the way.
+        """
+        x, y, z = node[0]
+        dx, dy, dz = directions[direction]
+        lx, ly, lz = directions[(direction - 1) % 6]
+        rx, ry, rz = directions[(direction + 1) % 6]
+        turn = (direction + 1) % 6
+        left = free((x + lx, y + ly, z + lz))
+        right = free((x + rx, y + ry, z + rz))
+        steps = 0
+        while True:
+            x, y, z = x + dx, y + dy, z + dz
+            steps += 1
+            cube = (x, y, z)
+            if not free(cube):
+                return
+            if cube == target:
+                push((cube, direction, True), node, steps)
+                return
+            next_left = free((x + lx, y + ly, z + lz))
+            next_right = free((x + rx, y + ry, z + rz))
+            if (next_left and not left) or (next_right and not right):
+                push((cube, direction, True), node, steps)
+                return
+            left, right = next_left, next_right
+            # The scan starts with the cell on the right, so there is nothing to scan if it is
+            # not free.
+            scanned = walk(cube, turn, scan_length) if right else None
+            if scanned is not None:
+                # The cells the scans start from are recorded without being pushed, so that the
+                # path through them can be rebuilt.
+                parent = (cube, direction, True)
+                cost = cost_so_far[node] + steps
+                if parent not in cost_so_far or cost < cost_so_far[parent]:
+                    cost_so_far[parent] = cost
+                    came_from[parent] = node
+                point, length, turning = scanned
+                push((point, turn, turning), parent, length)
+
+    source, target = to_cube(start), to_cube(goal)
+    tx, ty, tz = target
+    # The nodes are (cube, direction, turning) triples, where direction is the direction the cube
+    # was reached in and turning is whether the line it is on is still scanned in direction + 1.
+    source_node = (source, None, True)
+    frontier = [(0, 0, source_node)]
+    cost_so_far = {source_node: 0}
+    came_from = {source_node: None}
+    closed = set()
+    end = None
+
+    while frontier:
+        node = heapq.heappop(frontier)[2]
+        cube, direction, turning = node
+        if cube == target:
+            end = node
+            break
+        if node in closed:
+            continue
+        closed.add(node)
+        if expanded is not None:
+            expanded(from_cube(cube))
+
+        if direction is None:
+            for turn in range(6):
+                jump(node, turn)
+            continue
+        if turning:
+            jump(node, direction)
+            walked = walk(cube, (direction + 1) % 6)
+            if walked is not None:
+                push((walked[0], (direction + 1) % 6, True), node, walked[1])
+        else:
+            walked = walk(cube, direction)
+            if walked is not None:
+                push((walked[0], direction, True), node, walked[1])
+        for turn in forced(step(cube, direction + 3), cube, direction):
+            jump(node, turn)
+
+    if end is None:
+        return []
+
+    # Fill in the straight lines between the jump points.
+    path = [target]
+    node = end
+    while came_from[node] is not None:
+        cube, node = path[-1], came_from[node]
+        previous = node[0]
+        steps = max(abs(a - b) for a, b in zip(cube, previous))
+        unit = tuple((b - a) // steps for a, b in zip(cube, previous))
+        for _ in range(steps):
+            cube = tuple_add(cube, unit)
+            path.append(cube)
+    path.reverse()
+    return [from_cube(cube) for cube in path]
@@ -0,0 +1,175 @@
+"""
+Implements Grid.field_of_view and Grid.line_of_sight.
+
+Both share one definition of visibility. The line between the centers of two cells passes through
+one cell, or between two cells, at each step of its length, as with `line_coordinates`. The cells
+can see each other unless, at some step strictly between them, every cell the line passes through
+blocks sight. Cells missing from the Grid always block sight.
+"""
+import functools
+from bisect import bisect_left, bisect_right
+
+from .grid import _TO_CUBE, _FROM_CUBE, _RING_DIRECTIONS
+
+
+def _opacity_function(grid, blocks):
+    """
+        Returns a function of coordinates returning True if they block sight, given the `blocks`
+        option of `field_of_view`.
+    """
+    if blocks is None:
+        return lambda coordinates: coordinates not in grid
+    if callable(blocks):
+        return lambda coordinates: coordinates not in grid or bool(blocks(coordinates))
+    return lambda coordinates: coordinates not in grid or coordinates in blocks
+
+
+def _round_half(numerator, denominator):
+    """
+        Returns the integers nearest to numerator / denominator, both of them on a tie.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder < denominator:
+        return (quotient,)
+    if 2 * remainder > denominator:
+        return (quotient + 1,)
+    return (quotient, quotient + 1)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _ray(offset):
+    """
+        Returns the ray template from the origin to the given cube offset, as a tuple with the
+        cube offsets the line passes through at each step strictly between its ends. Each step is
+        a tuple of one offset, or two where the line passes between cells.
+    """
+    dx, dy, dz = offset
+    length = max(abs(dx), abs(dy), abs(dz))
+    steps = []
+    for k in range(1, length):
+        xs = _round_half(k * dx, length)
+        ys = _round_half(k * dy, length)
+        zs = _round_half(k * dz, length)
+        # One component is always whole, and the other two are both halves on a tie.
+        steps.append(tuple((x, y, z) for x in xs for y in ys for z in zs if x + y + z == 0))
+    return tuple(steps)
+
+
+def line_of_sight(grid, pairs, blocks=None):
+    """
+        Returns a list of booleans, True where the cells of each (src, dest) pair can see each
+        other. See `Grid.line_of_sight`.
+    """
+    to_cube = _TO_CUBE[grid.coordinate_system]
+    from_cube = _FROM_CUBE[grid.coordinate_system]
+    opaque = _opacity_function(grid, blocks)
+    # Neighboring rays cross the same cells, so each cell is only tested once.
+    memo = {}
+
+    def blocked(cube):
+        """Returns True if the cell at the given cube coordinates blocks sight"""
+        result = memo.get(cube)
+        if result is None:
+            result = memo[cube] = opaque(from_cube(cube))
+        return result
+
+    results = []
+    for src, dest in pairs:
+        if src not in grid or dest not in grid:
+            results.append(False)
+            continue
+        ax, ay, az = to_cube(src)
+        bx, by, bz = to_cube(dest)
+        visible = True
+        for step in _ray((bx - ax, by - ay, bz - az)):
+            if all(blocked((ax + x, ay + y, az + z)) for x, y, z in step):
+                visible = False
+                break
+        results.append(visible)
+    return results
+
+
+def field_of_view(grid, center, radius, blocks=None):
+    """
+        Returns the list of coordinates within `radius` of `center` that can see it, nearest
+        first. See `Grid.field_of_view`.
+    """
+    if not isinstance(radius, int):
+        raise ValueError('Radius must be an integer')
+    elif radius < 0:
+        raise ValueError('Radius must be positive')
+    if center not in grid:
+        return []
+
+    from_cube = _FROM_CUBE[grid.coordinate_system]
+    opaque = _opacity_function(grid, blocks)
+    cx, cy, cz = _TO_CUBE[grid.coordinate_system](center)
+    visible = [center]
+
+    # A line leaving the center is identified by where it crosses the rings, measured in sides
+    # of the hexagonal ring from its first corner. It crosses ring k at cell u * k around the
+    # walk, or between two cells on a half. The shadows cast so far are the disjoint open
+    # intervals of u (lows[i], highs[i]), sorted, where they wrap past 6 they are split in two.
+    lows = []
+    highs = []
+
+    def shadowed(u):
+        """Returns True if the line at u is blocked"""
+        i = bisect_left(lows, u) - 1
+        return i >= 0 and u < highs[i]
+
+    def cast(lo, hi):
+        """Adds the shadow (lo, hi), merging it with those it overlaps"""
+        first = bisect_right(highs, lo)
+        last = bisect_left(lows, hi)
+        if first < last:
+            lo = min(lo, lows[first])
+            hi = max(hi, highs[last - 1])
+        lows[first:last] = [lo]
+        highs[first:last] = [hi]
+
+    for k in range(1, radius + 1):
+        dx, dy, dz = _RING_DIRECTIONS[4]
+        x, y, z = cx + dx * k, cy + dy * k, cz + dz * k
+        ring = []
+        for dx, dy, dz in _RING_DIRECTIONS:
+            for _ in range(k):
+                ring.append(from_cube((x, y, z)))
+                x, y, z = x + dx, y + dy, z + dz
+
+        n = 6 * k
+        blocked = [opaque(cell) for cell in ring]
+        for j, cell in enumerate(ring):
+            if cell in grid and not shadowed(j / k):
+                visible.append(cell)
+
+        if all(blocked):
+            break
+        # Every run of blocking cells casts one shadow. Start after a clear cell so that runs
+        # wrapping past the first corner are not split.
+        start = blocked.index(False)
+        run = None
+        for j in range(start + 1, start + n + 1):
+            if blocked[j % n]:
+                if run is None:
+                    run = j if j < n else j - n
+                continue
+            if run is not None:
+                # The shadow spans half a cell either side of the run, in units of 1 / (2 * k).
+                # Dividing integers keeps the ends exact, so shadows that touch are told apart
+                # from shadows that overlap.
+                lo = 2 * run - 1
+                hi = 2 * (run + (j - 1 - run) % n) + 1
+                if lo < 0:
+                    cast(-1, hi / (2 * k))
+                    cast((lo + 2 * n) / (2 * k), 7)
+                elif hi > 2 * n:
+                    cast(lo / (2 * k), 7)
+                    cast(-1, (hi - 2 * n) / (2 * k))
+                else:
+                    cast(lo / (2 * k), hi / (2 * k))
+                run = None
+        if lows and lows[0] < 0 and highs[0] > 6:
+            break
+
+    return visible